@@ -9,33 +9,72 @@ Timestamp: 2025-02-10 21:00 UTC
 """
 
 import os
+import pathlib
 import sqlite3
 import argparse
 import sys
 
+# Per-connection read tuning. The audit never writes, so the connection is
+# opened read-only; journal_mode/synchronous are left to the writing scripts.
+READ_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+    "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped I/O
+)
+
 def get_db_connection(db_path):
     if not os.path.exists(db_path):
         print(f"[ERROR] Database not found: {db_path}")
         sys.exit(1)
-    conn = sqlite3.connect(db_path)
+    uri = pathlib.Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
     conn.row_factory = sqlite3.Row
     return conn
 
-def find_source_files(app_root, extensions):
+# Directories to potentially exclude or be careful with could be added here
+EXCLUDE_DIRS = frozenset({'.git', 'node_modules', 'dist', 'build', 'coverage', '.idea', '.vscode', 'docs'})
+
+def _walk_files(dir_path, rel_prefix):
+    """
+    Recursively yield '/'-separated relative paths of files under dir_path.
+    Uses os.scandir directly so relative paths are built by concatenation
+    (no per-file relpath) and excluded directories are pruned before descent.
+    Symlinked directories are not followed, matching os.walk defaults.
+    """
+    try:
+        it = os.scandir(dir_path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if name not in EXCLUDE_DIRS and not entry.is_symlink():
+                    yield from _walk_files(entry.path, rel_prefix + name + '/')
+            else:
+                yield rel_prefix + name
+
+def find_source_files(app_root, extensions, file_index=None):
+    """
+    Walk app_root once, returning sorted relative paths of source files.
+    If file_index (set) is given, every walked file's relative path is
+    added to it so later existence checks need no extra stat calls.
+    """
     source_files = []
-    # Directories to potentially exclude or be careful with could be added here
-    exclude_dirs = {'.git', 'node_modules', 'dist', 'build', 'coverage', '.idea', '.vscode', 'docs'}
-    
-    for root, dirs, files in os.walk(app_root):
-        # Modify dirs in-place to skip excluded directories
-        dirs[:] = [d for d in dirs if d not in exclude_dirs]
-        
-        for file in files:
-            if any(file.endswith(ext) for ext in extensions):
-                full_path = os.path.join(root, file)
-                # Store relative path for cleaner reporting matches
-                rel_path = os.path.relpath(full_path, app_root)
-                source_files.append(rel_path)
+    ext_set = frozenset(ext.lower() for ext in extensions)
+    splitext = os.path.splitext
+
+    for rel_path in _walk_files(app_root, ''):
+        if file_index is not None:
+            file_index.add(rel_path)
+        if splitext(rel_path)[1].lower() in ext_set:
+            source_files.append(rel_path)
     return sorted(source_files)
 
 def audit_coverage(app_root, db_path, extensions):
@@ -45,39 +84,42 @@ def audit_coverage(app_root, db_path, extensions):
     
     conn = get_db_connection(db_path)
     
-    # 1. Get all LLR allocations (normalized)
-    # We query all LLRs and their trace_to_code to see which files are touched
-    # trace_to_code format is typically "filename:lines" or just "filename"
-    cursor = conn.execute("SELECT trace_to_code, id FROM low_level_requirements")
-    covered_files = {}
-    for row in cursor:
-        trace = row['trace_to_code']
-        if trace:
-            # simple extraction: take part before ':' if present
-            fname = trace.split(':')[0].strip()
-            # Normalize to forward slashes for comparison
-            fname = fname.replace('\\', '/')
-            if fname not in covered_files:
-                covered_files[fname] = []
-            covered_files[fname].append(row['id'])
+    # 1. Get LLR counts per covered file (normalized)
+    # trace_to_code format is typically "filename:lines" or just "filename";
+    # the file part is extracted and counted in a single GROUP BY pass.
+    cursor = conn.execute("""
+        SELECT trim(replace(substr(trace_to_code, 1, instr(trace_to_code || ':', ':') - 1),
+                            '\\', '/')) AS fname,
+               COUNT(id) AS llr_count
+        FROM low_level_requirements
+        WHERE trace_to_code IS NOT NULL AND trace_to_code != ''
+        GROUP BY fname
+    """)
+    covered_files = {row['fname']: row['llr_count'] for row in cursor}
 
-    # 2. Get all HLRs and check for test scripts
-    cursor = conn.execute("SELECT id, allocated_to FROM high_level_requirements")
-    hlr_map = {row['id']: row['allocated_to'] for row in cursor}
-    
-    cursor = conn.execute("SELECT id, parent_hlr, test_script_ref FROM hlr_test_cases")
+    # 2. Get all HLRs together with their test scripts in one pass
+    cursor = conn.execute("""
+        SELECT h.id AS hlr_id, h.allocated_to, t.id AS test_id, t.test_script_ref
+        FROM high_level_requirements h
+        LEFT JOIN hlr_test_cases t ON t.parent_hlr = h.id
+        ORDER BY h.rowid, t.rowid
+    """)
+    hlr_map = {}
     hlr_tests = {}
     for row in cursor:
-        hlr_id = row['parent_hlr']
-        if hlr_id not in hlr_tests:
+        hlr_id = row['hlr_id']
+        if hlr_id not in hlr_map:
+            hlr_map[hlr_id] = row['allocated_to']
             hlr_tests[hlr_id] = []
-        hlr_tests[hlr_id].append({
-            'test_id': row['id'],
-            'script': row['test_script_ref']
-        })
+        if row['test_id'] is not None:
+            hlr_tests[hlr_id].append({
+                'test_id': row['test_id'],
+                'script': row['test_script_ref']
+            })
 
     # 3. Audit Source Files against LLRs
-    source_files = find_source_files(app_root, extensions)
+    existing_files = set()
+    source_files = find_source_files(app_root, extensions, file_index=existing_files)
     print(f"\n[Source File Coverage]")
     
     missing_coverage = 0
@@ -89,10 +131,10 @@ def audit_coverage(app_root, db_path, extensions):
         basename = os.path.basename(norm_path)
         
         # Check for coverage by full rel path OR just basename (to be forgiving of different recording styles)
-        llrs = covered_files.get(norm_path) or covered_files.get(basename)
+        llr_count = covered_files.get(norm_path) or covered_files.get(basename)
         
-        if llrs:
-            print(f"  [PASS] {rel_path} ({len(llrs)} LLRs)")
+        if llr_count:
+            print(f"  [PASS] {rel_path} ({llr_count} LLRs)")
         else:
             print(f"  [FAIL] {rel_path} (No LLRs linked)")
             missing_coverage += 1
@@ -101,6 +143,15 @@ def audit_coverage(app_root, db_path, extensions):
     print(f"\n[HLR Test Script Coverage]")
     missing_scripts = 0
     total_hlrs = len(hlr_map)
+    script_exists = {}  # script ref -> bool, resolved once per unique ref
+
+    def _script_exists(ref):
+        if ref not in script_exists:
+            norm_ref = os.path.normpath(ref).replace('\\', '/')
+            # Refs outside the walked tree (e.g. excluded dirs) fall back to a stat
+            script_exists[ref] = (norm_ref in existing_files
+                                  or os.path.exists(os.path.join(app_root, ref)))
+        return script_exists[ref]
     
     for hlr_id, allocated_file in hlr_map.items():
         tests = hlr_tests.get(hlr_id, [])
@@ -114,8 +165,7 @@ def audit_coverage(app_root, db_path, extensions):
         for t in tests:
             if t['script']:
                 # Verify script exists
-                script_path = os.path.join(app_root, t['script'])
-                if os.path.exists(script_path):
+                if _script_exists(t['script']):
                     has_script = True
                 else:
                     print(f"  [WARN] {hlr_id} - Script referenced but not found: {t['script']}")
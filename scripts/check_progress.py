@@ -14,10 +14,42 @@ Timestamp: 2026-02-11 07:36 UTC
 
 import argparse
 import os
+import pathlib
+import re
 import sqlite3
 import sys
 
 
+# Per-connection read tuning. The dashboard never writes, so the connection
+# is opened read-only; journal_mode/synchronous are left to the writing scripts.
+READ_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+    "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped I/O
+)
+
+
+# Measurable-term keywords for the HLR quantitative-quality check, as one
+# case-insensitive alternation ('ms' is matched as a whole word only).
+QUANT_RE = re.compile(
+    r'accuracy|tolerance|latency|within|less than|greater than|maximum|minimum'
+    r'|\bms\b|seconds|meters|%|knots|feet|km',
+    re.I
+)
+
+# File extensions that must not appear in HLR text
+EXT_RE = re.compile(r'\.(js|go|py|rs|ts|tsx|jsx|css|html|md)', re.I)
+
+
+def open_readonly(db_path):
+    """Open db_path read-only (no write lock) with read PRAGMAs applied."""
+    uri = pathlib.Path(db_path).as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
 def check_table_exists(cursor, table_name):
     """Check if a table exists in the database."""
     cursor.execute(
@@ -37,20 +69,19 @@ def phase1_scan(cursor):
         print("  Action: Run init_db.py to create schema, then scan_codebase.py")
         return
 
-    cursor.execute("SELECT COUNT(*) FROM source_inventory")
-    total = cursor.fetchone()[0]
+    # All scalar counts for the phase in one round trip
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM source_inventory),
+               (SELECT COUNT(DISTINCT file_path) FROM source_inventory),
+               (SELECT COUNT(*) FROM source_inventory WHERE has_llr = 1)
+    """)
+    total, files, covered = cursor.fetchone()
 
     if total == 0:
         print("  Status: NOT STARTED — table exists but empty")
         print("  Action: Run scan_codebase.py --root <src_dir> --db <db>")
         return
 
-    cursor.execute("SELECT COUNT(DISTINCT file_path) FROM source_inventory")
-    files = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM source_inventory WHERE has_llr = 1")
-    covered = cursor.fetchone()[0]
-
     pct = (covered / total * 100) if total > 0 else 0
     status = "COMPLETE" if covered == total else "IN PROGRESS"
 
@@ -78,38 +109,28 @@ def phase2_hlrs(cursor):
     print("\nPhase 2: HLR DERIVE")
     print("-" * 50)
 
-    cursor.execute("SELECT COUNT(*) FROM high_level_requirements")
-    hlr_count = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM system_requirements")
-    sys_count = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM high_level_requirements),
+               (SELECT COUNT(*) FROM system_requirements)
+    """)
+    hlr_count, sys_count = cursor.fetchone()
 
     if hlr_count == 0:
         print("  Status: NOT STARTED")
         print(f"  System requirements: {sys_count}")
         return
 
-    # Check for derived HLRs
-    has_derived_col = False
+    # Probe optional columns with a single PRAGMA read
     cursor.execute("PRAGMA table_info(high_level_requirements)")
-    for col in cursor.fetchall():
-        if col[1] == 'is_derived':
-            has_derived_col = True
-            break
+    cols = {col[1] for col in cursor.fetchall()}
+    has_derived_col = 'is_derived' in cols
+    has_category = 'hlr_category' in cols
 
     derived = 0
     if has_derived_col:
         cursor.execute("SELECT COUNT(*) FROM high_level_requirements WHERE is_derived = 1")
         derived = cursor.fetchone()[0]
 
-    # Check category distribution
-    has_category = False
-    cursor.execute("PRAGMA table_info(high_level_requirements)")
-    for col in cursor.fetchall():
-        if col[1] == 'hlr_category':
-            has_category = True
-            break
-
     print(f"  Status: {hlr_count} HLRs defined")
     print(f"  System requirements: {sys_count}")
     if has_derived_col:
@@ -133,11 +154,11 @@ def phase3_llrs(cursor):
     print("\nPhase 3: LLR DERIVE")
     print("-" * 50)
 
-    cursor.execute("SELECT COUNT(*) FROM low_level_requirements")
-    llr_count = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM high_level_requirements")
-    hlr_count = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM low_level_requirements),
+               (SELECT COUNT(*) FROM high_level_requirements)
+    """)
+    llr_count, hlr_count = cursor.fetchone()
 
     if llr_count == 0:
         print("  Status: NOT STARTED")
@@ -174,11 +195,12 @@ def phase4_tests(cursor):
     print("\nPhase 4: TEST GEN")
     print("-" * 50)
 
-    cursor.execute("SELECT COUNT(*) FROM hlr_test_cases")
-    tc_count = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM high_level_requirements")
-    hlr_count = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM hlr_test_cases),
+               (SELECT COUNT(*) FROM high_level_requirements),
+               (SELECT COUNT(*) FROM hlr_test_cases WHERE test_script_ref IS NOT NULL)
+    """)
+    tc_count, hlr_count, scripted = cursor.fetchone()
 
     if tc_count == 0:
         print("  Status: NOT STARTED")
@@ -212,8 +234,6 @@ def phase4_tests(cursor):
         print(f"\n  ⚠ HLRs with ZERO test cases: {', '.join(untested)}")
 
     # Test scripts
-    cursor.execute("SELECT COUNT(*) FROM hlr_test_cases WHERE test_script_ref IS NOT NULL")
-    scripted = cursor.fetchone()[0]
     print(f"\n  Test scripts: {scripted}/{tc_count}")
 
 
@@ -222,8 +242,11 @@ def phase5_sdd(cursor):
     print("\nPhase 5: SDD GEN")
     print("-" * 50)
 
-    cursor.execute("SELECT COUNT(*) FROM sdd_sections")
-    sec_count = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT (SELECT COUNT(*) FROM sdd_sections),
+               (SELECT COUNT(*) FROM architecture_decisions)
+    """)
+    sec_count, arch = cursor.fetchone()
 
     if sec_count == 0:
         print("  Status: NOT STARTED")
@@ -239,8 +262,6 @@ def phase5_sdd(cursor):
         print(f"    §{num} {title} ({content_len} chars)")
 
     # Architecture decisions
-    cursor.execute("SELECT COUNT(*) FROM architecture_decisions")
-    arch = cursor.fetchone()[0]
     print(f"\n  Architecture decisions: {arch}")
 
 
@@ -251,76 +272,74 @@ def phase6_validate(cursor, db_path):
 
     issues = []
 
-    # HLRs with no LLRs
+    # Per-HLR LLR and test-case counts, aggregated in one statement.
+    # Each side is counted in its own subquery so the two LEFT JOINs do
+    # not multiply rows.
     cursor.execute("""
-        SELECT COUNT(*) FROM high_level_requirements h
-        LEFT JOIN low_level_requirements l ON l.parent_hlr = h.id
-        WHERE l.id IS NULL
+        WITH hstats AS (
+            SELECT h.id,
+                   (SELECT COUNT(*) FROM low_level_requirements l
+                    WHERE l.parent_hlr = h.id) AS llrs,
+                   (SELECT COUNT(*) FROM hlr_test_cases t
+                    WHERE t.parent_hlr = h.id) AS tests
+            FROM high_level_requirements h
+        )
+        SELECT COALESCE(SUM(llrs = 0), 0),
+               COALESCE(SUM(llrs > 0 AND llrs < 2), 0),
+               COALESCE(SUM(tests = 0), 0)
+        FROM hstats
     """)
-    orphaned_hlrs = cursor.fetchone()[0]
+    orphaned_hlrs, thin_hlrs, untested = cursor.fetchone()
+
+    # HLRs with no LLRs
     if orphaned_hlrs > 0:
         issues.append(f"  FAIL: {orphaned_hlrs} HLRs have no LLRs")
 
     # HLRs with <2 LLRs
-    cursor.execute("""
-        SELECT COUNT(*) FROM (
-            SELECT h.id, COUNT(l.id) as cnt FROM high_level_requirements h
-            LEFT JOIN low_level_requirements l ON l.parent_hlr = h.id
-            GROUP BY h.id HAVING cnt > 0 AND cnt < 2
-        )
-    """)
-    thin_hlrs = cursor.fetchone()[0]
     if thin_hlrs > 0:
         issues.append(f"  WARN: {thin_hlrs} HLRs have only 1 LLR (expect ≥2)")
 
     # HLRs with no tests
-    cursor.execute("""
-        SELECT COUNT(*) FROM high_level_requirements h
-        LEFT JOIN hlr_test_cases t ON t.parent_hlr = h.id
-        WHERE t.id IS NULL
-    """)
-    untested = cursor.fetchone()[0]
     if untested > 0:
         issues.append(f"  FAIL: {untested} HLRs have no test cases")
 
-    # Test cases without scripts
+    # Remaining scalar checks in one round trip
     cursor.execute("""
-        SELECT COUNT(*) FROM hlr_test_cases WHERE test_script_ref IS NULL
+        SELECT (SELECT COUNT(*) FROM hlr_test_cases WHERE test_script_ref IS NULL),
+               (SELECT COUNT(*) FROM high_level_requirements WHERE parent_sys IS NULL),
+               (SELECT COUNT(*) FROM architecture_decisions)
     """)
-    unscripted = cursor.fetchone()[0]
+    unscripted, untraced, arch = cursor.fetchone()
+
+    # Test cases without scripts
     if unscripted > 0:
         issues.append(f"  WARN: {unscripted} test cases have no script reference")
 
     # TRACEABILITY CHAIN: HLRs with NULL parent_sys
-    cursor.execute("""
-        SELECT COUNT(*) FROM high_level_requirements WHERE parent_sys IS NULL
-    """)
-    untraced = cursor.fetchone()[0]
     if untraced > 0:
         issues.append(f"  FAIL: {untraced} HLRs have NULL parent_sys (traceability break)")
 
     # ARCHITECTURE DECISIONS: empty table
-    cursor.execute("SELECT COUNT(*) FROM architecture_decisions")
-    arch = cursor.fetchone()[0]
     if arch == 0:
         issues.append(f"  WARN: No architecture decisions recorded (run extract_architecture.py)")
 
     # QUANTITATIVE QUALITY: HLRs lacking measurable terms
-    import re
-    QUANT_KW = ['accuracy', 'tolerance', 'latency', 'within', 'less than',
-                'greater than', 'maximum', 'minimum', 'ms', 'seconds',
-                'meters', '%', 'knots', 'feet', 'km']
     cursor.execute("SELECT id, text FROM high_level_requirements")
     hlrs = cursor.fetchall()
     total = len(hlrs)
-    quant = sum(1 for _, t in hlrs if any(k in t.lower() for k in QUANT_KW))
+    # One pass over the HLR texts feeds both the quant and file-ext checks
+    quant = 0
+    file_refs = 0
+    for _, t in hlrs:
+        if QUANT_RE.search(t):
+            quant += 1
+        if EXT_RE.search(t):
+            file_refs += 1
     pct = (quant * 100 // total) if total > 0 else 0
     if pct < 50:
         issues.append(f"  WARN: Only {quant}/{total} HLRs ({pct}%) have quantitative terms (target >=50%)")
 
     # HLRs with file extensions (implementation detail leak)
-    ext_pat = re.compile(r'\.(js|go|py|rs|ts|tsx|jsx|css|html|md)', re.I)
-    file_refs = sum(1 for _, t in hlrs if ext_pat.search(t))
     if file_refs > 0:
         issues.append(f"  FAIL: {file_refs} HLRs reference file extensions (DO-178C violation)")
 
@@ -329,9 +348,11 @@ def phase6_validate(cursor, db_path):
     if db_dir:
         adhoc_files = []
         try:
-            for f in os.listdir(db_dir):
-                if f.endswith('.sql') or (f.endswith('.py') and f.startswith('apply_')):
-                    adhoc_files.append(f)
+            with os.scandir(db_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.endswith('.sql') or (name.startswith('apply_') and name.endswith('.py')):
+                        adhoc_files.append(name)
         except OSError:
             pass
         if adhoc_files:
@@ -361,8 +382,11 @@ def main():
         print(f"ERROR: Database not found: {db}")
         sys.exit(1)
 
-    conn = sqlite3.connect(db)
+    conn = open_readonly(db)
     cursor = conn.cursor()
+    # Run every dashboard read inside one read transaction: a single shared
+    # lock and a consistent snapshot across all phases.
+    conn.execute("BEGIN DEFERRED")
 
     print("=" * 60)
     print("  DO-178C Pipeline Progress Dashboard")
@@ -377,6 +401,7 @@ def main():
     phase6_validate(cursor, db)
 
     print("\n" + "=" * 60)
+    conn.execute("COMMIT")  # read-only: nothing to write, just ends the snapshot
     conn.close()
 
 
@@ -15,43 +15,68 @@ Timestamp: 2026-02-11 09:55 UTC
 """
 
 import argparse
+import functools
 import os
 import re
 import sqlite3
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+
+# Connection tuning for the Phase 2B write workload: WAL with NORMAL sync
+# commits without an fsync per transaction, and busy_timeout waits for
+# a concurrent writer instead of failing with "database is locked".
+WRITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+)
+
+# --dry-run only reads: no persistent settings (journal_mode), no writes.
+READ_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+)
 
 
 # ============================================================
 # Import/dependency extraction patterns by language
 # ============================================================
 
+# Each language maps to ONE fused regex (named alternation) so a source
+# file is scanned in a single finditer pass rather than once per pattern.
 IMPORT_PATTERNS = {
-    '.js':  [
+    '.js':  re.compile(
         # import ... from '...'
-        re.compile(r'''(?:import|export)\s+.*?\s+from\s+['"](.+?)['"]'''),
+        r'''(?:import|export)\s+.*?\s+from\s+['"](?P<js_from>.+?)['"]'''
         # require('...')
-        re.compile(r'''require\s*\(\s*['"](.+?)['"]\s*\)'''),
-    ],
+        r'''|require\s*\(\s*['"](?P<js_require>.+?)['"]\s*\)''',
+        re.MULTILINE),
     '.jsx': None,  # Same as .js — set below
     '.ts':  None,
     '.tsx': None,
-    '.go':  [
+    '.go':  re.compile(
         # import "package/path"
-        re.compile(r'''^\s*"(.+?)"''', re.MULTILINE),
+        r'''^\s*"(?P<go_path>.+?)"'''
         # import alias "package/path"
-        re.compile(r'''^\s*\w+\s+"(.+?)"''', re.MULTILINE),
-    ],
-    '.py':  [
+        r'''|^\s*\w+\s+"(?P<go_alias_path>.+?)"''',
+        re.MULTILINE),
+    '.py':  re.compile(
         # import module / from module import ...
-        re.compile(r'''^\s*(?:from\s+(\S+)\s+)?import\s+(\S+)''', re.MULTILINE),
-    ],
-    '.rs':  [
+        r'''^\s*(?:from\s+(?P<py_from>\S+)\s+)?import\s+(?P<py_import>\S+)''',
+        re.MULTILINE),
+    '.rs':  re.compile(
         # use crate::module::...
-        re.compile(r'''^\s*use\s+(?:crate::)?(\S+?)(?:::\{|\s*;)''', re.MULTILINE),
+        r'''^\s*use\s+(?:crate::)?(?P<rs_use>\S+?)(?:::\{|\s*;)'''
         # mod module_name;
-        re.compile(r'''^\s*(?:pub\s+)?mod\s+(\w+)\s*;''', re.MULTILINE),
-    ],
+        r'''|^\s*(?:pub\s+)?mod\s+(?P<rs_mod>\w+)\s*;''',
+        re.MULTILINE),
 }
 # Aliases
 IMPORT_PATTERNS['.jsx'] = IMPORT_PATTERNS['.js']
@@ -68,23 +93,80 @@ def extract_imports(source, ext):
     Outputs: set of imported module/file references
     Timestamp: 2026-02-11 09:55 UTC
     """
-    patterns = IMPORT_PATTERNS.get(ext)
-    if not patterns:
+    pattern = IMPORT_PATTERNS.get(ext)
+    if not pattern:
         return set()
 
     imports = set()
-    for pat in patterns:
-        for match in pat.finditer(source):
-            # Take the first non-None group
-            for g in match.groups():
-                if g:
-                    # Normalize: strip leading ./ and convert separators
-                    ref = g.replace('\\', '/').lstrip('./')
-                    imports.add(ref)
-                    break
+    for match in pattern.finditer(source):
+        # Take the first non-None group (e.g. 'from X' before 'import Y')
+        for g in match.groups():
+            if g:
+                # Normalize: strip leading ./ and convert separators
+                ref = g.replace('\\', '/').lstrip('./')
+                imports.add(ref)
+                break
     return imports
 
 
+# Imports live at the top of a file; only this many leading bytes are scanned.
+IMPORT_SCAN_BYTES = 8192
+
+
+def _read_header(full_path):
+    """
+    Read the leading IMPORT_SCAN_BYTES of a file as text.
+
+    The file is read in binary (no newline translation) and decoded once.
+    If the read was truncated, the trailing partial line is dropped so a
+    cut-off import statement is not matched.
+    """
+    with open(full_path, 'rb') as f:
+        data = f.read(IMPORT_SCAN_BYTES)
+    if len(data) == IMPORT_SCAN_BYTES:
+        cut = data.rfind(b'\n')
+        if cut > 0:
+            data = data[:cut]
+    return data.decode('utf-8', errors='replace')
+
+
+def _scan_imports(app_root, fp, ext):
+    """Read one file's header and return (fp, imports), or (fp, None) if unreadable."""
+    full_path = os.path.join(app_root, fp)
+    if not os.path.isfile(full_path):
+        return fp, None
+    try:
+        source = _read_header(full_path)
+    except Exception:
+        return fp, None
+    return fp, extract_imports(source, ext)
+
+
+def _resolve_import(imp, path_index, by_basename):
+    """
+    Resolve an import reference to a known file path.
+
+    Tries an exact match on the extension-less path first, then falls back
+    to files sharing the import's basename, preferring one whose path ends
+    with the import (e.g. 'core/util' -> 'src/core/util.js'). On ambiguity
+    the first file in scan order wins.
+    """
+    imp_clean = imp.replace('\\', '/')
+    matched = path_index.get(imp_clean)
+    if matched:
+        return matched
+
+    imp_base = os.path.splitext(os.path.basename(imp_clean))[0]
+    candidates = by_basename.get(imp_base)
+    if not candidates:
+        return None
+    suffix = '/' + imp_clean
+    for no_ext, fp in candidates:
+        if ('/' + no_ext).endswith(suffix):
+            return fp
+    return candidates[0][1]
+
+
 def build_dependency_graph(app_root, file_paths):
     """
     Build a dependency graph between source files.
@@ -95,38 +177,33 @@ def build_dependency_graph(app_root, file_paths):
     Timestamp: 2026-02-11 09:55 UTC
     """
     graph = defaultdict(set)
-    path_index = {}
+    path_index = {}    # full path (no ext) -> file path
+    by_basename = {}   # basename (no ext) -> [(full path no ext, file path), ...]
 
-    # Build a lookup index: basename (no ext) → full path
+    # Derive each path's split parts once: (fp, path no ext, basename no ext, ext)
+    meta = []
     for fp in file_paths:
-        basename = os.path.splitext(os.path.basename(fp))[0]
-        path_index[basename] = fp
-        # Also index by directory/basename for deeper matches
-        parts = fp.replace('\\', '/').split('/')
-        for i in range(len(parts)):
-            key = '/'.join(parts[i:]).replace('/', '/')
-            key_no_ext = os.path.splitext(key)[0]
-            path_index[key_no_ext] = fp
-
-    for fp in file_paths:
-        full_path = os.path.join(app_root, fp)
-        if not os.path.isfile(full_path):
-            continue
-        try:
-            with open(full_path, 'r', encoding='utf-8', errors='replace') as f:
-                source = f.read()
-        except Exception:
+        no_ext, ext = os.path.splitext(fp.replace('\\', '/'))
+        meta.append((fp, no_ext, no_ext.rsplit('/', 1)[-1], ext.lower()))
+
+    # Build lookup indexes: two entries per file (first writer wins)
+    for fp, no_ext, basename, _ in meta:
+        path_index.setdefault(no_ext, fp)
+        by_basename.setdefault(basename, []).append((no_ext, fp))
+
+    # File reads are I/O-bound and independent: fan them out to a thread
+    # pool, then build the graph serially from the results (no locking).
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(functools.partial(_scan_imports, app_root),
+                                [m[0] for m in meta], [m[3] for m in meta]))
+
+    for fp, imports in results:
+        if imports is None:
             continue
-
-        ext = os.path.splitext(fp)[1].lower()
-        imports = extract_imports(source, ext)
-
         for imp in imports:
             # Try to match import to a known file
-            imp_clean = imp.replace('\\', '/')
-            imp_base = os.path.splitext(os.path.basename(imp_clean))[0]
-
-            matched = path_index.get(imp_clean) or path_index.get(imp_base)
+            matched = _resolve_import(imp, path_index, by_basename)
             if matched and matched != fp:
                 graph[fp].add(matched)
 
@@ -148,13 +225,21 @@ DOMAIN_RULES = {
     'CORE':     re.compile(r'core|internal|lib|utils|config|metric|bus|nats|ws|gateway|server|api', re.I),
 }
 
+# All domain rules fused into one anchored regex. Each alternative is a
+# lookahead over the whole path, tried in DOMAIN_RULES order, so the first
+# domain that matches anywhere still wins (not the leftmost keyword).
+_DOMAIN_RE = re.compile(
+    '|'.join(f'(?=.*?(?P<{domain}>{pattern.pattern}))'
+             for domain, pattern in DOMAIN_RULES.items()),
+    re.I | re.S
+)
+
+
+@functools.lru_cache(maxsize=None)
 def identify_domain(path):
     """Identify the behavioral domain of a file based on its path."""
-    path_lower = path.lower()
-    for domain, pattern in DOMAIN_RULES.items():
-        if pattern.search(path_lower):
-            return domain
-    return 'OTHER'
+    m = _DOMAIN_RE.match(path)  # _DOMAIN_RE is case-insensitive
+    return m.lastgroup if m else 'OTHER'
 
 def cluster_files(file_paths, graph):
     """
@@ -167,35 +252,35 @@ def cluster_files(file_paths, graph):
     Timestamp: 2026-02-11 05:45 UTC
     """
     # Group by domain + directory
-    domain_groups = defaultdict(lambda: defaultdict(list))
+    domain_groups = {}
     for fp in file_paths:
         domain = identify_domain(fp)
         normalized = fp.replace('\\', '/')
         directory = os.path.dirname(normalized) or '.'
-        domain_groups[domain][directory].append(fp)
+        domain_groups.setdefault((domain, directory), []).append(fp)
 
     clusters = []
-    for domain, dirs in sorted(domain_groups.items()):
-        for directory, files in sorted(dirs.items()):
-            # If a directory has many files in one domain, sub-cluster by imports
-            if len(files) > 10:
-                sub_clusters = _sub_cluster_by_imports(files, graph)
-                for i, sub_files in enumerate(sub_clusters):
-                    cluster_name = f"{domain}_{_generate_cluster_name(directory, i + 1)}"
-                    clusters.append({
-                        'name': cluster_name,
-                        'directory': directory,
-                        'domain': domain,
-                        'files': sub_files,
-                    })
-            else:
-                cluster_name = f"{domain}_{_generate_cluster_name(directory)}"
+    # Tuple keys sort by domain, then directory
+    for (domain, directory), files in sorted(domain_groups.items()):
+        # If a directory has many files in one domain, sub-cluster by imports
+        if len(files) > 10:
+            sub_clusters = _sub_cluster_by_imports(files, graph)
+            for i, sub_files in enumerate(sub_clusters):
+                cluster_name = f"{domain}_{_generate_cluster_name(directory, i + 1)}"
                 clusters.append({
                     'name': cluster_name,
                     'directory': directory,
                     'domain': domain,
-                    'files': files,
+                    'files': sub_files,
                 })
+        else:
+            cluster_name = f"{domain}_{_generate_cluster_name(directory)}"
+            clusters.append({
+                'name': cluster_name,
+                'directory': directory,
+                'domain': domain,
+                'files': files,
+            })
 
     return clusters
 
@@ -204,21 +289,33 @@ def _sub_cluster_by_imports(files, graph):
     """
     Sub-cluster files within a directory by mutual import relationships.
 
-    Uses a simple union-find approach: files that import each other
-    are placed in the same sub-cluster.
+    Uses union-find with union-by-rank and path compression: files that
+    import each other are placed in the same sub-cluster.
     """
     parent = {f: f for f in files}
+    rank = {f: 0 for f in files}
 
     def find(x):
-        while parent[x] != x:
-            parent[x] = parent[parent[x]]
-            x = parent[x]
-        return x
+        # Pass 1: locate the root
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # Pass 2: point every node on the path directly at the root
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
 
     def union(a, b):
         ra, rb = find(a), find(b)
-        if ra != rb:
+        if ra == rb:
+            return
+        if rank[ra] < rank[rb]:
             parent[ra] = rb
+        elif rank[ra] > rank[rb]:
+            parent[rb] = ra
+        else:
+            parent[rb] = ra
+            rank[ra] += 1
 
     file_set = set(files)
     for f in files:
@@ -287,6 +384,15 @@ SEMANTIC_PATTERNS = [
      'recover', 'detect and recover from {what} error conditions'),
 ]
 
+# All semantic patterns fused into one anchored regex, one named group per
+# category. As with _DOMAIN_RE, each alternative is a lookahead over the
+# whole word, so pattern order (not keyword position) decides the category.
+_SEMANTIC_RE = re.compile(
+    '|'.join(f'(?=.*?(?P<{category}>{pattern.pattern}))'
+             for pattern, category, _ in SEMANTIC_PATTERNS),
+    re.I | re.S
+)
+
 # Domain-specific "what" placeholders
 DOMAIN_SUBJECTS = {
     'INGEST':  'sensor feed',
@@ -301,12 +407,25 @@ DOMAIN_SUBJECTS = {
 }
 
 
+@functools.lru_cache(maxsize=4096)
 def _split_name(name):
     """Split camelCase, PascalCase, and snake_case into word tokens."""
     # Insert underscores before uppercase runs: handleMissionAck -> handle_Mission_Ack
     s = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name)
     s = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1_\2', s)
-    return [w.lower() for w in re.split(r'[_\-]+', s) if len(w) > 1]
+    # Tuple, not list: the result is cached and shared between callers
+    return tuple(w.lower() for w in re.split(r'[_\-]+', s) if len(w) > 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _categories_for_name(name):
+    """Return the frozenset of behavior categories matched by a function name's words."""
+    categories = set()
+    for word in _split_name(name):
+        m = _SEMANTIC_RE.match(word)
+        if m:
+            categories.add(m.lastgroup)
+    return frozenset(categories)
 
 
 def _classify_function_behaviors(functions):
@@ -320,45 +439,174 @@ def _classify_function_behaviors(functions):
 
     Returns a list of (behavior_category, count) sorted by frequency.
     """
-    behavior_counts = defaultdict(int)
+    behavior_counts = Counter()
     for func in functions:
-        words = _split_name(func)
-        categories_found = set()
-        for word in words:
-            for pattern, category, _ in SEMANTIC_PATTERNS:
-                if pattern.search(word):
-                    categories_found.add(category)
-                    break
+        # Common names (update, handle, __init__) repeat across files
+        categories_found = _categories_for_name(func)
         if categories_found:
-            for cat in categories_found:
-                behavior_counts[cat] += 1
+            behavior_counts.update(categories_found)
         else:
             behavior_counts['process'] += 1  # default fallback
 
-    return sorted(behavior_counts.items(), key=lambda x: -x[1])
+    # most_common() is a stable sort, so ties keep first-seen order as before
+    return behavior_counts.most_common()
+
+
+_GLOB_SPECIAL_RE = re.compile(r'([*?\[])')
+
+
+def _glob_prefix(path):
+    """
+    Build a GLOB pattern matching trace_to_code values that start with path.
+
+    GLOB (unlike the default case-insensitive LIKE) is case-sensitive like
+    the BINARY-collated column, so when the pattern is a literal or bound
+    parameter SQLite can answer 'prefix*' with a range scan on
+    idx_llr_trace_code (not when it comes from another table's column).
+    Metacharacters in the path are bracketed
+    so they match literally; '_' no longer acts as a wildcard either.
+    """
+    return _GLOB_SPECIAL_RE.sub(r'[\1]', path) + '*'
 
 
-def _get_llr_profile(db_path, file_paths):
+def _load_llr_profiles(conn, file_paths):
     """
-    Query LLR logic type distribution for files in a cluster.
+    Aggregate LLR logic types per source file in one pass.
+
+    Functionality: Group all LLRs by (trace_to_code, logic_type) once and
+                   attribute each trace to the longest file path it starts
+                   with, so per-cluster profiles need no further queries.
+    Inputs: conn (sqlite3.Connection), file_paths (list of str)
+    Outputs: dict mapping file_path -> Counter of logic_type -> count
+    """
+    file_set = set(file_paths)
+    prefix_lengths = sorted({len(fp) for fp in file_set}, reverse=True)
+    profiles = defaultdict(Counter)
+    cursor = conn.execute("""
+        SELECT trace_to_code, logic_type, COUNT(*)
+        FROM low_level_requirements
+        WHERE trace_to_code IS NOT NULL
+        GROUP BY trace_to_code, logic_type
+    """)
+    for trace, logic_type, cnt in cursor:
+        for n in prefix_lengths:
+            if n <= len(trace) and trace[:n] in file_set:
+                profiles[trace[:n]][logic_type] += cnt
+                break
+    return profiles
+
+
+def _get_llr_profile(file_profiles, file_paths):
+    """
+    Sum the preloaded per-file LLR profiles for files in a cluster.
     Returns dict of logic_type -> count.
     """
-    conn = sqlite3.connect(db_path)
-    profile = defaultdict(int)
+    profile = Counter()
     for fp in file_paths:
-        cursor = conn.execute("""
-            SELECT logic_type, COUNT(*) as cnt
-            FROM low_level_requirements
-            WHERE trace_to_code LIKE ? || '%'
-            GROUP BY logic_type
-        """, (fp,))
-        for row in cursor:
-            profile[row[0]] += row[1]
-    conn.close()
+        profile.update(file_profiles.get(fp, ()))
     return dict(profile)
 
 
-def generate_hlr_text(cluster_name, domain, files, functions, db_path=None):
+# ============================================================
+# Domain-specific behavioral templates
+# ============================================================
+
+# Each domain maps behavior categories to specific, meaningful descriptions.
+# Falls through to a sensible domain-level default if no specific match.
+DOMAIN_BEHAVIORS = {
+    'INGEST': {
+        'parse':      'receive and decode incoming telemetry streams',
+        'receive':    'receive and buffer incoming sensor data feeds',
+        'validate':   'validate incoming sensor data integrity and format compliance',
+        'process':    'acquire, normalize, and forward sensor data for downstream processing',
+        'initialize': 'establish and manage connections to external data sources',
+        '_default':   'ingest external data feeds and normalize them into internal representations',
+    },
+    'FUSION': {
+        'compute':    'correlate multi-source tracks and compute fused state estimates',
+        'search':     'associate and match detections across sensor sources',
+        'validate':   'validate track consistency and flag measurement anomalies',
+        'process':    'filter and integrate multi-source measurements into unified tracks',
+        '_default':   'fuse multi-source tracking data into correlated track records',
+    },
+    'UI': {
+        'render':     'render geographic, telemetry, and mission data on the operator display',
+        'update':     'update the operator display in response to state changes and user actions',
+        'validate':   'validate user inputs before committing mission plan changes',
+        'initialize': 'initialize map layers, UI panels, and interactive controls',
+        'process':    'manage user interactions and coordinate display updates',
+        'parse':      'parse and format data for operator display presentation',
+        'search':     'search, filter, and select mission elements on the display',
+        '_default':   'present geographic and mission data to the operator and manage user interactions',
+    },
+    'SITL': {
+        'initialize': 'initialize and configure software-in-the-loop simulation instances',
+        'process':    'manage SITL process lifecycle including startup, monitoring, and teardown',
+        'transmit':   'relay simulated telemetry data between the simulation engine and display',
+        'validate':   'verify simulation parameter constraints before launch',
+        'parse':      'decode simulated MAVLink telemetry from SITL processes',
+        '_default':   'manage the lifecycle and data flow of software-in-the-loop simulation processes',
+    },
+    'SORA': {
+        'compute':    'compute SORA ground risk buffers, flight geography, and contingency volumes',
+        'validate':   'validate SORA volume geometries against operational constraints',
+        'search':     'evaluate population density across SORA risk assessment areas',
+        'process':    'determine operational risk classification using SORA methodology',
+        '_default':   'calculate SORA risk assessment volumes and classify operational risk levels',
+    },
+    'TERRAIN': {
+        'compute':    'calculate terrain elevation profiles and collision clearances along flight paths',
+        'parse':      'parse and decode terrain elevation tile data from geospatial sources',
+        'receive':    'fetch terrain elevation tiles from local or remote sources',
+        'validate':   'validate terrain clearance margins against minimum safe altitude thresholds',
+        'process':    'process terrain data to determine elevation values and obstruction clearances',
+        'search':     'query and clip terrain elevation data within specified geographic boundaries',
+        '_default':   'process terrain elevation data and assess flight path clearance margins',
+    },
+    'SAFETY': {
+        'validate':   'evaluate safety thresholds and trigger alerting when limits are exceeded',
+        'monitor':    'continuously monitor safety-critical parameters against defined limits',
+        'compute':    'calculate safety margins and proximity to operational boundaries',
+        'process':    'detect safety-critical conditions and initiate appropriate responses',
+        '_default':   'monitor safety-critical thresholds and issue alerts when limits are approached',
+    },
+    'CORE': {
+        'parse':      'parse and decode communications protocol messages for internal processing',
+        'initialize': 'initialize system services and establish inter-component communication channels',
+        'compute':    'perform core mathematical and geospatial utility calculations',
+        'process':    'provide shared computational services used across system components',
+        'receive':    'receive and route messages between system components',
+        '_default':   'provide core infrastructure services including communications, utilities, and configuration',
+    },
+    'OTHER': {
+        'validate':   'validate operational parameters against configured constraints',
+        'compute':    'perform domain-specific calculations and data transformations',
+        'process':    'coordinate processing workflows across system components',
+        'initialize': 'initialize and configure system components and runtime environment',
+        'ingest':     'load and process external data files and configuration resources',
+        '_default':   'coordinate application workflows and manage cross-cutting processing concerns',
+    },
+}
+
+
+# LLR-profile rules for the HLR structural qualifier, in priority order:
+# (logic_type, threshold, threshold is a percentage of all LLRs, phrase)
+STRUCTURAL_QUALIFIERS = (
+    ('branch',        20, True,  'conditional logic paths'),
+    ('error_handler', 10, True,  'error detection and recovery'),
+    ('validation',    10, True,  'input validation'),
+    ('computation',    3, False, 'numerical computations'),
+    ('loop',           3, False, 'iterative data processing'),
+)
+
+# Template categories per domain (excluding the '_default' fallback)
+DOMAIN_BEHAVIOR_KEYS = {
+    domain: frozenset(k for k in templates if k != '_default')
+    for domain, templates in DOMAIN_BEHAVIORS.items()
+}
+
+
+def generate_hlr_text(cluster_name, domain, files, functions, file_profiles=None):
     """
     Generate draft HLR text using behavioral synthesis.
 
@@ -370,7 +618,8 @@ def generate_hlr_text(cluster_name, domain, files, functions, db_path=None):
 
     Functionality: Create behavioral HLR text from cluster analysis
     Inputs: cluster_name (str), domain (str), files (list), functions (list),
-            db_path (str, optional) - for LLR profile queries
+            file_profiles (dict, optional) - per-file LLR profiles from
+            _load_llr_profiles
     Outputs: HLR text string (implementation-agnostic)
     Timestamp: 2026-02-11 19:30 UTC
     """
@@ -381,98 +630,21 @@ def generate_hlr_text(cluster_name, domain, files, functions, db_path=None):
     behavior_set = {cat for cat, _ in behaviors}
     top_category = behaviors[0][0] if behaviors else 'process'
 
-    # Step 2: Get LLR structural profile if DB available
+    # Step 2: Get LLR structural profile if profiles were loaded
     llr_profile = {}
-    if db_path:
-        llr_profile = _get_llr_profile(db_path, files)
+    if file_profiles is not None:
+        llr_profile = _get_llr_profile(file_profiles, files)
 
     # Step 3: Domain-specific behavioral templates
-    # Each domain maps behavior categories to specific, meaningful descriptions.
-    # Falls through to a sensible domain-level default if no specific match.
-    DOMAIN_BEHAVIORS = {
-        'INGEST': {
-            'parse':      'receive and decode incoming telemetry streams',
-            'receive':    'receive and buffer incoming sensor data feeds',
-            'validate':   'validate incoming sensor data integrity and format compliance',
-            'process':    'acquire, normalize, and forward sensor data for downstream processing',
-            'initialize': 'establish and manage connections to external data sources',
-            '_default':   'ingest external data feeds and normalize them into internal representations',
-        },
-        'FUSION': {
-            'compute':    'correlate multi-source tracks and compute fused state estimates',
-            'search':     'associate and match detections across sensor sources',
-            'validate':   'validate track consistency and flag measurement anomalies',
-            'process':    'filter and integrate multi-source measurements into unified tracks',
-            '_default':   'fuse multi-source tracking data into correlated track records',
-        },
-        'UI': {
-            'render':     'render geographic, telemetry, and mission data on the operator display',
-            'update':     'update the operator display in response to state changes and user actions',
-            'validate':   'validate user inputs before committing mission plan changes',
-            'initialize': 'initialize map layers, UI panels, and interactive controls',
-            'process':    'manage user interactions and coordinate display updates',
-            'parse':      'parse and format data for operator display presentation',
-            'search':     'search, filter, and select mission elements on the display',
-            '_default':   'present geographic and mission data to the operator and manage user interactions',
-        },
-        'SITL': {
-            'initialize': 'initialize and configure software-in-the-loop simulation instances',
-            'process':    'manage SITL process lifecycle including startup, monitoring, and teardown',
-            'transmit':   'relay simulated telemetry data between the simulation engine and display',
-            'validate':   'verify simulation parameter constraints before launch',
-            'parse':      'decode simulated MAVLink telemetry from SITL processes',
-            '_default':   'manage the lifecycle and data flow of software-in-the-loop simulation processes',
-        },
-        'SORA': {
-            'compute':    'compute SORA ground risk buffers, flight geography, and contingency volumes',
-            'validate':   'validate SORA volume geometries against operational constraints',
-            'search':     'evaluate population density across SORA risk assessment areas',
-            'process':    'determine operational risk classification using SORA methodology',
-            '_default':   'calculate SORA risk assessment volumes and classify operational risk levels',
-        },
-        'TERRAIN': {
-            'compute':    'calculate terrain elevation profiles and collision clearances along flight paths',
-            'parse':      'parse and decode terrain elevation tile data from geospatial sources',
-            'receive':    'fetch terrain elevation tiles from local or remote sources',
-            'validate':   'validate terrain clearance margins against minimum safe altitude thresholds',
-            'process':    'process terrain data to determine elevation values and obstruction clearances',
-            'search':     'query and clip terrain elevation data within specified geographic boundaries',
-            '_default':   'process terrain elevation data and assess flight path clearance margins',
-        },
-        'SAFETY': {
-            'validate':   'evaluate safety thresholds and trigger alerting when limits are exceeded',
-            'monitor':    'continuously monitor safety-critical parameters against defined limits',
-            'compute':    'calculate safety margins and proximity to operational boundaries',
-            'process':    'detect safety-critical conditions and initiate appropriate responses',
-            '_default':   'monitor safety-critical thresholds and issue alerts when limits are approached',
-        },
-        'CORE': {
-            'parse':      'parse and decode communications protocol messages for internal processing',
-            'initialize': 'initialize system services and establish inter-component communication channels',
-            'compute':    'perform core mathematical and geospatial utility calculations',
-            'process':    'provide shared computational services used across system components',
-            'receive':    'receive and route messages between system components',
-            '_default':   'provide core infrastructure services including communications, utilities, and configuration',
-        },
-        'OTHER': {
-            'validate':   'validate operational parameters against configured constraints',
-            'compute':    'perform domain-specific calculations and data transformations',
-            'process':    'coordinate processing workflows across system components',
-            'initialize': 'initialize and configure system components and runtime environment',
-            'ingest':     'load and process external data files and configuration resources',
-            '_default':   'coordinate application workflows and manage cross-cutting processing concerns',
-        },
-    }
-
     domain_templates = DOMAIN_BEHAVIORS.get(domain, DOMAIN_BEHAVIORS['OTHER'])
-
-    # Select the best template: prefer the top behavior category, then try others
-    primary_text = None
-    for cat, _ in behaviors:
-        if cat in domain_templates:
-            primary_text = domain_templates[cat]
-            break
-    if not primary_text:
+    template_keys = DOMAIN_BEHAVIOR_KEYS.get(domain, DOMAIN_BEHAVIOR_KEYS['OTHER'])
+
+    # Behavior categories with a template in this domain, most frequent first.
+    # The first is the primary statement, the next (if any) the secondary one.
+    matched = [cat for cat, _ in behaviors if cat in template_keys]
+    if matched:
+        primary_text = domain_templates[matched[0]]
+    else:
         primary_text = domain_templates.get('_default',
                                             f'manage {DOMAIN_SUBJECTS.get(domain, "application")} operations')
 
@@ -480,33 +652,26 @@ def generate_hlr_text(cluster_name, domain, files, functions, db_path=None):
     structural_qualifier = ''
     if llr_profile:
         total_llrs = sum(llr_profile.values())
-        branch_pct = llr_profile.get('branch', 0) * 100 // max(total_llrs, 1)
-        error_pct = llr_profile.get('error_handler', 0) * 100 // max(total_llrs, 1)
-        validation_pct = llr_profile.get('validation', 0) * 100 // max(total_llrs, 1)
-
         qualifiers = []
-        if branch_pct > 20:
-            qualifiers.append('conditional logic paths')
-        if error_pct > 10:
-            qualifiers.append('error detection and recovery')
-        if validation_pct > 10:
-            qualifiers.append('input validation')
-        if llr_profile.get('computation', 0) > 3:
-            qualifiers.append('numerical computations')
-        if llr_profile.get('loop', 0) > 3:
-            qualifiers.append('iterative data processing')
+        for logic_type, threshold, as_pct, phrase in STRUCTURAL_QUALIFIERS:
+            cnt = llr_profile.get(logic_type)
+            if not cnt:
+                continue
+            value = cnt * 100 // total_llrs if as_pct else cnt
+            if value > threshold:
+                qualifiers.append(phrase)
+                if len(qualifiers) == 2:  # only the first two are used
+                    break
 
         if qualifiers:
-            structural_qualifier = f', incorporating {" and ".join(qualifiers[:2])}'
+            structural_qualifier = f', incorporating {" and ".join(qualifiers)}'
 
     # Step 5: Add secondary behavior as a supplementary clause
+    # (template texts are distinct within a domain, so a different category
+    # always yields a different statement)
     secondary_text = ''
-    if len(behaviors) > 1:
-        # Find a DIFFERENT domain template for the second behavior category
-        for cat, _ in behaviors[1:]:
-            if cat in domain_templates and domain_templates[cat] != primary_text:
-                secondary_text = f' The software shall also {domain_templates[cat]}.'
-                break
+    if len(matched) > 1:
+        secondary_text = f' The software shall also {domain_templates[matched[1]]}.'
 
     # Step 6: Compose final HLR text
     hlr = f"The software shall {primary_text}{structural_qualifier}.{secondary_text}"
@@ -514,125 +679,154 @@ def generate_hlr_text(cluster_name, domain, files, functions, db_path=None):
     return hlr
 
 
-def populate_hlrs(db_path, clusters, dry_run=False):
+# Domain descriptions for system requirements
+DOMAIN_DESCRIPTIONS = {
+    'INGEST':  'The system shall provide data ingestion capabilities for external sensor feeds.',
+    'FUSION':  'The system shall correlate and filter multi-source tracking data.',
+    'UI':      'The system shall render operator displays and controls.',
+    'SITL':    'The system shall support simulation and replay of operations.',
+    'SORA':    'The system shall compute SORA risk assessments and airspace volumes.',
+    'TERRAIN': 'The system shall process and display terrain elevation data.',
+    'SAFETY':  'The system shall monitor safety thresholds and issue alerts.',
+    'CORE':    'The system shall provide core infrastructure services.',
+    'OTHER':   'The system shall provide auxiliary software services.',
+}
+
+# Re-parenting: every (file, HLR) assignment is collected in cluster order.
+# LLRs are re-parented by one bound-GLOB UPDATE per file (executemany), so
+# each prefix is a range scan on idx_llr_trace_code (the unary '+' keeps the
+# planner off idx_llr_parent_hlr, where every candidate row is
+# HLR_UNCLUSTERED and nothing is narrowed); only still-unclustered
+# LLRs match, so the earliest cluster wins when a trace matches several
+# files. The inventory is updated set-based from a temp table keyed by path.
+CREATE_FILE_HLR_SQL = """
+    CREATE TEMP TABLE file_hlr (
+        file_path TEXT PRIMARY KEY,
+        hlr_id    TEXT NOT NULL
+    )
+"""
+
+REPARENT_LLR_SQL = """
+    UPDATE low_level_requirements
+    SET parent_hlr = ?, source = ?, updated_at = datetime('now')
+    WHERE +parent_hlr = 'HLR_UNCLUSTERED'
+      AND trace_to_code GLOB ?
+"""
+
+REPARENT_INVENTORY_SQL = """
+    UPDATE source_inventory
+    SET parent_hlr = (SELECT f.hlr_id FROM temp.file_hlr f
+                      WHERE f.file_path = source_inventory.file_path)
+    WHERE file_path IN (SELECT file_path FROM temp.file_hlr)
+"""
+
+
+def populate_hlrs(conn, clusters, dry_run=False):
     """
     Write HLR drafts to the database with full traceability.
 
     Functionality: Auto-generate System Requirements per domain,
                    UPSERT HLRs with parent_sys set, re-parent LLRs
-    Inputs: db_path (str), clusters (list), dry_run (bool)
+    Inputs: conn (sqlite3.Connection), clusters (list), dry_run (bool)
     Outputs: count of HLRs created
     Timestamp: 2026-02-11 06:00 UTC
     """
     # Collect unique domains from clusters
     domains = sorted(set(c.get('domain', 'OTHER') for c in clusters))
 
-    # Domain descriptions for system requirements
-    DOMAIN_DESCRIPTIONS = {
-        'INGEST':  'The system shall provide data ingestion capabilities for external sensor feeds.',
-        'FUSION':  'The system shall correlate and filter multi-source tracking data.',
-        'UI':      'The system shall render operator displays and controls.',
-        'SITL':    'The system shall support simulation and replay of operations.',
-        'SORA':    'The system shall compute SORA risk assessments and airspace volumes.',
-        'TERRAIN': 'The system shall process and display terrain elevation data.',
-        'SAFETY':  'The system shall monitor safety thresholds and issue alerts.',
-        'CORE':    'The system shall provide core infrastructure services.',
-        'OTHER':   'The system shall provide auxiliary software services.',
-    }
-
-    conn = sqlite3.connect(db_path)
-    conn.execute("PRAGMA foreign_keys = ON;")
     cursor = conn.cursor()
 
-    # Phase 1: Auto-generate system requirements per domain
-    sys_req_map = {}  # domain -> sys_req_id
-    for domain in domains:
-        sys_id = f"SYS_{domain}_001"
-        sys_text = DOMAIN_DESCRIPTIONS.get(domain,
-            f"The system shall provide {domain.lower()} capabilities.")
-
-        if dry_run:
-            print(f"  [DRY-RUN] System Req: {sys_id}")
-            print(f"            {sys_text}")
-        else:
+    # All writes go in one explicit transaction: the write lock is taken
+    # up front and any failure rolls back every upsert and re-parent.
+    if not dry_run:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Phase 1: Auto-generate system requirements per domain
+        sys_req_map = {}  # domain -> sys_req_id
+        for domain in domains:
+            sys_id = f"SYS_{domain}_001"
+            sys_text = DOMAIN_DESCRIPTIONS.get(domain,
+                f"The system shall provide {domain.lower()} capabilities.")
+
+            if dry_run:
+                print(f"  [DRY-RUN] System Req: {sys_id}")
+                print(f"            {sys_text}")
+            else:
+                cursor.execute("""
+                    INSERT INTO system_requirements (id, text, source)
+                    VALUES (?, ?, 'Derived from behavioral domain analysis')
+                    ON CONFLICT(id) DO UPDATE SET
+                        text = excluded.text,
+                        updated_at = datetime('now')
+                """, (sys_id, sys_text))
+
+            sys_req_map[domain] = sys_id
+
+        if not dry_run:
+            print(f"  {len(sys_req_map)} system requirements created/updated")
+
+        # Phase 2: UPSERT HLRs with parent_sys set
+        hlr_count = 0
+        file_hlr = []  # (file_path, hlr_id), in cluster order
+        for cluster in clusters:
+            hlr_id = f"HLR_{cluster['name']}"
+            hlr_text = cluster['hlr_text']
+            files = cluster['files']
+            domain = cluster.get('domain', 'OTHER')
+            parent_sys = sys_req_map.get(domain, sys_req_map.get('OTHER'))
+
+            if dry_run:
+                print(f"  [DRY-RUN] {hlr_id} -> {parent_sys}")
+                print(f"            {hlr_text[:100]}")
+                print(f"            Files: {', '.join(files)}")
+                print()
+                continue
+
+            # UPSERT the HLR with parent_sys
             cursor.execute("""
-                INSERT INTO system_requirements (id, text, source)
-                VALUES (?, ?, 'Derived from behavioral domain analysis')
+                INSERT INTO high_level_requirements
+                    (id, text, source, parent_sys, is_derived, derivation_rationale,
+                     hlr_category, allocated_to)
+                VALUES (?, ?, ?, ?, 1,
+                        'Auto-generated by cluster_hlrs.py from behavioral domain analysis',
+                        'functional', ?)
                 ON CONFLICT(id) DO UPDATE SET
                     text = excluded.text,
+                    parent_sys = excluded.parent_sys,
+                    allocated_to = excluded.allocated_to,
                     updated_at = datetime('now')
-            """, (sys_id, sys_text))
-
-        sys_req_map[domain] = sys_id
-
-    if not dry_run:
-        print(f"  {len(sys_req_map)} system requirements created/updated")
-
-    # Phase 2: UPSERT HLRs with parent_sys set
-    hlr_count = 0
-    for cluster in clusters:
-        hlr_id = f"HLR_{cluster['name']}"
-        hlr_text = cluster['hlr_text']
-        files = cluster['files']
-        domain = cluster.get('domain', 'OTHER')
-        parent_sys = sys_req_map.get(domain, sys_req_map.get('OTHER'))
-
-        if dry_run:
-            print(f"  [DRY-RUN] {hlr_id} -> {parent_sys}")
-            print(f"            {hlr_text[:100]}")
-            print(f"            Files: {', '.join(files)}")
-            print()
-            continue
-
-        # UPSERT the HLR with parent_sys
-        cursor.execute("""
-            INSERT INTO high_level_requirements
-                (id, text, source, parent_sys, is_derived, derivation_rationale,
-                 hlr_category, allocated_to)
-            VALUES (?, ?, ?, ?, 1,
-                    'Auto-generated by cluster_hlrs.py from behavioral domain analysis',
-                    'functional', ?)
-            ON CONFLICT(id) DO UPDATE SET
-                text = excluded.text,
-                parent_sys = excluded.parent_sys,
-                allocated_to = excluded.allocated_to,
-                updated_at = datetime('now')
-        """, (hlr_id, hlr_text, parent_sys, parent_sys, cluster['directory']))
-        hlr_count += 1
-
-        # Re-parent LLRs: find LLRs that trace to files in this cluster
-        for file_path in files:
+            """, (hlr_id, hlr_text, parent_sys, parent_sys, cluster['directory']))
+            hlr_count += 1
+            file_hlr.extend((fp, hlr_id) for fp in files)
+
+        if not dry_run:
+            # Re-parent LLRs that trace to cluster files (bound GLOB per file),
+            # then set source_inventory.parent_hlr in one statement
+            cursor.executemany(REPARENT_LLR_SQL,
+                               [(hlr_id, hlr_id, _glob_prefix(fp)) for fp, hlr_id in file_hlr])
+            cursor.execute(CREATE_FILE_HLR_SQL)
+            cursor.executemany("INSERT OR IGNORE INTO temp.file_hlr VALUES (?, ?)", file_hlr)
+            cursor.execute(REPARENT_INVENTORY_SQL)
+            cursor.execute("DROP TABLE temp.file_hlr")
+
+            # Check if HLR_UNCLUSTERED has any remaining LLRs
             cursor.execute("""
-                UPDATE low_level_requirements
-                SET parent_hlr = ?, source = ?, updated_at = datetime('now')
+                SELECT COUNT(*) FROM low_level_requirements
                 WHERE parent_hlr = 'HLR_UNCLUSTERED'
-                  AND trace_to_code LIKE ? || '%'
-            """, (hlr_id, hlr_id, file_path))
-
-        # Update source_inventory.parent_hlr
-        for file_path in files:
-            cursor.execute("""
-                UPDATE source_inventory
-                SET parent_hlr = ?
-                WHERE file_path = ?
-            """, (hlr_id, file_path))
-
-    if not dry_run:
-        # Check if HLR_UNCLUSTERED has any remaining LLRs
-        cursor.execute("""
-            SELECT COUNT(*) FROM low_level_requirements
-            WHERE parent_hlr = 'HLR_UNCLUSTERED'
-        """)
-        remaining = cursor.fetchone()[0]
-        if remaining == 0:
-            cursor.execute("DELETE FROM high_level_requirements WHERE id = 'HLR_UNCLUSTERED'")
-            print(f"  Removed HLR_UNCLUSTERED placeholder (all LLRs re-parented)")
-        else:
-            print(f"  WARNING: {remaining} LLRs still under HLR_UNCLUSTERED")
+            """)
+            remaining = cursor.fetchone()[0]
+            if remaining == 0:
+                cursor.execute("DELETE FROM high_level_requirements WHERE id = 'HLR_UNCLUSTERED'")
+                print(f"  Removed HLR_UNCLUSTERED placeholder (all LLRs re-parented)")
+            else:
+                print(f"  WARNING: {remaining} LLRs still under HLR_UNCLUSTERED")
 
-        conn.commit()
+            conn.commit()
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
 
-    conn.close()
     return hlr_count
 
 
@@ -654,81 +848,95 @@ def main():
         print(f"ERROR: Database not found: {db}")
         sys.exit(1)
 
-    # Get all unique file paths from source_inventory
+    # One connection serves every read and write of the phase
     conn = sqlite3.connect(db)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.execute("""
-        SELECT DISTINCT file_path FROM source_inventory ORDER BY file_path
-    """)
-    file_paths = [row['file_path'] for row in cursor.fetchall()]
-
-    # Get function names per file
-    func_by_file = defaultdict(list)
-    cursor = conn.execute("""
-        SELECT file_path, function_name FROM source_inventory
-        ORDER BY file_path, start_line
-    """)
-    for row in cursor:
-        func_by_file[row['file_path']].append(row['function_name'])
-    conn.close()
-
-    if not file_paths:
-        print("No files in source_inventory. Run scan_codebase.py first.")
-        sys.exit(0)
-
-    # Determine app root
-    app_root = args.app_root
-    if not app_root:
-        db_dir = os.path.dirname(db)
-        if db_dir.endswith(os.sep + os.path.join('docs', 'artefacts')):
-            app_root = os.path.dirname(os.path.dirname(db_dir))
-        else:
-            app_root = os.path.dirname(db)
-    app_root = os.path.abspath(app_root)
-
-    print(f"=== DO-178C Phase 2B: HLR Clustering ===")
-    print(f"DB:       {db}")
-    print(f"App Root: {app_root}")
-    print(f"Files:    {len(file_paths)}")
-    print()
-
-    # Build dependency graph
-    print("Building dependency graph...")
-    graph = build_dependency_graph(app_root, file_paths)
-    edge_count = sum(len(deps) for deps in graph.values())
-    print(f"  {len(graph)} files with imports, {edge_count} dependency edges\n")
-
-    # Cluster files
-    clusters = cluster_files(file_paths, graph)
-    print(f"Identified {len(clusters)} clusters:\n")
-
-    for cluster in clusters:
-        # Look up function names for this cluster
-        funcs = []
-        for fp in cluster['files']:
-            funcs.extend(func_by_file.get(fp, []))
-
-        cluster['hlr_text'] = generate_hlr_text(
-            cluster['name'], cluster['domain'], cluster['files'], funcs,
-            db_path=db
-        )
-        cluster['functions'] = funcs
-
-        print(f"  [{cluster['name']}]")
-        print(f"    Domain:    {cluster['domain']}")
-        print(f"    Directory: {cluster['directory']}")
-        print(f"    Files: {len(cluster['files'])}, Functions: {len(funcs)}")
-
-    print()
-
-    # Populate database
-    if args.dry_run:
-        print("--- DRY RUN (no DB writes) ---\n")
-    count = populate_hlrs(db, clusters, dry_run=args.dry_run)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    for pragma in (READ_PRAGMAS if args.dry_run else WRITE_PRAGMAS):
+        conn.execute(pragma)
+    # Transactions are managed explicitly (see populate_hlrs)
+    conn.isolation_level = None
+    # Prefix lookups on trace_to_code/file_path need these; init_db.py creates
+    # them too, but databases built by older schemas may lack them.
+    # Decision Logic: Only touch the schema when writing.
+    # Conditions: not args.dry_run (a dry run makes no DB writes).
     if not args.dry_run:
-        print(f"\n{count} HLRs written to database")
-
-    print("\nPhase 2B complete.")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llr_trace_code "
+                     "ON low_level_requirements(trace_to_code)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_inv_file_path "
+                     "ON source_inventory(file_path)")
+    try:
+        # Get function names per file, streamed in one pass; the unique file
+        # paths are the dict's keys, already in file_path order
+        func_by_file = defaultdict(list)
+        cursor = conn.execute("""
+            SELECT file_path, function_name FROM source_inventory
+            ORDER BY file_path, start_line
+        """)
+        for file_path, function_name in cursor:
+            func_by_file[file_path].append(function_name)
+        file_paths = list(func_by_file)
+
+        if not file_paths:
+            print("No files in source_inventory. Run scan_codebase.py first.")
+            sys.exit(0)
+
+        # Determine app root
+        app_root = args.app_root
+        if not app_root:
+            db_dir = os.path.dirname(db)
+            if db_dir.endswith(os.sep + os.path.join('docs', 'artefacts')):
+                app_root = os.path.dirname(os.path.dirname(db_dir))
+            else:
+                app_root = os.path.dirname(db)
+        app_root = os.path.abspath(app_root)
+
+        print(f"=== DO-178C Phase 2B: HLR Clustering ===")
+        print(f"DB:       {db}")
+        print(f"App Root: {app_root}")
+        print(f"Files:    {len(file_paths)}")
+        print()
+
+        # Build dependency graph
+        print("Building dependency graph...")
+        graph = build_dependency_graph(app_root, file_paths)
+        edge_count = sum(len(deps) for deps in graph.values())
+        print(f"  {len(graph)} files with imports, {edge_count} dependency edges\n")
+
+        # Cluster files
+        clusters = cluster_files(file_paths, graph)
+        print(f"Identified {len(clusters)} clusters:\n")
+
+        # LLR logic-type profiles for every file, loaded in a single query
+        file_profiles = _load_llr_profiles(conn, file_paths)
+
+        for cluster in clusters:
+            # Look up function names for this cluster
+            funcs = list(chain.from_iterable(
+                func_by_file.get(fp, ()) for fp in cluster['files']))
+
+            cluster['hlr_text'] = generate_hlr_text(
+                cluster['name'], cluster['domain'], cluster['files'], funcs,
+                file_profiles=file_profiles
+            )
+            cluster['functions'] = funcs
+
+            print(f"  [{cluster['name']}]")
+            print(f"    Domain:    {cluster['domain']}")
+            print(f"    Directory: {cluster['directory']}")
+            print(f"    Files: {len(cluster['files'])}, Functions: {len(funcs)}")
+
+        print()
+
+        # Populate database
+        if args.dry_run:
+            print("--- DRY RUN (no DB writes) ---\n")
+        count = populate_hlrs(conn, clusters, dry_run=args.dry_run)
+        if not args.dry_run:
+            print(f"\n{count} HLRs written to database")
+
+        print("\nPhase 2B complete.")
+    finally:
+        conn.close()
 
 
 if __name__ == '__main__':
@@ -21,11 +21,24 @@ Timestamp: 2026-02-11 09:55 UTC
 
 import argparse
 import ast
+import functools
 import os
 import re
 import sqlite3
 import sys
-from collections import defaultdict
+from bisect import bisect_right
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Connection tuning for the Phase 2A LLR writes: the rows are regenerated
+# from source on every run, so WAL with NORMAL sync (no fsync per commit)
+# is a safe trade; a crash only loses derivable draft data.
+WRITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+)
 
 
 # ============================================================
@@ -36,6 +49,38 @@ from collections import defaultdict
 # ============================================================
 
 
+# One draft LLR. Field order matches the low_level_requirements columns
+# populate_llrs() binds, so rows can be passed to executemany() as-is.
+LLR = namedtuple('LLR', 'id text logic_type trace_to_code')
+
+# Path sanitizers for LLR IDs
+_SAFE_RE = re.compile(r'[^a-zA-Z0-9]')
+_COLLAPSE_RE = re.compile(r'_+')
+
+
+@functools.lru_cache(maxsize=1024)
+def _safe_llr_path(file_path):
+    """Sanitize a file path for use in LLR IDs (cached: shared by every function of a file)."""
+    # Sanitize path: replace non-alphanumeric with _
+    safe_path = _SAFE_RE.sub('_', file_path)
+    # Collapse consecutive underscores and trim
+    safe_path = _COLLAPSE_RE.sub('_', safe_path).strip('_')
+    # Limit length to keep IDs manageable
+    return safe_path[:40]
+
+
+def _make_llr_prefix(file_path, func_name):
+    """
+    Build the per-function part of an LLR ID; append f"{idx:03d}" to complete it.
+
+    Functionality: Hoists the invariant (file, function) part out of per-LLR ID building
+    Inputs: file_path (str), func_name (str)
+    Outputs: ID prefix string like 'LLR_utils_py__calc_dist__'
+    Timestamp: 2026-02-11 09:55 UTC
+    """
+    return f"LLR_{_safe_llr_path(file_path)}__{func_name}__"
+
+
 def _make_llr_id(file_path, func_name, idx):
     """
     Generate a deterministic LLR ID from file, function, and index.
@@ -45,68 +90,107 @@ def _make_llr_id(file_path, func_name, idx):
     Outputs: LLR ID string like 'LLR_utils_py__calc_dist__001'
     Timestamp: 2026-02-11 09:55 UTC
     """
-    # Sanitize path: replace non-alphanumeric with _
-    safe_path = re.sub(r'[^a-zA-Z0-9]', '_', file_path)
-    # Collapse consecutive underscores and trim
-    safe_path = re.sub(r'_+', '_', safe_path).strip('_')
-    # Limit length to keep IDs manageable
-    if len(safe_path) > 40:
-        safe_path = safe_path[:40]
-    return f"LLR_{safe_path}__{func_name}__{idx:03d}"
+    return f"{_make_llr_prefix(file_path, func_name)}{idx:03d}"
 
 
 # ============================================================
 # Python AST-based extraction (highest quality)
 # ============================================================
 
-class PythonLLRExtractor(ast.NodeVisitor):
+class PythonLLRExtractor:
     """
     PythonLLRExtractor
-    Functionality: Walks the Python AST to extract structural elements
-                   and generate draft LLR text for each.
+    Functionality: Walks the Python AST (iteratively, in source order) to
+                   extract structural elements and generate draft LLR
+                   text for each.
     Inputs: source (str) - Python source code, file_path (str)
-    Outputs: list of LLR draft dicts
+    Outputs: list of LLR drafts
     Timestamp: 2026-02-11 09:55 UTC
     """
 
     def __init__(self, source, file_path, func_name, start_line):
         self.source = source
+        # Lines for slicing expression text; the source was read in universal
+        # newline mode, so '\n' splits lines exactly as the parser numbers them.
+        self.source_lines = source.split('\n')
         self.file_path = file_path
         self.func_name = func_name
         self.start_line = start_line
         self.llrs = []
         self.idx = 0
+        self.id_prefix = _make_llr_prefix(file_path, func_name)
 
     def _add_llr(self, logic_type, text, line):
         """Add an LLR draft to the collection."""
         self.idx += 1
-        self.llrs.append({
-            'id': _make_llr_id(self.file_path, self.func_name, self.idx),
-            'text': text,
-            'logic_type': logic_type,
-            'trace_to_code': f"{self.file_path}:{self.start_line + line - 1}",
-        })
-
-    def visit_FunctionDef(self, node):
+        self.llrs.append(LLR(
+            id=f"{self.id_prefix}{self.idx:03d}",
+            text=text,
+            logic_type=logic_type,
+            trace_to_code=f"{self.file_path}:{self.start_line + line - 1}",
+        ))
+
+    def _seg(self, node):
+        """
+        Return the source text of an expression node.
+
+        Single-line expressions are sliced straight from source_lines
+        (O(span)); only multi-line ones fall back to ast.unparse, which
+        re-renders the whole subtree but keeps the LLR text on one line.
+        """
+        if node.lineno == node.end_lineno:
+            line = self.source_lines[node.lineno - 1]
+            start, end = node.col_offset, node.end_col_offset
+            if line.isascii():
+                return line[start:end]
+            # Column offsets are UTF-8 byte offsets
+            return line.encode('utf-8')[start:end].decode('utf-8')
+        return ast.unparse(node)
+
+    def extract(self, tree):
+        """
+        Walk tree in pre-order with an explicit stack and dispatch each
+        handled node type to its handler.
+
+        Unlike NodeVisitor there is no Python frame per node. ast.walk is
+        not used because its breadth-first order would renumber the LLRs.
+        """
+        handlers = {
+            ast.FunctionDef: self._visit_function,
+            ast.AsyncFunctionDef: self._visit_function,
+            ast.If: self._visit_if,
+            ast.For: self._visit_for,
+            ast.While: self._visit_while,
+            ast.Try: self._visit_try,
+            ast.Return: self._visit_return,
+        }
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(node)
+            # Children pushed in reverse so they pop in source order
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+        return self.llrs
+
+    def _visit_function(self, node):
         """Extract function initialization LLR."""
         args = [a.arg for a in node.args.args]
         returns = ''
         if node.returns:
-            returns = f" -> {ast.dump(node.returns)}"
+            returns = f" -> {self._seg(node.returns)}"
         self._add_llr(
             'initialization',
             f"Function '{node.name}' shall be defined with parameters ({', '.join(args)}){returns}. "
             f"Entry point at line {self.start_line + node.lineno - 1}.",
             node.lineno
         )
-        self.generic_visit(node)
-
-    visit_AsyncFunctionDef = visit_FunctionDef
 
-    def visit_If(self, node):
+    def _visit_if(self, node):
         """Extract branch LLR for each if/elif/else."""
         try:
-            condition = ast.unparse(node.test)
+            condition = self._seg(node.test)
         except Exception:
             condition = "<complex condition>"
 
@@ -117,13 +201,12 @@ class PythonLLRExtractor(ast.NodeVisitor):
             f"Else execute the else-body ({len(node.orelse)} statement(s)).",
             node.lineno
         )
-        self.generic_visit(node)
 
-    def visit_For(self, node):
+    def _visit_for(self, node):
         """Extract loop LLR."""
         try:
-            target = ast.unparse(node.target)
-            iter_expr = ast.unparse(node.iter)
+            target = self._seg(node.target)
+            iter_expr = self._seg(node.iter)
         except Exception:
             target = "<target>"
             iter_expr = "<iterable>"
@@ -134,12 +217,11 @@ class PythonLLRExtractor(ast.NodeVisitor):
             f"Loop body contains {len(node.body)} statement(s).",
             node.lineno
         )
-        self.generic_visit(node)
 
-    def visit_While(self, node):
+    def _visit_while(self, node):
         """Extract loop LLR for while."""
         try:
-            condition = ast.unparse(node.test)
+            condition = self._seg(node.test)
         except Exception:
             condition = "<condition>"
 
@@ -150,15 +232,14 @@ class PythonLLRExtractor(ast.NodeVisitor):
             f"Terminate when condition is false.",
             node.lineno
         )
-        self.generic_visit(node)
 
-    def visit_Try(self, node):
+    def _visit_try(self, node):
         """Extract error_handler LLR for try/except."""
         handler_types = []
         for handler in node.handlers:
             if handler.type:
                 try:
-                    handler_types.append(ast.unparse(handler.type))
+                    handler_types.append(self._seg(handler.type))
                 except Exception:
                     handler_types.append("<Exception>")
             else:
@@ -171,13 +252,12 @@ class PythonLLRExtractor(ast.NodeVisitor):
             f"Finally block: {'yes' if node.finalbody else 'no'}.",
             node.lineno
         )
-        self.generic_visit(node)
 
-    def visit_Return(self, node):
+    def _visit_return(self, node):
         """Extract computation LLR for return statements with values."""
         if node.value:
             try:
-                val = ast.unparse(node.value)
+                val = self._seg(node.value)
             except Exception:
                 val = "<expression>"
             # Only add for non-trivial returns
@@ -195,7 +275,7 @@ def extract_python_llrs(source, file_path, func_name, start_line):
 
     Functionality: Parse and walk AST to identify structural elements
     Inputs: source (str), file_path (str), func_name (str), start_line (int)
-    Outputs: list of LLR draft dicts
+    Outputs: list of LLR drafts
     Timestamp: 2026-02-11 09:55 UTC
     """
     try:
@@ -204,197 +284,261 @@ def extract_python_llrs(source, file_path, func_name, start_line):
         return []
 
     extractor = PythonLLRExtractor(source, file_path, func_name, start_line)
-    extractor.visit(tree)
-    return extractor.llrs
+    return extractor.extract(tree)
 
 
 # ============================================================
 # Regex-based extraction for JS/TS, Go, Rust
 # ============================================================
 
-# Common branch/loop/error patterns
+# Common branch/loop/error patterns. Each pattern is tagged with the
+# TEXT_FORMATTERS entry that words its LLR, so the matched alternative alone
+# decides the text.
 REGEX_PATTERNS = {
     'js': {
         'branch': [
-            re.compile(r'^\s*(?:} )?(?:else )?if\s*\((.+?)\)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*} else\s*\{', re.MULTILINE),
-            re.compile(r'^\s*switch\s*\((.+?)\)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*case\s+(.+?):', re.MULTILINE),
-            re.compile(r'^\s*default\s*:', re.MULTILINE),
+            ('elif', re.compile(r'^\s*(?:} )?else if\s*\((.+?)\)\s*\{', re.MULTILINE)),
+            ('if', re.compile(r'^\s*(?:} )?if\s*\((.+?)\)\s*\{', re.MULTILINE)),
+            ('else', re.compile(r'^\s*} else\s*\{', re.MULTILINE)),
+            ('switch', re.compile(r'^\s*switch\s*\((.+?)\)\s*\{', re.MULTILINE)),
+            ('case', re.compile(r'^\s*case\s+(.+?):', re.MULTILINE)),
+            ('default', re.compile(r'^\s*default\s*:', re.MULTILINE)),
         ],
         'loop': [
-            re.compile(r'^\s*for\s*\((.+?)\)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*while\s*\((.+?)\)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*do\s*\{', re.MULTILINE),
-            re.compile(r'^\s*for\s*\(\s*(?:const|let|var)\s+\w+\s+(?:of|in)\s+.+?\)\s*\{', re.MULTILINE),
+            ('iterate', re.compile(r'^\s*for\s*\((.+?)\)\s*\{', re.MULTILINE)),
+            ('while', re.compile(r'^\s*while\s*\((.+?)\)\s*\{', re.MULTILINE)),
+            ('iterate', re.compile(r'^\s*do\s*\{', re.MULTILINE)),
+            ('iterate', re.compile(r'^\s*for\s*\(\s*(?:const|let|var)\s+\w+\s+(?:of|in)\s+.+?\)\s*\{', re.MULTILINE)),
         ],
         'error_handler': [
-            re.compile(r'^\s*try\s*\{', re.MULTILINE),
-            re.compile(r'^\s*}\s*catch\s*\((.+?)\)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*}\s*finally\s*\{', re.MULTILINE),
+            ('error', re.compile(r'^\s*try\s*\{', re.MULTILINE)),
+            ('catch', re.compile(r'^\s*}\s*catch\s*\((.+?)\)\s*\{', re.MULTILINE)),
+            ('error', re.compile(r'^\s*}\s*finally\s*\{', re.MULTILINE)),
         ],
         'validation': [
-            re.compile(r'^\s*if\s*\(\s*!?\w+\s*(?:===?|!==?)\s*(?:null|undefined|NaN)\s*\)', re.MULTILINE),
-            re.compile(r'^\s*if\s*\(\s*typeof\s+\w+\s*===?\s*[\'"]', re.MULTILINE),
+            ('validation', re.compile(r'^\s*if\s*\(\s*!?\w+\s*(?:===?|!==?)\s*(?:null|undefined|NaN)\s*\)', re.MULTILINE)),
+            ('validation', re.compile(r'^\s*if\s*\(\s*typeof\s+\w+\s*===?\s*[\'"]', re.MULTILINE)),
         ],
     },
     'go': {
         'branch': [
-            re.compile(r'^\s*if\s+(.+?)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*}\s*else\s*\{', re.MULTILINE),
-            re.compile(r'^\s*}\s*else if\s+(.+?)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*switch\s*(.*?)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*case\s+(.+?):', re.MULTILINE),
-            re.compile(r'^\s*default\s*:', re.MULTILINE),
+            ('if', re.compile(r'^\s*if\s+(.+?)\s*\{', re.MULTILINE)),
+            ('else', re.compile(r'^\s*}\s*else\s*\{', re.MULTILINE)),
+            ('elif', re.compile(r'^\s*}\s*else if\s+(.+?)\s*\{', re.MULTILINE)),
+            ('switch', re.compile(r'^\s*switch\s*(.*?)\s*\{', re.MULTILINE)),
+            ('case', re.compile(r'^\s*case\s+(.+?):', re.MULTILINE)),
+            ('default', re.compile(r'^\s*default\s*:', re.MULTILINE)),
         ],
         'loop': [
-            re.compile(r'^\s*for\s+(.*?)\s*\{', re.MULTILINE),
+            ('iterate', re.compile(r'^\s*for\s+(.*?)\s*\{', re.MULTILINE)),
         ],
         'error_handler': [
-            re.compile(r'^\s*if\s+err\s*!=\s*nil\s*\{', re.MULTILINE),
-            re.compile(r'^\s*defer\s+', re.MULTILINE),
+            ('err_check', re.compile(r'^\s*if\s+err\s*!=\s*nil\s*\{', re.MULTILINE)),
+            ('defer', re.compile(r'^\s*defer\s+', re.MULTILINE)),
         ],
     },
     'rust': {
         'branch': [
-            re.compile(r'^\s*if\s+(.+?)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*}\s*else\s+if\s+(.+?)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*}\s*else\s*\{', re.MULTILINE),
-            re.compile(r'^\s*match\s+(.+?)\s*\{', re.MULTILINE),
+            ('if', re.compile(r'^\s*if\s+(.+?)\s*\{', re.MULTILINE)),
+            ('elif', re.compile(r'^\s*}\s*else\s+if\s+(.+?)\s*\{', re.MULTILINE)),
+            ('else', re.compile(r'^\s*}\s*else\s*\{', re.MULTILINE)),
+            ('switch', re.compile(r'^\s*match\s+(.+?)\s*\{', re.MULTILINE)),
         ],
         'loop': [
-            re.compile(r'^\s*for\s+(\w+)\s+in\s+(.+?)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*while\s+(.+?)\s*\{', re.MULTILINE),
-            re.compile(r'^\s*loop\s*\{', re.MULTILINE),
+            ('iterate', re.compile(r'^\s*for\s+(\w+)\s+in\s+(.+?)\s*\{', re.MULTILINE)),
+            ('while', re.compile(r'^\s*while\s+(.+?)\s*\{', re.MULTILINE)),
+            ('loop', re.compile(r'^\s*loop\s*\{', re.MULTILINE)),
         ],
         'error_handler': [
-            re.compile(r'^\s*(?:\.unwrap\(\)|\.expect\()', re.MULTILINE),
-            re.compile(r'^\s*(?:Ok|Err)\s*\(', re.MULTILINE),
-            re.compile(r'\?\s*;', re.MULTILINE),
+            ('unwrap', re.compile(r'^\s*(?:\.unwrap\(\)|\.expect\()', re.MULTILINE)),
+            ('error', re.compile(r'^\s*(?:Ok|Err)\s*\(', re.MULTILINE)),
+            ('propagate', re.compile(r'\?\s*;', re.MULTILINE)),
         ],
     },
 }
 
+# First non-blank character a line must start with for any pattern of the
+# logic type to match. The fused scanner checks this in a lookahead before
+# trying the alternation, which rejects most JS lines after one character
+# class test instead of a failed attempt per pattern. Must stay a superset
+# of every pattern's possible first character.
+LEADING_CHARS = {
+    'js': {
+        'branch': '}eiscd',         # } else / else if / if / switch / case / default
+        'loop': 'fwd',              # for / while / do
+        'error_handler': 't}',      # try / } catch / } finally
+        'validation': 'i',          # if
+    },
+}
+
+# LLR text per pattern tag: (condition, stripped line) -> text
+TEXT_FORMATTERS = {
+    'if': lambda cond, line: f"If {cond.strip()}, execute conditional block.",
+    'elif': lambda cond, line: f"Else-if branch: when {cond.strip()}, execute the corresponding block.",
+    'else': lambda cond, line: "Else branch: execute default/fallthrough block.",
+    'switch': lambda cond, line: f"Switch/match on '{cond.strip()}'. Evaluate each arm/case.",
+    'case': lambda cond, line: f"Case '{cond.strip()}': execute case-specific logic.",
+    'default': lambda cond, line: "Default case: execute fallback logic.",
+    'iterate': lambda cond, line: f"Iterate: {cond.strip() if cond else 'loop'}.",
+    'while': lambda cond, line: f"While {cond.strip()}, repeat loop body.",
+    'loop': lambda cond, line: "Infinite loop (requires explicit break for termination).",
+    'catch': lambda cond, line: f"Catch handler for '{cond.strip()}'. Process error.",
+    'defer': lambda cond, line: f"Deferred cleanup: {line}.",
+    'err_check': lambda cond, line: "Error check: if err != nil, handle error condition.",
+    'propagate': lambda cond, line: "Propagate error via ? operator.",
+    'unwrap': lambda cond, line: f"Unwrap/expect: panic on None/Err. {line}",
+    'error': lambda cond, line: f"Error handling: {line}",
+    'validation': lambda cond, line: f"Input validation: {cond.strip() if cond else line}.",
+}
+
 # Map match arm patterns for Rust
-RUST_MATCH_ARM = re.compile(r'^\s+(\S.*?)\s*=>', re.MULTILINE)
+RUST_MATCH_ARM = re.compile(r'^[^\S\n]+(\S.*?)[^\S\n]*=>', re.MULTILINE)
+
+# Patterns were written for re.match() against a single line. When scanning
+# the whole source, \s must not cross a newline and every alternative must be
+# anchored at a line start (the Rust '?;' pattern is not anchored itself).
+# The anchor is a literal '\n' rather than ^: re can then jump between
+# newlines with its literal-prefix search instead of trying the whole
+# alternation at every offset. Sources are scanned as '\n' + source, so a
+# match's start() is the offset of its line in the unpadded source.
+_LINE_WS_RE = re.compile(r'(?<!\\)\\s')
+_NEWLINE_RE = re.compile(r'\n')
+
+
+def _line_bounded(pattern):
+    """Rewrite a single-line pattern's \\s so it cannot match a newline."""
+    return _LINE_WS_RE.sub(lambda m: r'[^\S\n]', pattern)
+
+
+def _fuse_patterns(lang_key, logic_type, patterns):
+    """
+    Fuse one logic type's tagged patterns into a single named alternation.
+
+    Returns (fused_regex, alternatives) where alternatives maps each
+    alternative's group name to (cond_group, formatter): the index of its
+    first capture group (the condition text), or None if the pattern
+    captures nothing, and its TEXT_FORMATTERS entry.
+    Alternation order keeps the original first-pattern-wins priority, and
+    each alternative is kept line-bounded so finditer() over a whole source
+    yields at most one match per line, exactly as re.match() per line did.
+    """
+    names = [f"{lang_key}_{logic_type}_{i}" for i in range(len(patterns))]
+    alternatives = '|'.join(f'(?P<{name}>{_line_bounded(pat.pattern)})'
+                            for name, (_, pat) in zip(names, patterns))
+    lead = LEADING_CHARS.get(lang_key, {}).get(logic_type)
+    gate = f'(?=[^\\S\\n]*[{re.escape(lead)}])' if lead else ''
+    fused = re.compile(f'\\n{gate}(?:{alternatives})', re.MULTILINE)
+    dispatch = {}
+    for name, (tag, pat) in zip(names, patterns):
+        cond_group = fused.groupindex[name] + 1 if pat.groups else None
+        dispatch[name] = (cond_group, TEXT_FORMATTERS[tag])
+    return fused, dispatch
+
+
+# Per language: [(logic_type, fused_regex, alternatives), ...] in REGEX_PATTERNS
+# order. Types stay separate because one line may yield an LLR of each type
+# (e.g. a Go 'if err != nil {' is both a branch and an error handler).
+FUSED_PATTERNS = {
+    lang_key: [(logic_type, *_fuse_patterns(lang_key, logic_type, pats))
+               for logic_type, pats in type_patterns.items()]
+    for lang_key, type_patterns in REGEX_PATTERNS.items()
+}
+
+
+# File extension -> language key for regex patterns
+_LANG_KEYS = {
+    '.js': 'js', '.jsx': 'js', '.ts': 'js', '.tsx': 'js',
+    '.go': 'go',
+    '.rs': 'rust',
+}
+
+# Extensions with an extractor; other files only get a manual-derivation stub
+_SUPPORTED_EXTS = frozenset(_LANG_KEYS) | {'.py'}
 
 
 def _get_lang_key(ext):
     """Map file extension to language key for regex patterns."""
-    if ext in ('.js', '.jsx', '.ts', '.tsx'):
-        return 'js'
-    if ext == '.go':
-        return 'go'
-    if ext == '.rs':
-        return 'rust'
-    return None
+    return _LANG_KEYS.get(ext)
 
 
 def extract_regex_llrs(source, file_path, func_name, start_line, lang_ext):
     """
     Extract LLRs from source using regex heuristics (JS/TS/Go/Rust).
 
-    Functionality: Scans source line-by-line for structural patterns
+    Functionality: Scans the whole source once per logic type for structural patterns
     Inputs: source (str), file_path (str), func_name (str),
             start_line (int), lang_ext (str)
-    Outputs: list of LLR draft dicts
+    Outputs: list of LLR drafts
     Timestamp: 2026-02-11 09:55 UTC
     """
     lang_key = _get_lang_key(lang_ext)
     if lang_key is None:
         return []
 
-    patterns = REGEX_PATTERNS.get(lang_key, {})
+    fused_patterns = FUSED_PATTERNS.get(lang_key, [])
     llrs = []
     idx = 0
-    lines = source.split('\n')
+    id_prefix = _make_llr_prefix(file_path, func_name)
 
     # Always generate an initialization LLR for the function itself
     idx += 1
-    llrs.append({
-        'id': _make_llr_id(file_path, func_name, idx),
-        'text': f"Function '{func_name}' entry point. "
-                f"Defined at {file_path}:{start_line}.",
-        'logic_type': 'initialization',
-        'trace_to_code': f"{file_path}:{start_line}",
-    })
-
-    for line_num, line in enumerate(lines, 1):
-        abs_line = start_line + line_num - 1
-
-        for logic_type, type_patterns in patterns.items():
-            for pat in type_patterns:
-                match = pat.match(line)
-                if match:
-                    groups = match.groups()
-                    condition = groups[0] if groups else ''
-
-                    # Build descriptive text based on type
-                    if logic_type == 'branch':
-                        if 'switch' in line.lower() or 'match' in line.lower():
-                            text = f"Switch/match on '{condition.strip()}'. Evaluate each arm/case."
-                        elif 'else if' in line.lower() or 'elif' in line.lower():
-                            text = f"Else-if branch: when {condition.strip()}, execute the corresponding block."
-                        elif 'else' in line.lower() and not condition:
-                            text = f"Else branch: execute default/fallthrough block."
-                        elif 'case' in line.lower():
-                            text = f"Case '{condition.strip()}': execute case-specific logic."
-                        elif 'default' in line.lower():
-                            text = f"Default case: execute fallback logic."
-                        else:
-                            text = f"If {condition.strip()}, execute conditional block."
-
-                    elif logic_type == 'loop':
-                        if 'while' in line.lower():
-                            text = f"While {condition.strip()}, repeat loop body."
-                        elif 'loop' in line.lower() and not condition:
-                            text = f"Infinite loop (requires explicit break for termination)."
-                        else:
-                            text = f"Iterate: {condition.strip() if condition else 'loop'}."
-
-                    elif logic_type == 'error_handler':
-                        if 'catch' in line.lower():
-                            text = f"Catch handler for '{condition.strip()}'. Process error."
-                        elif 'defer' in line.lower():
-                            text = f"Deferred cleanup: {line.strip()}."
-                        elif 'err != nil' in line:
-                            text = f"Error check: if err != nil, handle error condition."
-                        elif '?' in line:
-                            text = f"Propagate error via ? operator."
-                        elif 'unwrap' in line or 'expect' in line:
-                            text = f"Unwrap/expect: panic on None/Err. {line.strip()}"
-                        else:
-                            text = f"Error handling: {line.strip()}"
-
-                    elif logic_type == 'validation':
-                        text = f"Input validation: {condition.strip() if condition else line.strip()}."
-
-                    else:
-                        text = f"{logic_type}: {line.strip()}"
-
-                    idx += 1
-                    llrs.append({
-                        'id': _make_llr_id(file_path, func_name, idx),
-                        'text': text,
-                        'logic_type': logic_type,
-                        'trace_to_code': f"{file_path}:{abs_line}",
-                    })
-                    break  # Only match first pattern per line
-
-        # Rust: detect match arms as additional branch LLRs
-        if lang_key == 'rust':
-            arm_match = RUST_MATCH_ARM.match(line)
-            if arm_match:
-                arm_text = arm_match.group(1).strip()
-                # Skip generic catch-all _ unless it's meaningful
-                if arm_text != '_':
-                    idx += 1
-                    llrs.append({
-                        'id': _make_llr_id(file_path, func_name, idx),
-                        'text': f"Match arm '{arm_text}': execute arm-specific logic.",
-                        'logic_type': 'branch',
-                        'trace_to_code': f"{file_path}:{abs_line}",
-                    })
+    llrs.append(LLR(
+        id=f"{id_prefix}{idx:03d}",
+        text=f"Function '{func_name}' entry point. "
+             f"Defined at {file_path}:{start_line}.",
+        logic_type='initialization',
+        trace_to_code=f"{file_path}:{start_line}",
+    ))
+
+    # Offsets of each line start; a match's line is found by bisection
+    line_starts = [0]
+    line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(source))
+
+    # One finditer per logic type over the whole source. Hits are ordered by
+    # (line, type order) with Rust match arms last, as the per-line scan was.
+    hits = []
+    padded = '\n' + source
+    for order, (logic_type, fused, alternatives) in enumerate(fused_patterns):
+        for match in fused.finditer(padded):
+            cond_group, formatter = alternatives[match.lastgroup]
+            condition = match.group(cond_group) if cond_group else ''
+            hits.append((bisect_right(line_starts, match.start()) - 1, order,
+                         logic_type, condition, formatter))
+    if lang_key == 'rust':
+        arm_order = len(fused_patterns)
+        for arm_match in RUST_MATCH_ARM.finditer(source):
+            hits.append((bisect_right(line_starts, arm_match.start()) - 1, arm_order,
+                         None, arm_match.group(1).strip(), None))
+    hits.sort(key=lambda hit: hit[:2])
+
+    last_line = len(line_starts) - 1
+    for line_idx, _, logic_type, condition, formatter in hits:
+        abs_line = start_line + line_idx
+        line_end = line_starts[line_idx + 1] - 1 if line_idx < last_line else len(source)
+        line = source[line_starts[line_idx]:line_end]
+
+        if logic_type is None:
+            # Rust: detect match arms as additional branch LLRs
+            # Skip generic catch-all _ unless it's meaningful
+            if condition != '_':
+                idx += 1
+                llrs.append(LLR(
+                    id=f"{id_prefix}{idx:03d}",
+                    text=f"Match arm '{condition}': execute arm-specific logic.",
+                    logic_type='branch',
+                    trace_to_code=f"{file_path}:{abs_line}",
+                ))
+            continue
+
+        text = formatter(condition, line.strip())
+
+        idx += 1
+        llrs.append(LLR(
+            id=f"{id_prefix}{idx:03d}",
+            text=text,
+            logic_type=logic_type,
+            trace_to_code=f"{file_path}:{abs_line}",
+        ))
 
     return llrs
 
@@ -403,68 +547,91 @@ def extract_regex_llrs(source, file_path, func_name, start_line, lang_ext):
 # Main orchestration
 # ============================================================
 
+# One uncovered source_inventory row, in get_source_inventory() column order
+InventoryFunction = namedtuple(
+    'InventoryFunction', 'id file_path function_name start_line end_line'
+)
+
+
 def get_source_inventory(db_path):
     """
     Read all functions from source_inventory that need LLR derivation.
 
     Functionality: Query source_inventory for uncovered functions
     Inputs: db_path (str)
-    Outputs: list of dicts with id, file_path, function_name, start_line, end_line
+    Outputs: list of InventoryFunction tuples
     Timestamp: 2026-02-11 09:55 UTC
     """
     conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
     cursor = conn.execute("""
         SELECT id, file_path, function_name, start_line, end_line
         FROM source_inventory
         WHERE has_llr = 0
         ORDER BY file_path, start_line
     """)
-    rows = [dict(r) for r in cursor.fetchall()]
+    rows = list(map(InventoryFunction._make, cursor))
     conn.close()
     return rows
 
 
-def read_function_source(app_root, file_path, start_line, end_line):
+def read_source_file(app_root, file_path):
     """
-    Read the source code of a specific function from disk.
+    Read a source file once and index the offset of each line start.
 
-    Functionality: Extract function body from file using line ranges
-    Inputs: app_root (str), file_path (str), start_line (int), end_line (int)
-    Outputs: source code string, or None on error
+    Functionality: Load file text for slicing out every function it contains
+    Inputs: app_root (str), file_path (str)
+    Outputs: (text, line_starts) tuple, or None if the file does not exist;
+             read errors propagate to the caller
     Timestamp: 2026-02-11 09:55 UTC
     """
     full_path = os.path.join(app_root, file_path)
     if not os.path.isfile(full_path):
         return None
-    try:
-        with open(full_path, 'r', encoding='utf-8', errors='replace') as f:
-            all_lines = f.readlines()
+    with open(full_path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
 
-        # Extract the function's line range (1-indexed → 0-indexed)
-        start_idx = max(0, start_line - 1)
-        end_idx = min(len(all_lines), end_line)
-        return ''.join(all_lines[start_idx:end_idx])
-    except Exception as e:
-        print(f"  WARN: Cannot read {full_path}: {e}")
-        return None
+    line_starts = [0]
+    line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(text))
+    return text, line_starts
 
 
-def derive_llrs_for_function(app_root, func_record):
+def read_function_source(source_file, start_line, end_line):
+    """
+    Slice the source code of a specific function out of a read file.
+
+    Functionality: Extract function body from file text using line ranges
+    Inputs: source_file (tuple from read_source_file), start_line (int), end_line (int)
+    Outputs: source code string
+    Timestamp: 2026-02-11 09:55 UTC
+    """
+    text, line_starts = source_file
+
+    # Extract the function's line range (1-indexed → 0-indexed)
+    start_idx = max(0, start_line - 1)
+    end_idx = min(len(line_starts), end_line)
+    if start_idx >= end_idx:
+        return ''
+    end = line_starts[end_idx] if end_idx < len(line_starts) else len(text)
+    return text[line_starts[start_idx]:end]
+
+
+def derive_llrs_for_function(source_file, func_record):
     """
     Derive draft LLRs for a single function from source_inventory.
 
-    Functionality: Read source, dispatch to appropriate extractor
-    Inputs: app_root (str), func_record (dict)
-    Outputs: list of LLR draft dicts
+    Functionality: Slice function source, dispatch to appropriate extractor
+    Inputs: source_file (tuple from read_source_file, or None), func_record (InventoryFunction)
+    Outputs: list of LLR drafts
     Timestamp: 2026-02-11 09:55 UTC
     """
-    file_path = func_record['file_path']
-    func_name = func_record['function_name']
-    start_line = func_record['start_line'] or 1
-    end_line = func_record['end_line'] or start_line + 50
+    file_path = func_record.file_path
+    func_name = func_record.function_name
+    start_line = func_record.start_line or 1
+    end_line = func_record.end_line or start_line + 50
 
-    source = read_function_source(app_root, file_path, start_line, end_line)
+    if source_file is None:
+        return []
+    source = read_function_source(source_file, start_line, end_line)
     if not source:
         return []
 
@@ -477,74 +644,142 @@ def derive_llrs_for_function(app_root, func_record):
 
     # Ensure at least one LLR per function
     if not llrs:
-        llrs.append({
-            'id': _make_llr_id(file_path, func_name, 1),
-            'text': f"Function '{func_name}' at {file_path}:{start_line}-{end_line}. "
-                    f"Requires manual LLR derivation.",
-            'logic_type': 'other',
-            'trace_to_code': f"{file_path}:{start_line}-{end_line}",
-        })
+        llrs.append(_manual_llr(func_record))
 
     return llrs
 
 
-def populate_llrs(db_path, all_llrs, inventory_ids):
+def _manual_llr(func_record):
+    """Placeholder LLR for a function no extractor could derive from."""
+    file_path = func_record.file_path
+    func_name = func_record.function_name
+    start_line = func_record.start_line or 1
+    end_line = func_record.end_line or start_line + 50
+    return LLR(
+        id=_make_llr_id(file_path, func_name, 1),
+        text=f"Function '{func_name}' at {file_path}:{start_line}-{end_line}. "
+             f"Requires manual LLR derivation.",
+        logic_type='other',
+        trace_to_code=f"{file_path}:{start_line}-{end_line}",
+    )
+
+
+def derive_file_llrs(app_root, file_path, file_funcs):
+    """
+    Derive draft LLRs for every function of one source file.
+
+    Functionality: Read the file once, run the extractor per function. Runs
+                   in a worker process, so nothing is printed here.
+    Inputs: app_root (str), file_path (str), file_funcs (list of InventoryFunction)
+    Outputs: (warning or None, list of LLR lists aligned with file_funcs)
+    Timestamp: 2026-02-11 09:55 UTC
+    """
+    # No extractor for this language: stub every function without reading
+    if os.path.splitext(file_path)[1].lower() not in _SUPPORTED_EXTS:
+        return None, [[_manual_llr(func)] for func in file_funcs]
+
+    try:
+        source_file = read_source_file(app_root, file_path)
+    except Exception as e:
+        warning = f"  WARN: Cannot read {os.path.join(app_root, file_path)}: {e}"
+        return warning, [[] for _ in file_funcs]
+    return None, [derive_llrs_for_function(source_file, func) for func in file_funcs]
+
+
+# LLR rows buffered before each executemany in populate_llrs
+LLR_BATCH_SIZE = 1000
+
+
+def populate_llrs(db_path, derived, batch_size=LLR_BATCH_SIZE):
     """
     Write LLR drafts to the database and update source_inventory.
 
-    Functionality: UPSERT LLRs and set has_llr = 1 for processed functions
-    Inputs: db_path (str), all_llrs (list), inventory_ids (list)
-    Outputs: count of inserted/updated LLRs
+    Functionality: UPSERT LLRs and set has_llr = 1 for processed functions,
+                   consuming derived incrementally in bounded batches
+    Inputs: db_path (str), derived (iterable of (inventory_id, llrs) pairs),
+            batch_size (int)
+    Outputs: (inserted, updated, functions marked) counts
     Timestamp: 2026-02-11 09:55 UTC
     """
     conn = sqlite3.connect(db_path)
+    for pragma in WRITE_PRAGMAS:
+        conn.execute(pragma)
     conn.execute("PRAGMA foreign_keys = OFF;")  # Temporarily disable for draft inserts
-    cursor = conn.cursor()
-
-    inserted = 0
-    updated = 0
-
-    # Ensure the placeholder HLR exists for unclustered LLRs
-    cursor.execute("""
-        INSERT OR IGNORE INTO high_level_requirements
-            (id, text, source, is_derived, derivation_rationale, hlr_category)
-        VALUES
-            ('HLR_UNCLUSTERED', 'Unclustered draft LLRs awaiting HLR assignment',
-             'Derived', 1, 'Auto-generated placeholder for LLRs pending cluster_hlrs.py',
-             'functional')
-    """)
 
-    for llr in all_llrs:
-        cursor.execute("SELECT id FROM low_level_requirements WHERE id = ?", (llr['id'],))
-        existing = cursor.fetchone()
-
-        if existing:
-            cursor.execute("""
-                UPDATE low_level_requirements
-                SET text = ?, logic_type = ?, trace_to_code = ?,
-                    updated_at = datetime('now')
-                WHERE id = ?
-            """, (llr['text'], llr['logic_type'], llr['trace_to_code'], llr['id']))
-            updated += 1
-        else:
-            cursor.execute("""
-                INSERT INTO low_level_requirements
-                    (id, text, parent_hlr, source, logic_type, trace_to_code)
-                VALUES (?, ?, 'HLR_UNCLUSTERED', 'Derived', ?, ?)
-            """, (llr['id'], llr['text'], llr['logic_type'], llr['trace_to_code']))
-            inserted += 1
-
-    # Mark all processed functions as having LLRs
-    for inv_id in inventory_ids:
-        cursor.execute("""
-            UPDATE source_inventory SET has_llr = 1 WHERE id = ?
-        """, (inv_id,))
-
-    conn.commit()
+    llr_rows = []
+    inv_rows = []
+    total = 0
+    marked = 0
+
+    def flush():
+        # Existing LLRs keep their parent_hlr/source; only the derived
+        # content is refreshed.
+        conn.executemany("""
+            INSERT INTO low_level_requirements
+                (id, text, parent_hlr, source, logic_type, trace_to_code)
+            VALUES (?, ?, 'HLR_UNCLUSTERED', 'Derived', ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                text = excluded.text,
+                logic_type = excluded.logic_type,
+                trace_to_code = excluded.trace_to_code,
+                updated_at = datetime('now')
+        """, llr_rows)
+        # Mark the processed functions as having LLRs
+        conn.executemany("UPDATE source_inventory SET has_llr = 1 WHERE id = ?", inv_rows)
+        llr_rows.clear()
+        inv_rows.clear()
+
+    with conn:
+        # Ensure the placeholder HLR exists for unclustered LLRs
+        conn.execute("""
+            INSERT OR IGNORE INTO high_level_requirements
+                (id, text, source, is_derived, derivation_rationale, hlr_category)
+            VALUES
+                ('HLR_UNCLUSTERED', 'Unclustered draft LLRs awaiting HLR assignment',
+                 'Derived', 1, 'Auto-generated placeholder for LLRs pending cluster_hlrs.py',
+                 'functional')
+        """)
+
+        # The row-count delta splits inserts from updates
+        before = conn.execute("SELECT COUNT(*) FROM low_level_requirements").fetchone()[0]
+        for inv_id, llrs in derived:
+            llr_rows.extend(llrs)   # LLR field order matches the VALUES placeholders
+            inv_rows.append((inv_id,))
+            total += len(llrs)
+            marked += 1
+            if len(llr_rows) >= batch_size:
+                flush()
+        flush()
+        after = conn.execute("SELECT COUNT(*) FROM low_level_requirements").fetchone()[0]
+
     conn.close()
-    print(f"\nDatabase updated: {inserted} LLRs inserted, {updated} updated")
-    print(f"Source inventory: {len(inventory_ids)} functions marked as covered")
-    return inserted + updated
+    inserted = after - before
+    return inserted, total - inserted, marked
+
+
+def iter_derived_llrs(file_items, results, totals):
+    """
+    Pair each covered function with its LLRs, printing per-file progress.
+
+    Functionality: Lazily walk extraction results in file order
+    Inputs: file_items (list of (file_path, functions)), results (iterable of
+            derive_file_llrs outputs aligned with file_items), totals (dict
+            updated with 'llrs' and 'functions' counts as pairs are yielded)
+    Outputs: yields (inventory_id, llrs) for functions with at least one LLR
+    Timestamp: 2026-02-11 09:55 UTC
+    """
+    for (file_path, file_funcs), (warning, func_llrs) in zip(file_items, results):
+        print(f"  {file_path}:")
+        if warning:
+            print(warning)
+        for func, llrs in zip(file_funcs, func_llrs):
+            if llrs:
+                print(f"    {func.function_name}: {len(llrs)} LLRs")
+                totals['llrs'] += len(llrs)
+                totals['functions'] += 1
+                yield func.id, llrs
+            else:
+                print(f"    {func.function_name}: WARNING — no LLRs extracted")
 
 
 def main():
@@ -558,6 +793,9 @@ def main():
                              '(default: inferred from source_inventory paths)')
     parser.add_argument('--dry-run', action='store_true',
                         help='Print generated LLRs without writing to DB')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for LLR extraction '
+                             '(default: CPU count; 1 disables multiprocessing)')
 
     args = parser.parse_args()
 
@@ -591,35 +829,50 @@ def main():
     print(f"Functions to process: {len(functions)}")
     print()
 
-    all_llrs = []
-    inventory_ids = []
-
     # Group by file for efficient processing
     by_file = defaultdict(list)
     for func in functions:
-        by_file[func['file_path']].append(func)
+        by_file[func.file_path].append(func)
+
+    # Files are independent, so extraction is sharded across processes. map()
+    # yields results in file order; they are streamed straight into the DB
+    # writer and all output is printed from here.
+    file_items = sorted(by_file.items())
+    file_paths = [fp for fp, _ in file_items]
+    file_func_lists = [funcs for _, funcs in file_items]
+    derive = functools.partial(derive_file_llrs, app_root)
+    jobs = args.jobs or os.cpu_count() or 1
+    pool = None
+    if jobs > 1 and len(file_items) > 1:
+        chunksize = max(1, len(file_items) // (jobs * 4))
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        results = pool.map(derive, file_paths, file_func_lists, chunksize=chunksize)
+    else:
+        results = map(derive, file_paths, file_func_lists)
 
-    for file_path, file_funcs in sorted(by_file.items()):
-        print(f"  {file_path}:")
-        for func in file_funcs:
-            llrs = derive_llrs_for_function(app_root, func)
-            if llrs:
-                print(f"    {func['function_name']}: {len(llrs)} LLRs")
-                all_llrs.extend(llrs)
-                inventory_ids.append(func['id'])
-            else:
-                print(f"    {func['function_name']}: WARNING — no LLRs extracted")
+    totals = {'llrs': 0, 'functions': 0}
+    derived = iter_derived_llrs(file_items, results, totals)
+    try:
+        if args.dry_run:
+            # The dry-run listing follows the totals, so it has to be buffered
+            all_llrs = [llr for _, llrs in derived for llr in llrs]
+        else:
+            inserted, updated, marked = populate_llrs(db, derived)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
-    print(f"\nTotal: {len(all_llrs)} LLRs derived from {len(inventory_ids)} functions")
+    print(f"\nTotal: {totals['llrs']} LLRs derived from {totals['functions']} functions")
 
     if args.dry_run:
         print("\n--- DRY RUN (no DB writes) ---")
         for llr in all_llrs:
-            print(f"  [{llr['logic_type']:15s}] {llr['id']}")
-            print(f"                    {llr['text'][:100]}")
-            print(f"                    -> {llr['trace_to_code']}")
+            print(f"  [{llr.logic_type:15s}] {llr.id}")
+            print(f"                    {llr.text[:100]}")
+            print(f"                    -> {llr.trace_to_code}")
     else:
-        populate_llrs(db, all_llrs, inventory_ids)
+        print(f"\nDatabase updated: {inserted} LLRs inserted, {updated} updated")
+        print(f"Source inventory: {marked} functions marked as covered")
 
     print("\nPhase 2A complete.")
 
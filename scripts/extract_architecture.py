@@ -17,112 +17,163 @@ Timestamp: 2026-02-11 18:36 UTC
 """
 
 import argparse
+import functools
+import mmap
 import os
 import re
 import sqlite3
 import sys
 from collections import defaultdict
 
+# Decisions are re-inferred on every run, so the write connection can skip
+# the per-commit fsync (WAL + synchronous=NORMAL).
+WRITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+)
+
 
 # ──────────────────────────────────────────────────────────────
 # Import extraction patterns per language
 # ──────────────────────────────────────────────────────────────
 
+# Byte patterns: files are scanned in place (mmap) without decoding, and
+# only the captured targets are decoded.
 IMPORT_PATTERNS = {
-    '.js':  [
-        re.compile(r'''(?:import|require)\s*\(?['"]([^'"]+)['"]\)?'''),
-        re.compile(r'''from\s+['"]([^'"]+)['"]'''),
-    ],
+    '.js':  (
+        re.compile(rb'''(?:import|require)\s*\(?['"]([^'"]+)['"]\)?'''),
+        re.compile(rb'''from\s+['"]([^'"]+)['"]'''),
+    ),
     '.jsx': None,   # reuse .js
     '.ts':  None,   # reuse .js
     '.tsx': None,   # reuse .js
-    '.go':  [
-        re.compile(r'"([^"]+)"'),  # inside import blocks
-    ],
-    '.py':  [
-        re.compile(r'^(?:from|import)\s+([\w.]+)', re.MULTILINE),
-    ],
-    '.rs':  [
-        re.compile(r'(?:use|mod)\s+([\w:]+)', re.MULTILINE),
-    ],
+    '.go':  (
+        re.compile(rb'"([^"]+)"'),  # inside import blocks
+    ),
+    '.py':  (
+        re.compile(rb'^(?:from|import)\s+([\w.]+)', re.MULTILINE),
+    ),
+    '.rs':  (
+        re.compile(rb'(?:use|mod)\s+([\w:]+)', re.MULTILINE),
+    ),
 }
 
+# Below this size a plain read() is cheaper than setting up a mapping
+MMAP_MIN_SIZE = 4096
+
+# Resolve the "reuse .js" aliases once so lookups are a single dict access
+for _ext, _patterns in IMPORT_PATTERNS.items():
+    if _patterns is None:
+        IMPORT_PATTERNS[_ext] = IMPORT_PATTERNS['.js']
+
+# Component roles in priority order: the first role whose keywords occur in
+# the component name wins.
+COMPONENT_ROLES = (
+    ('API Layer', frozenset(('controller', 'api', 'route'))),
+    ('Service / Shared Library', frozenset(('service', 'lib', 'core', 'util'))),
+    ('UI / Frontend', frozenset(('frontend', 'ui', 'component', 'view', 'page'))),
+    ('Backend', frozenset(('backend', 'server'))),
+    ('Testing', frozenset(('test', 'spec', 'fixture'))),
+    ('Configuration', frozenset(('config', 'setting'))),
+)
+
 
-def _get_patterns(ext):
-    """Get import patterns, falling back to .js for JSX/TS/TSX."""
-    p = IMPORT_PATTERNS.get(ext)
-    if p is None and ext in ('.jsx', '.ts', '.tsx'):
-        return IMPORT_PATTERNS['.js']
-    return p or []
+def _fuse_import_patterns(patterns):
+    """
+    Fuse one extension's import patterns into a single alternation so a file
+    is scanned once. Every pattern has exactly one capture group, so the
+    matched alternative's target is m.group(m.lastindex).
+    """
+    flags = 0
+    for pat in patterns:
+        flags |= pat.flags
+    return re.compile(b'|'.join(b'(?:%s)' % pat.pattern for pat in patterns), flags)
+
+
+# One scanner per extension (JSX/TS/TSX share the .js scanner)
+IMPORT_SCANNERS = {ext: _fuse_import_patterns(patterns)
+                   for ext, patterns in IMPORT_PATTERNS.items()}
 
 
 def extract_imports(file_path, ext):
     """Extract import targets from a source file."""
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-    except (OSError, IOError):
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                return _collect_imports(f.read(), ext)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _collect_imports(mm, ext)
+    except (OSError, IOError, ValueError):
+        return []
+
+
+def _collect_imports(content, ext):
+    """Scan a bytes-like buffer for internal import targets."""
+    scanner = IMPORT_SCANNERS.get(ext)
+    if scanner is None:
         return []
+    # Collect distinct raw targets first, then decode and filter each once
+    raw_targets = {m.group(m.lastindex) for m in scanner.finditer(content)}
 
-    patterns = _get_patterns(ext)
     imports = set()
-    for pat in patterns:
-        for m in pat.finditer(content):
-            target = m.group(1)
-            # Skip stdlib / npm / external crate references
-            if target.startswith(('.', '/', '..', '@')):
-                imports.add(target)
-            elif ext == '.py' and '.' in target:
-                imports.add(target)
-            elif ext == '.rs' and '::' in target:
-                imports.add(target)
-            elif ext == '.go' and '/' in target:
-                imports.add(target)
+    for raw in raw_targets:
+        target = raw.decode('utf-8', 'ignore')
+        # Skip stdlib / npm / external crate references
+        if target.startswith(('.', '/', '..', '@')):
+            imports.add(target)
+        elif ext == '.py' and '.' in target:
+            imports.add(target)
+        elif ext == '.rs' and '::' in target:
+            imports.add(target)
+        elif ext == '.go' and '/' in target:
+            imports.add(target)
     return list(imports)
 
 
+# Component of each inventoried file, computed in SQL: the first two path
+# segments after normalizing separators (e.g. src/backend), or the whole
+# path when it has fewer than three segments.
+COMPONENT_SQL = """
+    SELECT CASE WHEN second_slash > 0 THEN substr(norm, 1, first_slash + second_slash - 1)
+                ELSE norm END AS component,
+           file_path
+    FROM (
+        SELECT file_path, norm, first_slash,
+               CASE WHEN first_slash > 0 THEN instr(substr(norm, first_slash + 1), '/')
+                    ELSE 0 END AS second_slash
+        FROM (
+            SELECT file_path, replace(file_path, '\\', '/') AS norm,
+                   instr(replace(file_path, '\\', '/'), '/') AS first_slash
+            FROM (SELECT DISTINCT file_path FROM source_inventory)
+        )
+    )
+"""
+
+
 def build_component_map(cursor, app_root):
     """
     Build a map of components from the source_inventory.
     A 'component' is defined as a top-level directory under app_root
     that contains source files.
     """
-    cursor.execute("SELECT DISTINCT file_path FROM source_inventory")
-    files = [row[0] for row in cursor.fetchall()]
-
     component_map = defaultdict(list)   # component_name -> [file_paths]
-    for fp in files:
-        # Normalize separators
-        norm = fp.replace('\\', '/')
-        parts = norm.split('/')
-        if len(parts) >= 2:
-            # Component = first two directory levels (e.g., src/backend)
-            comp = '/'.join(parts[:2])
-        else:
-            comp = parts[0] if parts else 'root'
+    for comp, fp in cursor.execute(COMPONENT_SQL):
         component_map[comp].append(fp)
 
     return component_map
 
 
-def classify_component(comp_name, files):
+@functools.lru_cache(maxsize=None)
+def classify_component(comp_name):
     """Classify a component's architectural role."""
     name_lower = comp_name.lower()
 
-    if any(k in name_lower for k in ['controller', 'api', 'route']):
-        return 'API Layer'
-    elif any(k in name_lower for k in ['service', 'lib', 'core', 'util']):
-        return 'Service / Shared Library'
-    elif any(k in name_lower for k in ['frontend', 'ui', 'component', 'view', 'page']):
-        return 'UI / Frontend'
-    elif any(k in name_lower for k in ['backend', 'server']):
-        return 'Backend'
-    elif any(k in name_lower for k in ['test', 'spec', 'fixture']):
-        return 'Testing'
-    elif any(k in name_lower for k in ['config', 'setting']):
-        return 'Configuration'
-    else:
-        return 'Module'
+    for role, keywords in COMPONENT_ROLES:
+        if any(k in name_lower for k in keywords):
+            return role
+    return 'Module'
 
 
 def infer_data_flow(component_map, app_root):
@@ -132,21 +183,43 @@ def infer_data_flow(component_map, app_root):
     """
     edges = defaultdict(int)  # (src_comp, dst_comp) -> count
 
+    # An import resolves to the first component (in map order) whose last
+    # path segment prefixes it. Index components by that segment so a lookup
+    # probes one dict key per distinct segment length, not every component.
+    by_segment = defaultdict(list)  # last segment -> [(map order, component)]
+    for order, comp in enumerate(component_map):
+        by_segment[comp.split('/')[-1]].append((order, comp))
+    segment_lengths = sorted({len(seg) for seg in by_segment})
+
+    def resolve(imp_norm, comp):
+        best = None
+        for n in segment_lengths:
+            if n > len(imp_norm):
+                break
+            for order, other_comp in by_segment.get(imp_norm[:n], ()):
+                if other_comp != comp:
+                    if best is None or order < best[0]:
+                        best = (order, other_comp)
+                    break
+        return best[1] if best else None
+
+    resolved = {}  # (imp_norm, comp) -> target component or None
+
     for comp, files in component_map.items():
         for fp in files:
             ext = os.path.splitext(fp)[1]
-            full_path = os.path.join(app_root, fp)
-            if not os.path.isfile(full_path):
-                continue
-
-            imports = extract_imports(full_path, ext)
+            # No isfile() pre-check: extract_imports() treats a missing or
+            # unreadable path (OSError from open) as having no imports.
+            imports = extract_imports(os.path.join(app_root, fp), ext)
             for imp in imports:
                 # Resolve import to component
                 imp_norm = imp.lstrip('./').replace('\\', '/')
-                for other_comp in component_map:
-                    if other_comp != comp and imp_norm.startswith(other_comp.split('/')[-1]):
-                        edges[(comp, other_comp)] += 1
-                        break
+                key = (imp_norm, comp)
+                if key not in resolved:
+                    resolved[key] = resolve(imp_norm, comp)
+                other_comp = resolved[key]
+                if other_comp is not None:
+                    edges[(comp, other_comp)] += 1
 
     return [(s, t, c) for (s, t), c in sorted(edges.items(), key=lambda x: -x[1])]
 
@@ -156,25 +229,29 @@ def generate_decisions(component_map, data_flow_edges, cursor):
     decisions = []
     arch_idx = 1
 
+    # Function counts and the associated HLR per component, from one grouped
+    # scan. A component's parent HLR is the (existing) HLR of its earliest
+    # scanned function.
+    comp_of = {fp: comp for comp, files in component_map.items() for fp in files}
+    func_counts = defaultdict(int)   # component -> function count
+    first_hlr = {}                   # component -> (min rowid, hlr_id)
+    cursor.execute("""
+        SELECT si.file_path, h.id, COUNT(*), MIN(si.rowid)
+        FROM source_inventory si
+        LEFT JOIN high_level_requirements h ON h.id = si.parent_hlr
+        GROUP BY si.file_path, h.id
+    """)
+    for fp, hlr_id, count, first_rowid in cursor:
+        comp = comp_of[fp]
+        func_counts[comp] += count
+        if hlr_id is not None and (comp not in first_hlr or first_rowid < first_hlr[comp][0]):
+            first_hlr[comp] = (first_rowid, hlr_id)
+
     # 1. Partitioning decisions — one per component
     for comp, files in sorted(component_map.items()):
-        role = classify_component(comp, files)
-
-        # Find associated HLRs
-        cursor.execute("""
-            SELECT DISTINCT h.id FROM high_level_requirements h
-            JOIN source_inventory si ON si.parent_hlr = h.id
-            WHERE si.file_path LIKE ?
-        """, (f"{comp}%",))
-        associated_hlrs = [r[0] for r in cursor.fetchall()]
-        parent_hlr = associated_hlrs[0] if associated_hlrs else None
-
-        # Get function count
-        cursor.execute(
-            "SELECT COUNT(*) FROM source_inventory WHERE file_path LIKE ?",
-            (f"{comp}%",)
-        )
-        func_count = cursor.fetchone()[0]
+        role = classify_component(comp)
+        parent_hlr = first_hlr[comp][1] if comp in first_hlr else None
+        func_count = func_counts[comp]
 
         arch_id = f"ARCH_{arch_idx:03d}"
         decisions.append({
@@ -255,6 +332,8 @@ def populate_decisions(db_path, decisions, dry_run=False):
         return len(decisions)
 
     conn = sqlite3.connect(db_path)
+    for pragma in WRITE_PRAGMAS:
+        conn.execute(pragma)
     c = conn.cursor()
 
     count = 0
@@ -304,7 +383,7 @@ def main():
     component_map = build_component_map(cursor, app_root)
     print(f"\nDiscovered {len(component_map)} components:")
     for comp, files in sorted(component_map.items()):
-        role = classify_component(comp, files)
+        role = classify_component(comp)
         print(f"  {comp} ({len(files)} files) — {role}")
 
     # Step 2: Analyze data flow
@@ -14,24 +14,87 @@ Timestamp: 2026-02-11 09:55 UTC
 """
 
 import argparse
+import io
 import os
 import re
 import sqlite3
 import sys
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+
+# Max ids per IN (...) lookup; stays under SQLite's default host-parameter limit
+SQL_PARAM_CHUNK = 900
+
+# Rows fetched per cursor round-trip when streaming query results
+FETCH_ARRAYSIZE = 1000
+
+# Procedure lines copied into each generated test's comment header
+PROCEDURE_PREVIEW_LINES = 8
+
+# Upper bound on threads writing generated test script files
+SCRIPT_WRITE_WORKERS = 32
+
+# Scripts are written as raw bytes (O_BINARY: no newline translation on Windows)
+SCRIPT_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+# Connection tuning for this one-shot generation run: WAL with NORMAL sync
+# avoids an fsync per statement; only end-of-run durability matters.
+WRITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+)
+
+# Read-only callers skip the journal settings and refuse writes outright
+READ_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+    "PRAGMA query_only = 1",
+)
+
+# LLR text patterns: the quoted function name, and the same alternated with
+# comparison boundaries (e.g. "> 100", "<= 0.5") so branch/validation text is
+# scanned once. The alternatives cannot overlap ('<'/'>' are not \w).
+FUNC_NAME_RE = re.compile(r"Function '(\w+)'")
+FUNC_OR_BOUNDARY_RE = re.compile(r"Function '(\w+)'|([><]=?)\s*(-?\d+\.?\d*)")
+
+# Characters needing a backslash inside a single-quoted JavaScript string
+JS_QUOTE_RE = re.compile(r"['\\]")
+
+# SQL predicate for the LLRs _scan_llrs can use: the logic types it buckets,
+# or text naming a function. Other LLR text never leaves the database.
+LLR_TEXT_NEEDED_SQL = (
+    "(logic_type IN ('branch', 'validation', 'error_handler', 'initialization', 'computation')"
+    " OR instr(text, 'Function ''') > 0)"
+)
+
+# One LLR row as read for test generation
+LLR = namedtuple('LLR', 'id text logic_type trace_to_code')
+
+# Logic types whose LLR text carries branch conditions and boundaries
+BRANCH_TYPES = frozenset({'branch', 'validation'})
+
+
+def _open(db_path, write=False):
+    """Open db_path with the write or read PRAGMAs applied."""
+    conn = sqlite3.connect(db_path)
+    for pragma in (WRITE_PRAGMAS if write else READ_PRAGMAS):
+        conn.execute(pragma)
+    return conn
 
 
-def get_hlrs_needing_tests(db_path):
+def get_hlrs_needing_tests(conn):
     """
     Query HLRs that have no test cases yet.
 
     Functionality: Find HLRs missing test coverage
-    Inputs: db_path (str)
+    Inputs: conn (sqlite3.Connection)
     Outputs: list of dicts with HLR id, text, allocated_to, hlr_category
     Timestamp: 2026-02-11 09:55 UTC
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
     cursor = conn.execute("""
         SELECT hlr.id, hlr.text, hlr.allocated_to, hlr.hlr_category
         FROM high_level_requirements hlr
@@ -40,128 +103,168 @@ def get_hlrs_needing_tests(db_path):
           AND hlr.id != 'HLR_UNCLUSTERED'
         ORDER BY hlr.id
     """)
-    rows = [dict(r) for r in cursor.fetchall()]
-    conn.close()
+    cursor.arraysize = FETCH_ARRAYSIZE
+    rows = [{'id': r[0], 'text': r[1], 'allocated_to': r[2], 'hlr_category': r[3]}
+            for r in cursor]
     return rows
 
 
-def get_llrs_for_hlr(db_path, hlr_id):
+def get_llrs_grouped(conn, hlr_ids):
     """
-    Get all LLRs under a given HLR.
+    Get the LLRs under each of the given HLRs in one pass.
 
-    Functionality: Query LLRs for a specific parent HLR
-    Inputs: db_path (str), hlr_id (str)
-    Outputs: list of dicts with LLR id, text, logic_type, trace_to_code
+    Functionality: Query LLRs for a set of parent HLRs, grouped by parent
+    Inputs: conn (sqlite3.Connection), hlr_ids (list of str)
+    Outputs: dict of hlr_id -> list of LLR tuples (ordered by LLR id);
+             text is None for LLRs the generators ignore, so every LLR is
+             still counted
     Timestamp: 2026-02-11 09:55 UTC
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.execute("""
-        SELECT id, text, logic_type, trace_to_code
-        FROM low_level_requirements
-        WHERE parent_hlr = ?
-        ORDER BY id
-    """, (hlr_id,))
-    rows = [dict(r) for r in cursor.fetchall()]
-    conn.close()
-    return rows
-
-
-def _extract_func_names(llrs):
-    """Extract unique function names from LLR trace references."""
+    grouped = defaultdict(list)
+    for i in range(0, len(hlr_ids), SQL_PARAM_CHUNK):
+        chunk = hlr_ids[i:i + SQL_PARAM_CHUNK]
+        placeholders = ','.join('?' * len(chunk))
+        cursor = conn.execute(f"""
+            SELECT parent_hlr, id,
+                   CASE WHEN {LLR_TEXT_NEEDED_SQL} THEN text END,
+                   logic_type, trace_to_code
+            FROM low_level_requirements
+            WHERE parent_hlr IN ({placeholders})
+            ORDER BY parent_hlr, id
+        """, chunk)
+        cursor.arraysize = FETCH_ARRAYSIZE
+        for parent_hlr, llr_id, text, logic_type, trace in cursor:
+            grouped[parent_hlr].append(LLR(llr_id, text, logic_type, trace))
+    return grouped
+
+
+# Everything the generators need from one HLR's LLRs, gathered in one pass:
+# sorted function names, first 5 branch/validation conditions, sorted boundary
+# constraints, first 5 error handlers, and initialization/computation texts
+LLRScan = namedtuple('LLRScan', 'funcs conditions boundaries handlers inits comps')
+
+
+def _scan_llrs(llrs):
+    """Extract function names, conditions, boundaries and handlers from LLRs."""
     funcs = set()
-    for llr in llrs:
-        text = llr.get('text', '')
-        # Look for function names in patterns like "Function 'foo'"
-        match = re.search(r"Function '(\w+)'", text)
-        if match:
-            funcs.add(match.group(1))
-    return sorted(funcs)
-
-
-def _extract_branch_conditions(llrs):
-    """Extract branch conditions and boundary values from LLRs."""
     conditions = []
     boundaries = set()
+    handlers = []
+    inits = []
+    comps = []
     for llr in llrs:
-        if llr.get('logic_type') in ['branch', 'validation']:
-            text = llr['text']
+        text = llr.text
+        if text is None:
+            continue  # withheld by the query: no logic type or name used here
+
+        logic_type = llr.logic_type
+        if logic_type in BRANCH_TYPES:
             conditions.append(text[:80])
-            # Look for numerical boundaries (e.g., "> 100", "<= 0.5")
-            match = re.findall(r'([><]=?)\s*(-?\d+\.?\d*)', text)
-            for op, val in match:
-                boundaries.add(f"{op} {val}")
-    return conditions[:5], sorted(list(boundaries))
+            # One pass for the (first) function name and every numerical
+            # boundary (e.g., "> 100", "<= 0.5")
+            func_seen = False
+            for m in FUNC_OR_BOUNDARY_RE.finditer(text):
+                name = m.group(1)
+                if name is None:
+                    boundaries.add(f"{m.group(2)} {m.group(3)}")
+                elif not func_seen:
+                    funcs.add(name)
+                    func_seen = True
+            continue
 
+        # Look for function names in patterns like "Function 'foo'"
+        match = FUNC_NAME_RE.search(text)
+        if match:
+            funcs.add(match.group(1))
 
-def _extract_error_handlers(llrs):
-    """Extract error handling descriptions from LLRs."""
-    handlers = []
-    for llr in llrs:
-        if llr.get('logic_type') == 'error_handler':
-            handlers.append(llr['text'][:80])
-    return handlers[:5]
+        if logic_type == 'error_handler':
+            handlers.append(text[:80])
+        elif logic_type == 'initialization':
+            inits.append(text)
+        elif logic_type == 'computation':
+            comps.append(text)
+    return LLRScan(sorted(funcs), conditions[:5], sorted(boundaries),
+                   handlers[:5], inits, comps)
+
+
+# Fixed test case text shared by every generated skeleton. Procedures are
+# lists of (step text, sub-item lines) and are numbered by _number_steps.
+SETUP_STEP = "Initialize the test environment with default configuration."
+LOAD_STEP = "Import/load the module(s) containing: {func_list}."
+NORMAL_DEFAULT_EXPECTED = (
+    "- Functions execute without errors",
+    "- Value output matches specification",
+)
+NORMAL_PASS_CRITERIA = (
+    "All assertions pass. "
+    "Functions ({func_list}) return expected values. "
+    "Computational LLRs verified. No unhandled exceptions."
+)
+ROBUSTNESS_STEPS = (
+    ("Provide invalid/malformed data (null, empty, type-mismatch).", ()),
+    ("Verify robust error responses (no crashes, no unhandled exceptions).", ()),
+    ("Verify system state remains consistent.", ()),
+)
+ROBUSTNESS_INPUTS = (
+    "- null/undefined/None inputs",
+    "- Empty string / empty array",
+    "- Boundary-violating values (e.g., NaN, Inf, Overflow)",
+)
+ROBUSTNESS_EXPECTED = (
+    "- Appropriate error messages or codes returned",
+    "- No unhandled exceptions or crashes",
+    "- Critical system state is maintained",
+)
+ROBUSTNESS_PASS_CRITERIA = (
+    "All error conditions handled per specification. "
+    "Zero unhandled exceptions. System state persists. "
+    "Error logic correctly detects and isolates invalid inputs."
+)
+
+
+def _number_steps(steps):
+    """Render (text, sub-items) procedure steps as numbered lines."""
+    lines = []
+    for n, (text, sub_items) in enumerate(steps, 1):
+        lines.append(f"{n}. {text}")
+        lines.extend(sub_items)
+    return lines
 
 
-def generate_normal_test(hlr, llrs, tc_index):
+def generate_normal_test(hlr, scan, tc_index):
     """
     Generate a Normal Range test case skeleton for an HLR.
 
     Functionality: Create an integration-type test exercising the happy path
-    Inputs: hlr (dict), llrs (list), tc_index (int)
+    Inputs: hlr (dict), scan (LLRScan), tc_index (int)
     Outputs: test case dict ready for DB insertion
     Timestamp: 2026-02-11 09:55 UTC
     """
     hlr_id = hlr['id']
     hlr_text = hlr['text']
-    funcs = _extract_func_names(llrs)
+    funcs = scan.funcs
     func_list = ', '.join(funcs) if funcs else 'functions under this HLR'
-    _, boundaries = _extract_branch_conditions(llrs)
-
-    # Build procedure from LLR data
-    procedure_steps = [
-        f"1. Initialize the test environment with default configuration.",
-        f"2. Import/load the module(s) containing: {func_list}.",
-    ]
-
-    step = 3
-    # Add steps for each initialization LLR
-    init_llrs = [l for l in llrs if l.get('logic_type') == 'initialization']
-    for llr in init_llrs[:3]:
-        procedure_steps.append(f"{step}. Invoke {llr['text'][:60]}")
-        step += 1
-
-    procedure_steps.append(f"{step}. Provide valid input data as specified in input_data.")
-    step += 1
-    
+    boundaries = scan.boundaries
+
+    # Build procedure from LLR data, one step per initialization LLR
+    steps = [(SETUP_STEP, ()), (LOAD_STEP.format(func_list=func_list), ())]
+    steps.extend((f"Invoke {text[:60]}", ()) for text in scan.inits[:3])
+    steps.append(("Provide valid input data as specified in input_data.", ()))
     if boundaries:
-        procedure_steps.append(f"{step}. Execute primary functions across valid ranges:")
-        for b in boundaries:
-            procedure_steps.append(f"   - Verify behavior within boundary constraint: {b}")
-        step += 1
+        steps.append(("Execute primary functions across valid ranges:",
+                      [f"   - Verify behavior within boundary constraint: {b}" for b in boundaries]))
     else:
-        procedure_steps.append(f"{step}. Execute the primary function(s) with normal-range inputs.")
-        step += 1
-
-    procedure_steps.append(f"{step}. Capture the return value(s) and/or side effects.")
-    step += 1
-    procedure_steps.append(f"{step}. Compare results against expected_output.")
+        steps.append(("Execute the primary function(s) with normal-range inputs.", ()))
+    steps.append(("Capture the return value(s) and/or side effects.", ()))
+    steps.append(("Compare results against expected_output.", ()))
 
     # Build input data
-    input_items = []
-    for func in funcs[:5]:
-        input_items.append(f"- {func}: <provide valid test parameters>")
+    input_items = [f"- {func}: <provide valid test parameters>" for func in funcs[:5]]
     if boundaries:
         input_items.append(f"- Boundary values to exercise: {', '.join(boundaries)}")
 
     # Build expected output
-    expected_items = []
-    comp_llrs = [l for l in llrs if l.get('logic_type') == 'computation']
-    for llr in comp_llrs[:3]:
-        expected_items.append(f"- {llr['text'][:80]}")
-    if not expected_items:
-        expected_items.append("- Functions execute without errors")
-        expected_items.append("- Value output matches specification")
+    expected_items = [f"- {text[:80]}" for text in scan.comps[:3]] or NORMAL_DEFAULT_EXPECTED
 
     tc_id = f"HTC_{hlr_id.replace('HLR_', '')}_NR_{tc_index:03d}"
 
@@ -170,77 +273,47 @@ def generate_normal_test(hlr, llrs, tc_index):
         'parent_hlr': hlr_id,
         'test_type': 'integration',
         'description': f"Normal Range test for {hlr_id}: Verify {hlr_text[:100]}",
-        'procedure': '\n'.join(procedure_steps),
+        'procedure': '\n'.join(_number_steps(steps)),
         'input_data': '\n'.join(input_items),
         'expected_output': '\n'.join(expected_items),
-        'pass_criteria': (
-            f"All assertions pass. "
-            f"Functions ({func_list}) return expected values. "
-            f"Computational LLRs verified. No unhandled exceptions."
-        ),
+        'pass_criteria': NORMAL_PASS_CRITERIA.format(func_list=func_list),
     }
 
 
-def generate_robustness_test(hlr, llrs, tc_index):
+def generate_robustness_test(hlr, scan, tc_index):
     """
     Generate a Robustness test case skeleton for an HLR.
 
     Functionality: Create a regression-type test exercising error/boundary paths
-    Inputs: hlr (dict), llrs (list), tc_index (int)
+    Inputs: hlr (dict), scan (LLRScan), tc_index (int)
     Outputs: test case dict ready for DB insertion
     Timestamp: 2026-02-11 09:55 UTC
     """
     hlr_id = hlr['id']
     hlr_text = hlr['text']
-    funcs = _extract_func_names(llrs)
+    funcs = scan.funcs
     func_list = ', '.join(funcs) if funcs else 'functions under this HLR'
-    branch_conditions, boundaries = _extract_branch_conditions(llrs)
-    error_handlers = _extract_error_handlers(llrs)
+    boundaries = scan.boundaries
+    error_handlers = scan.handlers
 
-    # Build procedure
-    procedure_steps = [
-        f"1. Initialize the test environment with default configuration.",
-        f"2. Import/load the module(s) containing: {func_list}.",
-    ]
-
-    step = 3
-
-    # Add boundary/error test steps
+    # Build procedure, with boundary/error test steps where the LLRs have them
+    steps = [(SETUP_STEP, ()), (LOAD_STEP.format(func_list=func_list), ())]
     if boundaries:
-        procedure_steps.append(f"{step}. Test out-of-range boundary conditions:")
-        for b in boundaries:
-            procedure_steps.append(f"   - Inject values violating: {b}")
-        step += 1
-
+        steps.append(("Test out-of-range boundary conditions:",
+                      [f"   - Inject values violating: {b}" for b in boundaries]))
     if error_handlers:
-        procedure_steps.append(f"{step}. Test error handling paths:")
-        for handler in error_handlers:
-            procedure_steps.append(f"   - Force condition: {handler}")
-        step += 1
-
-    procedure_steps.append(f"{step}. Provide invalid/malformed data (null, empty, type-mismatch).")
-    step += 1
-    procedure_steps.append(f"{step}. Verify robust error responses (no crashes, no unhandled exceptions).")
-    step += 1
-    procedure_steps.append(f"{step}. Verify system state remains consistent.")
+        steps.append(("Test error handling paths:",
+                      [f"   - Force condition: {handler}" for handler in error_handlers]))
+    steps.extend(ROBUSTNESS_STEPS)
 
     # Build input data
-    input_items = [
-        "- null/undefined/None inputs",
-        "- Empty string / empty array",
-        "- Boundary-violating values (e.g., NaN, Inf, Overflow)",
-    ]
+    input_items = list(ROBUSTNESS_INPUTS)
     if boundaries:
         input_items.append(f"- Specific boundary violation cases: {', '.join(boundaries)}")
 
     # Build expected output
-    expected_items = [
-        "- Appropriate error messages or codes returned",
-        "- No unhandled exceptions or crashes",
-        "- Critical system state is maintained",
-    ]
-    for handler in error_handlers[:3]:
-        expected_items.append(f"- Handled path: {handler}")
+    expected_items = list(ROBUSTNESS_EXPECTED)
+    expected_items.extend(f"- Handled path: {handler}" for handler in error_handlers[:3])
 
     tc_id = f"HTC_{hlr_id.replace('HLR_', '')}_ROB_{tc_index:03d}"
 
@@ -249,23 +322,19 @@ def generate_robustness_test(hlr, llrs, tc_index):
         'parent_hlr': hlr_id,
         'test_type': 'regression',
         'description': f"Robustness test for {hlr_id}: Verify error handling for {hlr_text[:80]}",
-        'procedure': '\n'.join(procedure_steps),
+        'procedure': '\n'.join(_number_steps(steps)),
         'input_data': '\n'.join(input_items),
         'expected_output': '\n'.join(expected_items),
-        'pass_criteria': (
-            f"All error conditions handled per specification. "
-            f"Zero unhandled exceptions. System state persists. "
-            f"Error logic correctly detects and isolates invalid inputs."
-        ),
+        'pass_criteria': ROBUSTNESS_PASS_CRITERIA,
     }
 
 
-def populate_test_cases(db_path, test_cases, dry_run=False):
+def populate_test_cases(conn, test_cases, dry_run=False):
     """
     Write test case skeletons to the database.
 
     Functionality: UPSERT test cases into hlr_test_cases
-    Inputs: db_path (str), test_cases (list), dry_run (bool)
+    Inputs: conn (sqlite3.Connection), test_cases (list), dry_run (bool)
     Outputs: count of inserted/updated test cases
     Timestamp: 2026-02-11 09:55 UTC
     """
@@ -277,202 +346,249 @@ def populate_test_cases(db_path, test_cases, dry_run=False):
             print()
         return len(test_cases)
 
-    conn = sqlite3.connect(db_path)
     conn.execute("PRAGMA foreign_keys = ON;")
-    cursor = conn.cursor()
-
-    inserted = 0
-    updated = 0
-
-    for tc in test_cases:
-        cursor.execute("SELECT id FROM hlr_test_cases WHERE id = ?", (tc['id'],))
-        existing = cursor.fetchone()
-
-        if existing:
-            cursor.execute("""
-                UPDATE hlr_test_cases
-                SET description = ?, procedure = ?, input_data = ?,
-                    expected_output = ?, pass_criteria = ?,
-                    updated_at = datetime('now')
-                WHERE id = ?
-            """, (tc['description'], tc['procedure'], tc['input_data'],
-                  tc['expected_output'], tc['pass_criteria'], tc['id']))
-            updated += 1
-        else:
-            cursor.execute("""
-                INSERT INTO hlr_test_cases
-                    (id, parent_hlr, test_type, description, procedure,
-                     input_data, expected_output, pass_criteria)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (tc['id'], tc['parent_hlr'], tc['test_type'],
-                  tc['description'], tc['procedure'], tc['input_data'],
-                  tc['expected_output'], tc['pass_criteria']))
-            inserted += 1
+
+    rows = [(tc['id'], tc['parent_hlr'], tc['test_type'], tc['description'],
+             tc['procedure'], tc['input_data'], tc['expected_output'],
+             tc['pass_criteria'])
+            for tc in test_cases]
+
+    # One UPSERT statement for every row, all inside a single transaction.
+    # Existing test cases keep their parent/type; only the content refreshes.
+    # The row-count delta splits inserts from updates.
+    conn.execute("BEGIN")
+    before = conn.execute("SELECT COUNT(*) FROM hlr_test_cases").fetchone()[0]
+    conn.executemany("""
+        INSERT INTO hlr_test_cases
+            (id, parent_hlr, test_type, description, procedure,
+             input_data, expected_output, pass_criteria)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            description = excluded.description,
+            procedure = excluded.procedure,
+            input_data = excluded.input_data,
+            expected_output = excluded.expected_output,
+            pass_criteria = excluded.pass_criteria,
+            updated_at = datetime('now')
+    """, rows)
+    after = conn.execute("SELECT COUNT(*) FROM hlr_test_cases").fetchone()[0]
+    inserted = after - before
+    updated = len(rows) - inserted
 
     conn.commit()
-    conn.close()
     print(f"\nDatabase updated: {inserted} test cases inserted, {updated} updated")
     return inserted + updated
 
 
-def _detect_test_framework(db_path):
+# Source file extension (lowercase, without the dot) -> test framework
+FRAMEWORK_BY_EXT = {
+    'js': 'jest', 'ts': 'jest', 'jsx': 'jest', 'tsx': 'jest',
+    'go': 'go',
+    'py': 'pytest',
+    'rs': 'rust',
+}
+
+
+def _detect_test_framework(conn):
     """Detect the dominant language from source_inventory to pick test framework."""
-    conn = sqlite3.connect(db_path)
+    # One index scan yields per-file function counts; extensions are taken
+    # once per distinct file rather than LIKE-tested once per row
     cursor = conn.execute("""
-        SELECT
-            SUM(CASE WHEN file_path LIKE '%.js' OR file_path LIKE '%.ts'
-                      OR file_path LIKE '%.jsx' OR file_path LIKE '%.tsx' THEN 1 ELSE 0 END) as js_count,
-            SUM(CASE WHEN file_path LIKE '%.go' THEN 1 ELSE 0 END) as go_count,
-            SUM(CASE WHEN file_path LIKE '%.py' THEN 1 ELSE 0 END) as py_count,
-            SUM(CASE WHEN file_path LIKE '%.rs' THEN 1 ELSE 0 END) as rs_count
-        FROM source_inventory
+        SELECT file_path, COUNT(*) FROM source_inventory GROUP BY file_path
     """)
-    row = cursor.fetchone()
-    conn.close()
+    counts = {'jest': 0, 'go': 0, 'pytest': 0, 'rust': 0}
+    for file_path, n in cursor:
+        _, dot, ext = file_path.rpartition('.')
+        framework = FRAMEWORK_BY_EXT.get(ext.lower()) if dot else None
+        if framework:
+            counts[framework] += n
 
-    counts = {'jest': row[0] or 0, 'go': row[1] or 0, 'pytest': row[2] or 0, 'rust': row[3] or 0}
     return max(counts, key=counts.get)
 
 
-def _build_assertions_js(llrs, hlr_id, tc):
+# Per-item assertion blocks, formatted once per function/boundary/handler.
+# Each block ends with a blank line separating it from the next.
+JS_NORMAL_FUNC_BLOCK = (
+    "    // Verify {func} executes correctly\n"
+    "    const result_{func} = {func}(/* valid input */);\n"
+    "    expect(result_{func}).toBeDefined();\n"
+    "    expect(result_{func}).not.toBeNull();\n"
+)
+JS_BOUNDARY_BLOCK = (
+    "    // Boundary: verify behavior at {b}\n"
+    "    // TODO: Add specific boundary assertion for {b}\n"
+)
+JS_ROBUST_FUNC_BLOCK = (
+    "    // Verify {func} handles invalid input\n"
+    "    expect(() => {func}(null)).not.toThrow();\n"
+    "    expect(() => {func}(undefined)).not.toThrow();\n"
+)
+JS_HANDLER_BLOCK = (
+    "    // Error path: {handler}\n"
+    "    // TODO: Force error condition and verify handling\n"
+)
+PY_NORMAL_FUNC_BLOCK = (
+    "    # Verify {func} executes correctly\n"
+    "    result = {func}(  # valid input  )\n"
+    "    assert result is not None\n"
+)
+PY_BOUNDARY_BLOCK = (
+    "    # Boundary: verify behavior at {b}\n"
+    "    # TODO: Add specific boundary assertion for {b}\n"
+)
+PY_ROBUST_FUNC_BLOCK = (
+    "    # Verify {func} handles invalid input\n"
+    "    import pytest\n"
+    "    # pytest.raises(ValueError, {func}, None)\n"
+)
+
+
+def _build_assertions_js(scan, hlr_id, tc):
     """Build Jest assertion code from LLR data."""
-    lines = []
-    funcs = _extract_func_names(llrs)
-    _, boundaries = _extract_branch_conditions(llrs)
-    errors = _extract_error_handlers(llrs)
+    funcs = scan.funcs
+    boundaries = scan.boundaries
+    errors = scan.handlers
 
     tc_type = tc.get('test_type', 'integration')
 
     if tc_type in ('integration', 'system', 'acceptance'):
         # Normal range assertions
-        for func in funcs[:5]:
-            lines.append(f"    // Verify {func} executes correctly")
-            lines.append(f"    const result_{func} = {func}(/* valid input */);")
-            lines.append(f"    expect(result_{func}).toBeDefined();")
-            lines.append(f"    expect(result_{func}).not.toBeNull();")
-            lines.append("")
-
-        for b in boundaries[:3]:
-            lines.append(f"    // Boundary: verify behavior at {b}")
-            lines.append(f"    // TODO: Add specific boundary assertion for {b}")
-            lines.append("")
+        lines = [JS_NORMAL_FUNC_BLOCK.format(func=func) for func in funcs[:5]]
+        lines.extend(JS_BOUNDARY_BLOCK.format(b=b) for b in boundaries[:3])
 
         if not funcs and not boundaries:
-            lines.append(f"    // TODO: Import module under test and verify {hlr_id} behavior")
-            lines.append(f"    // const result = moduleUnderTest(validInput);")
-            lines.append(f"    // expect(result).toEqual(expectedOutput);")
+            lines.append(
+                f"    // TODO: Import module under test and verify {hlr_id} behavior\n"
+                f"    // const result = moduleUnderTest(validInput);\n"
+                f"    // expect(result).toEqual(expectedOutput);")
     else:
         # Robustness assertions
-        for func in funcs[:3]:
-            lines.append(f"    // Verify {func} handles invalid input")
-            lines.append(f"    expect(() => {func}(null)).not.toThrow();")
-            lines.append(f"    expect(() => {func}(undefined)).not.toThrow();")
-            lines.append("")
-
-        for handler in errors[:3]:
-            lines.append(f"    // Error path: {handler[:60]}")
-            lines.append(f"    // TODO: Force error condition and verify handling")
-            lines.append("")
+        lines = [JS_ROBUST_FUNC_BLOCK.format(func=func) for func in funcs[:3]]
+        lines.extend(JS_HANDLER_BLOCK.format(handler=handler[:60]) for handler in errors[:3])
 
         if not funcs:
-            lines.append(f"    // TODO: Verify error handling for {hlr_id}")
-            lines.append(f"    // expect(() => moduleUnderTest(invalidInput)).toThrow();")
+            lines.append(
+                f"    // TODO: Verify error handling for {hlr_id}\n"
+                f"    // expect(() => moduleUnderTest(invalidInput)).toThrow();")
 
     return '\n'.join(lines) if lines else f"    // TODO: Implement assertions for {hlr_id}"
 
 
-def _build_assertions_py(llrs, hlr_id, tc):
+def _build_assertions_py(scan, hlr_id, tc):
     """Build pytest assertion code from LLR data."""
-    lines = []
-    funcs = _extract_func_names(llrs)
-    _, boundaries = _extract_branch_conditions(llrs)
-    errors = _extract_error_handlers(llrs)
+    funcs = scan.funcs
+    boundaries = scan.boundaries
 
     tc_type = tc.get('test_type', 'integration')
 
     if tc_type in ('integration', 'system', 'acceptance'):
-        for func in funcs[:5]:
-            lines.append(f"    # Verify {func} executes correctly")
-            lines.append(f"    result = {func}(  # valid input  )")
-            lines.append(f"    assert result is not None")
-            lines.append("")
-        for b in boundaries[:3]:
-            lines.append(f"    # Boundary: verify behavior at {b}")
-            lines.append(f"    # TODO: Add specific boundary assertion for {b}")
-            lines.append("")
+        lines = [PY_NORMAL_FUNC_BLOCK.format(func=func) for func in funcs[:5]]
+        lines.extend(PY_BOUNDARY_BLOCK.format(b=b) for b in boundaries[:3])
         if not funcs:
-            lines.append(f"    # TODO: Import module under test and verify {hlr_id}")
-            lines.append(f"    # result = module_under_test(valid_input)")
-            lines.append(f"    # assert result == expected_output")
+            lines.append(
+                f"    # TODO: Import module under test and verify {hlr_id}\n"
+                f"    # result = module_under_test(valid_input)\n"
+                f"    # assert result == expected_output")
     else:
-        for func in funcs[:3]:
-            lines.append(f"    # Verify {func} handles invalid input")
-            lines.append(f"    import pytest")
-            lines.append(f"    # pytest.raises(ValueError, {func}, None)")
-            lines.append("")
+        lines = [PY_ROBUST_FUNC_BLOCK.format(func=func) for func in funcs[:3]]
         if not funcs:
             lines.append(f"    # TODO: Verify error handling for {hlr_id}")
 
     return '\n'.join(lines) if lines else f"    # TODO: Implement assertions for {hlr_id}"
 
 
-def generate_test_scripts(db_path, tests_dir, dry_run=False):
+def _write_script(job):
+    """
+    Write one generated test script unless the file already holds exactly
+    this content (leaving its mtime and downstream tool caches intact).
+    The content is encoded once and written straight to a raw descriptor.
+    Returns (filepath, written).
+    """
+    filepath, content = job
+    data = content.encode('utf-8')
+    try:
+        if os.stat(filepath).st_size == len(data):
+            with open(filepath, 'rb') as f:
+                if f.read() == data:
+                    return filepath, False
+    except OSError:
+        pass  # missing or unreadable: (re)write it
+
+    fd = os.open(filepath, SCRIPT_OPEN_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return filepath, True
+
+
+def generate_test_scripts(conn, tests_dir, dry_run=False):
     """
     Generate framework-specific test script files from hlr_test_cases.
 
     Functionality: Create runnable test files with real assertion patterns
-    Inputs: db_path (str), tests_dir (str), dry_run (bool)
+    Inputs: conn (sqlite3.Connection), tests_dir (str), dry_run (bool)
     Outputs: count of generated scripts
     Timestamp: 2026-02-11 18:36 UTC
     """
-    framework = _detect_test_framework(db_path)
+    framework = _detect_test_framework(conn)
     print(f"\nDetected test framework: {framework}")
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-
-    # Get all test cases grouped by parent HLR
-    tc_rows = conn.execute("""
-        SELECT tc.*, hlr.text as hlr_text
-        FROM hlr_test_cases tc
-        JOIN high_level_requirements hlr ON hlr.id = tc.parent_hlr
-        ORDER BY tc.parent_hlr, tc.id
-    """).fetchall()
-
-    # Group by HLR
-    by_hlr = defaultdict(list)
-    for row in tc_rows:
-        by_hlr[row['parent_hlr']].append(dict(row))
 
     if not os.path.isdir(tests_dir) and not dry_run:
         os.makedirs(tests_dir, exist_ok=True)
 
     count = 0
     script_refs = {}  # tc_id -> relative_path
+    write_jobs = []   # (filepath, content)
 
-    for hlr_id, tcs in sorted(by_hlr.items()):
-        # Get LLRs for assertion generation
-        llrs_rows = conn.execute(
-            "SELECT id, text, logic_type, trace_to_code FROM low_level_requirements WHERE parent_hlr = ?",
-            (hlr_id,)
-        ).fetchall()
-        llrs = [dict(r) for r in llrs_rows]
+    # LLRs for assertion generation, for every HLR with test cases at once
+    # (table order within each HLR)
+    llrs_by_hlr = defaultdict(list)
+    cursor = conn.execute(f"""
+        SELECT parent_hlr, id, text, logic_type, trace_to_code
+        FROM low_level_requirements
+        WHERE parent_hlr IN (SELECT parent_hlr FROM hlr_test_cases)
+          AND {LLR_TEXT_NEEDED_SQL}
+        ORDER BY parent_hlr, rowid
+    """)
+    cursor.arraysize = FETCH_ARRAYSIZE
+    for parent_hlr, llr_id, text, logic_type, trace in cursor:
+        llrs_by_hlr[parent_hlr].append(LLR(llr_id, text, logic_type, trace))
+
+    # Stream test cases in parent HLR order, one HLR group at a time; only
+    # the columns the generators read are fetched
+    tc_rows = conn.execute("""
+        SELECT tc.parent_hlr, tc.id, tc.test_type, tc.description,
+               tc.procedure, hlr.text
+        FROM hlr_test_cases tc
+        JOIN high_level_requirements hlr ON hlr.id = tc.parent_hlr
+        ORDER BY tc.parent_hlr, tc.id
+    """)
+    tc_rows.arraysize = FETCH_ARRAYSIZE
+    for hlr_id, group in groupby(tc_rows, key=itemgetter(0)):
+        tcs = [{'id': r[1], 'test_type': r[2], 'description': r[3],
+                'procedure': r[4], 'hlr_text': r[5]}
+               for r in group]
+        scan = _scan_llrs(llrs_by_hlr.pop(hlr_id, ()))
 
         # Generate filename
         clean_id = hlr_id.lower().replace('hlr_', '')
 
         if framework == 'jest':
             filename = f"test_hlr_{clean_id}.test.js"
-            content = _gen_jest_file(hlr_id, tcs, llrs)
+            content = _gen_jest_file(hlr_id, tcs, scan)
         elif framework == 'pytest':
             filename = f"test_hlr_{clean_id}.py"
-            content = _gen_pytest_file(hlr_id, tcs, llrs)
+            content = _gen_pytest_file(hlr_id, tcs, scan)
         elif framework == 'go':
             filename = f"hlr_{clean_id}_test.go"
-            content = _gen_go_file(hlr_id, tcs, llrs)
+            content = _gen_go_file(hlr_id, tcs, scan)
         else:
             filename = f"test_hlr_{clean_id}.test.js"
-            content = _gen_jest_file(hlr_id, tcs, llrs)
+            content = _gen_jest_file(hlr_id, tcs, scan)
 
         filepath = os.path.join(tests_dir, filename)
         rel_path = f"tests/{filename}"
@@ -480,125 +596,141 @@ def generate_test_scripts(db_path, tests_dir, dry_run=False):
         if dry_run:
             print(f"  [DRY-RUN] Would write: {filepath}")
         else:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"  Generated: {filename}")
+            write_jobs.append((filepath, content))
 
         for tc in tcs:
             script_refs[tc['id']] = rel_path
         count += 1
 
+    # Files are independent, so write them concurrently (write() releases
+    # the GIL); progress is still reported in HLR order
+    if write_jobs:
+        with ThreadPoolExecutor(max_workers=min(SCRIPT_WRITE_WORKERS, len(write_jobs))) as pool:
+            for filepath, written in pool.map(_write_script, write_jobs):
+                status = "Generated" if written else "Unchanged"
+                print(f"  {status}: {os.path.basename(filepath)}")
+
     # Update test_script_ref in DB
     if not dry_run and script_refs:
-        cursor = conn.cursor()
-        for tc_id, ref in script_refs.items():
-            cursor.execute(
-                "UPDATE hlr_test_cases SET test_script_ref = ? WHERE id = ?",
-                (ref, tc_id)
-            )
-        conn.commit()
+        # Decision Logic: Rewrite only refs that differ from the stored value.
+        # Conditions: test_script_ref != the generated script's rel_path.
+        current = dict(conn.execute("SELECT id, test_script_ref FROM hlr_test_cases"))
+        changed = [(ref, tc_id) for tc_id, ref in script_refs.items()
+                   if current.get(tc_id) != ref]
+        if changed:
+            # One executemany in a single transaction
+            conn.execute("BEGIN")
+            conn.executemany(
+                "UPDATE hlr_test_cases SET test_script_ref = ? WHERE id = ?", changed)
+            conn.commit()
 
-    conn.close()
     return count
 
 
-def _gen_jest_file(hlr_id, tcs, llrs):
-    """Generate a Jest test file for an HLR."""
-    lines = [
-        f"/**",
-        f" * DO-178C Test Script — {hlr_id}",
-        f" * Auto-generated by gen_test_cases.py",
-        f" *",
-        f" * HLR: {tcs[0].get('hlr_text', '')[:80]}",
-        f" */",
-        f"",
-        f"// TODO: Update import paths to match actual module locations",
-        f"// const {{ functionName }} = require('../src/module');",
-        f"",
-    ]
+def _js_quote(text):
+    """Escape text for a single-quoted JavaScript string literal."""
+    return JS_QUOTE_RE.sub(r'\\\g<0>', text)
 
-    for tc in tcs:
-        tc_id = tc['id']
-        desc = tc.get('description', '').replace("'", "\\'")
+
+def _gen_jest_file(hlr_id, tcs, scan):
+    """Generate a Jest test file for an HLR."""
+    buf = io.StringIO()
+    w = buf.write
+    # Lines are written newline-first, so the file has no trailing separator
+    w(f"/**\n"
+      f" * DO-178C Test Script — {hlr_id}\n"
+      f" * Auto-generated by gen_test_cases.py\n"
+      f" *\n"
+      f" * HLR: {tcs[0].get('hlr_text', '')[:80]}\n"
+      f" */\n"
+      f"\n"
+      f"// TODO: Update import paths to match actual module locations\n"
+      f"// const {{ functionName }} = require('../src/module');\n")
+
+    # One describe block per HLR, holding a test per test case
+    w(f"\ndescribe('{_js_quote(hlr_id)}', () => {{")
+    for i, tc in enumerate(tcs):
+        # Truncate before escaping so no escape sequence is cut in half
+        name = _js_quote(f"{tc['id']}: {tc.get('description', '')[:60]}")
         procedure = tc.get('procedure', '')
-        assertions = _build_assertions_js(llrs, hlr_id, tc)
+        assertions = _build_assertions_js(scan, hlr_id, tc)
 
-        lines.append(f"describe('{hlr_id}', () => {{")
-        lines.append(f"  test('{tc_id}: {desc[:60]}', () => {{")
-        lines.append(f"    /*")
-        lines.append(f"     * Procedure:")
-        for pline in procedure.split('\n')[:8]:
-            lines.append(f"     * {pline.strip()}")
-        lines.append(f"     */")
-        lines.append(f"")
-        lines.append(assertions)
-        lines.append(f"  }});")
-        lines.append(f"}});")
-        lines.append(f"")
+        if i:
+            w("\n")
+        w(f"\n  test('{name}', () => {{"
+          f"\n    /*"
+          f"\n     * Procedure:")
+        for pline in procedure.split('\n', PROCEDURE_PREVIEW_LINES)[:PROCEDURE_PREVIEW_LINES]:
+            w(f"\n     * {pline.strip()}")
+        w(f"\n     */"
+          f"\n"
+          f"\n{assertions}"
+          f"\n  }});")
+    w("\n});\n")
 
-    return '\n'.join(lines)
+    return buf.getvalue()
 
 
-def _gen_pytest_file(hlr_id, tcs, llrs):
+def _gen_pytest_file(hlr_id, tcs, scan):
     """Generate a pytest test file for an HLR."""
-    lines = [
-        f'"""',
-        f"DO-178C Test Script — {hlr_id}",
-        f"Auto-generated by gen_test_cases.py",
-        f"",
-        f"HLR: {tcs[0].get('hlr_text', '')[:80]}",
-        f'"""',
-        f"",
-        f"# TODO: Update import paths to match actual module locations",
-        f"# from src.module import function_name",
-        f"",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    # Lines are written newline-first, so the file has no trailing separator
+    w(f'"""\n'
+      f"DO-178C Test Script — {hlr_id}\n"
+      f"Auto-generated by gen_test_cases.py\n"
+      f"\n"
+      f"HLR: {tcs[0].get('hlr_text', '')[:80]}\n"
+      f'"""\n'
+      f"\n"
+      f"# TODO: Update import paths to match actual module locations\n"
+      f"# from src.module import function_name\n")
 
     for tc in tcs:
         tc_id = tc['id']
         desc = tc.get('description', '')
         procedure = tc.get('procedure', '')
-        assertions = _build_assertions_py(llrs, hlr_id, tc)
+        assertions = _build_assertions_py(scan, hlr_id, tc)
 
         func_name = tc_id.lower().replace('-', '_')
-        lines.append(f"def test_{func_name}():")
-        lines.append(f'    """{desc[:80]}"""')
-        lines.append(f"    # Procedure:")
-        for pline in procedure.split('\n')[:8]:
-            lines.append(f"    # {pline.strip()}")
-        lines.append(f"")
-        lines.append(assertions)
-        lines.append(f"")
-        lines.append(f"")
+        w(f"\ndef test_{func_name}():"
+          f'\n    """{desc[:80]}"""'
+          f"\n    # Procedure:")
+        for pline in procedure.split('\n', PROCEDURE_PREVIEW_LINES)[:PROCEDURE_PREVIEW_LINES]:
+            w(f"\n    # {pline.strip()}")
+        w(f"\n"
+          f"\n{assertions}"
+          f"\n"
+          f"\n")
 
-    return '\n'.join(lines)
+    return buf.getvalue()
 
 
-def _gen_go_file(hlr_id, tcs, llrs):
+def _gen_go_file(hlr_id, tcs, scan):
     """Generate a Go test file for an HLR."""
-    lines = [
-        f"// DO-178C Test Script — {hlr_id}",
-        f"// Auto-generated by gen_test_cases.py",
-        f"",
-        f"package main",
-        f"",
-        f'import "testing"',
-        f"",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    # Lines are written newline-first, so the file has no trailing separator
+    w(f"// DO-178C Test Script — {hlr_id}\n"
+      f"// Auto-generated by gen_test_cases.py\n"
+      f"\n"
+      f"package main\n"
+      f"\n"
+      f'import "testing"\n')
 
     for tc in tcs:
         tc_id = tc['id']
         desc = tc.get('description', '')
         func_name = ''.join(word.capitalize() for word in tc_id.replace('-', '_').split('_'))
 
-        lines.append(f"func Test{func_name}(t *testing.T) {{")
-        lines.append(f'\t// {desc[:80]}')
-        lines.append(f"\t// TODO: Implement test logic")
-        lines.append(f'\tt.Log("Testing {hlr_id}")')
-        lines.append(f"}}")
-        lines.append(f"")
+        w(f"\nfunc Test{func_name}(t *testing.T) {{"
+          f'\n\t// {desc[:80]}'
+          f"\n\t// TODO: Implement test logic"
+          f'\n\tt.Log("Testing {hlr_id}")'
+          f"\n}}"
+          f"\n")
 
-    return '\n'.join(lines)
+    return buf.getvalue()
 
 
 def main():
@@ -619,14 +751,18 @@ def main():
         print(f"ERROR: Database not found: {db}")
         sys.exit(1)
 
+    # One connection serves the whole run; a dry run never writes
+    conn = _open(db, write=not args.dry_run)
+
     # Get HLRs without test cases
-    hlrs = get_hlrs_needing_tests(db)
+    hlrs = get_hlrs_needing_tests(conn)
     if not hlrs:
         print("All HLRs already have test cases.")
         # Still allow --gen-scripts on existing test cases
         if args.gen_scripts:
-            count = generate_test_scripts(db, args.gen_scripts, dry_run=args.dry_run)
+            count = generate_test_scripts(conn, args.gen_scripts, dry_run=args.dry_run)
             print(f"\nGenerated {count} test scripts.")
+        conn.close()
         sys.exit(0)
 
     print(f"=== DO-178C Phase 4: Test Case Generation ===")
@@ -637,17 +773,19 @@ def main():
     all_test_cases = []
     tc_index = 1
 
+    llrs_by_hlr = get_llrs_grouped(conn, [hlr['id'] for hlr in hlrs])
     for hlr in hlrs:
-        llrs = get_llrs_for_hlr(db, hlr['id'])
+        llrs = llrs_by_hlr[hlr['id']]
         print(f"  {hlr['id']}: {len(llrs)} LLRs -> generating 2 test cases")
+        scan = _scan_llrs(llrs)
 
         # Normal Range test
-        nr_test = generate_normal_test(hlr, llrs, tc_index)
+        nr_test = generate_normal_test(hlr, scan, tc_index)
         all_test_cases.append(nr_test)
         tc_index += 1
 
         # Robustness test
-        rob_test = generate_robustness_test(hlr, llrs, tc_index)
+        rob_test = generate_robustness_test(hlr, scan, tc_index)
         all_test_cases.append(rob_test)
         tc_index += 1
 
@@ -655,13 +793,14 @@ def main():
 
     if args.dry_run:
         print("\n--- DRY RUN (no DB writes) ---\n")
-    populate_test_cases(db, all_test_cases, dry_run=args.dry_run)
+    populate_test_cases(conn, all_test_cases, dry_run=args.dry_run)
 
     # Generate test scripts if requested
     if args.gen_scripts:
-        count = generate_test_scripts(db, args.gen_scripts, dry_run=args.dry_run)
+        count = generate_test_scripts(conn, args.gen_scripts, dry_run=args.dry_run)
         print(f"\nGenerated {count} test scripts.")
 
+    conn.close()
     print("\nPhase 4 complete.")
 
 
@@ -10,10 +10,52 @@ Timestamp: 2025-02-10 08:30 UTC
 
 import sqlite3
 import argparse
+import functools
+import hashlib
 import os
+import pathlib
 import sys
 import re
 
+# Connection tuning applied by every opener of the database. journal_mode=WAL
+# is persistent, so a freshly created DB stays in WAL for all downstream
+# scripts; the remaining settings are per-connection.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MB page cache
+    "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped I/O
+)
+
+# Checked connections (validation, interactive edits) enforce foreign keys.
+# Bulk connections (schema DDL, bulk loads) skip the per-row FK checks and
+# get a larger page cache; referential integrity is reported afterwards by
+# the v_orphaned_* views.
+CHECKED_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+)
+BULK_PRAGMAS = (
+    "PRAGMA foreign_keys = OFF",
+    "PRAGMA cache_size = -200000",     # ~200 MB page cache
+)
+
+# HLR quality gate: a requirement must not name a source file type.
+# pb.go is listed ahead of pb so the longer extension wins.
+FILE_EXTENSIONS = ('pb.go', 'js', 'go', 'py', 'rs', 'ts', 'tsx', 'jsx',
+                   'css', 'html', 'md', 'pb', 'proto')
+_EXT_PATTERN = re.compile(
+    r'\.(?:' + '|'.join(re.escape(ext) for ext in FILE_EXTENSIONS) + r')\b', re.I)
+
+# HLR quality gate: tolerances, units or performance constraints. The
+# short units are word-bounded so e.g. 'systems' does not count as 'ms'.
+_QUANT_RE = re.compile(
+    r'accuracy|tolerance|latency|within|less than|greater than|maximum|minimum'
+    r'|\bms\b|seconds|meters|%|knots|feet|\bkm\b',
+    re.I
+)
+
 SCHEMA_SQL = """
 -- ============================================================
 -- DO-178C Traceability Database Schema
@@ -76,7 +118,7 @@ CREATE TABLE IF NOT EXISTS architecture_decisions (
     )),
     created_at  TEXT DEFAULT (datetime('now')),
     FOREIGN KEY (parent_hlr) REFERENCES high_level_requirements(id)
-);
+) WITHOUT ROWID;
 
 -- HLR Test Cases (EVERY HLR MUST have at least one)
 CREATE TABLE IF NOT EXISTS hlr_test_cases (
@@ -108,7 +150,7 @@ CREATE TABLE IF NOT EXISTS sdd_sections (
     sort_order      INTEGER NOT NULL,   -- Display ordering
     created_at      TEXT DEFAULT (datetime('now')),
     updated_at      TEXT DEFAULT (datetime('now'))
-);
+) WITHOUT ROWID;
 
 -- ============================================================
 -- Source Inventory (populated by scan_codebase.py — Phase 1)
@@ -126,15 +168,60 @@ CREATE TABLE IF NOT EXISTS source_inventory (
     scanned_at    TEXT DEFAULT (datetime('now'))
 );
 
+-- Per-file scan cache for scan_codebase.py: hash of (scanner version, extension,
+-- file bytes) -> JSON [[function_name, start_line, end_line], ...].
+CREATE TABLE IF NOT EXISTS scan_cache (
+    hash    TEXT PRIMARY KEY,
+    records TEXT NOT NULL
+) WITHOUT ROWID;
+
 -- ============================================================
 -- Indexes for fast lookups
 -- ============================================================
 CREATE INDEX IF NOT EXISTS idx_hlr_parent_sys  ON high_level_requirements(parent_sys);
+CREATE INDEX IF NOT EXISTS idx_hlr_text_lower  ON high_level_requirements(lower(text));
 CREATE INDEX IF NOT EXISTS idx_llr_parent_hlr  ON low_level_requirements(parent_hlr);
-CREATE INDEX IF NOT EXISTS idx_htc_parent_hlr  ON hlr_test_cases(parent_hlr);
+CREATE INDEX IF NOT EXISTS idx_llr_trace_code  ON low_level_requirements(trace_to_code);
+CREATE INDEX IF NOT EXISTS idx_htc_parent_script ON hlr_test_cases(parent_hlr, test_script_ref);
+CREATE INDEX IF NOT EXISTS idx_htc_script_null ON hlr_test_cases(parent_hlr) WHERE test_script_ref IS NULL;
 CREATE INDEX IF NOT EXISTS idx_arch_parent_hlr ON architecture_decisions(parent_hlr);
 CREATE INDEX IF NOT EXISTS idx_inv_file_path   ON source_inventory(file_path);
-CREATE INDEX IF NOT EXISTS idx_inv_has_llr     ON source_inventory(has_llr);
+CREATE INDEX IF NOT EXISTS idx_inv_has_llr     ON source_inventory(has_llr, file_path);
+CREATE INDEX IF NOT EXISTS idx_inv_parent_hlr  ON source_inventory(parent_hlr);
+CREATE INDEX IF NOT EXISTS idx_sdd_sort        ON sdd_sections(sort_order);
+
+-- ============================================================
+-- Materialized LLR count per HLR (maintained by triggers)
+-- Lets the decomposition check avoid a GROUP BY over every LLR.
+-- ============================================================
+CREATE TABLE IF NOT EXISTS mv_hlr_llr_counts (
+    hlr_id    TEXT PRIMARY KEY,
+    llr_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_llr_count_insert
+AFTER INSERT ON low_level_requirements
+BEGIN
+    INSERT INTO mv_hlr_llr_counts (hlr_id, llr_count) VALUES (NEW.parent_hlr, 1)
+    ON CONFLICT(hlr_id) DO UPDATE SET llr_count = llr_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_llr_count_delete
+AFTER DELETE ON low_level_requirements
+BEGIN
+    UPDATE mv_hlr_llr_counts SET llr_count = llr_count - 1
+    WHERE hlr_id = OLD.parent_hlr;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_llr_count_reparent
+AFTER UPDATE OF parent_hlr ON low_level_requirements
+WHEN OLD.parent_hlr IS NOT NEW.parent_hlr
+BEGIN
+    UPDATE mv_hlr_llr_counts SET llr_count = llr_count - 1
+    WHERE hlr_id = OLD.parent_hlr;
+    INSERT INTO mv_hlr_llr_counts (hlr_id, llr_count) VALUES (NEW.parent_hlr, 1)
+    ON CONFLICT(hlr_id) DO UPDATE SET llr_count = llr_count + 1;
+END;
 
 -- ============================================================
 -- Full Trace Matrix View (HLR test cases only)
@@ -205,34 +292,130 @@ WHERE hlr.parent_sys IS NULL;
 """
 
 
+# Validation report footer, filled from the summary query's columns.
+_SUMMARY_TMPL = """
+--- Summary ---
+  System Reqs:     {sys_cnt}
+  HLRs:            {hlrs}
+  HLR Test Cases:  {hlr_tcs}
+  LLRs:            {llrs}  (avg {ratio} per HLR)
+  SDD Sections:    {sdd_count}
+  Arch Decisions:  {arch_cnt}"""
+
+# Insert-time form of the extension gate. Other scripts' connections have
+# no REGEXP function, so the trigger spells _EXT_PATTERN as GLOBs over
+# the lowercased text: '.ext' at the end, or followed by a non-word char.
+_EXT_GLOB_SQL = "\n       OR ".join(
+    f"lower(NEW.text) GLOB '*.{ext}' OR lower(NEW.text) GLOB '*.{ext}[^a-z0-9_]*'"
+    for ext in FILE_EXTENSIONS)
+
+HLR_TEXT_GUARD_SQL = "".join(f"""
+CREATE TRIGGER IF NOT EXISTS trg_hlr_no_ext_{event.split()[0].lower()}
+BEFORE {event} ON high_level_requirements
+WHEN {_EXT_GLOB_SQL}
+BEGIN
+    SELECT RAISE(ABORT, 'HLR text references a file extension (DO-178C violation)');
+END;
+""" for event in ("INSERT", "UPDATE OF text"))
+
+# Full rebuild of mv_hlr_llr_counts, run on every init_database call
+# (with the schema when it is applied). Backfills databases created
+# before the table existed and resets any drift (e.g. INSERT OR REPLACE
+# without recursive_triggers skips the delete trigger).
+REFRESH_LLR_COUNTS_SQL = """
+DELETE FROM mv_hlr_llr_counts;
+INSERT INTO mv_hlr_llr_counts (hlr_id, llr_count)
+SELECT parent_hlr, COUNT(*) FROM low_level_requirements GROUP BY parent_hlr;
+"""
+
+# Fingerprint of the applied DDL, stored in PRAGMA user_version so that
+# re-running init on an up-to-date database is a single PRAGMA read.
+# Masked to 31 bits: user_version is a signed 32-bit integer.
+SCHEMA_HASH = int(hashlib.blake2b((SCHEMA_SQL + HLR_TEXT_GUARD_SQL).encode(),
+                                  digest_size=4).hexdigest(), 16) & 0x7FFFFFFF
+
+
+def _configure_connection(conn, *, bulk=False):
+    """
+    Apply CONNECTION_PRAGMAS plus BULK_PRAGMAS (bulk=True) or
+    CHECKED_PRAGMAS to an open connection and return it.
+    """
+    for pragma in CONNECTION_PRAGMAS + (BULK_PRAGMAS if bulk else CHECKED_PRAGMAS):
+        conn.execute(pragma)
+    return conn
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_regexp(pattern):
+    for compiled in (_EXT_PATTERN, _QUANT_RE):
+        if pattern == compiled.pattern:
+            return compiled
+    return re.compile(pattern, re.I)
+
+
+def _regexp(pattern, text):
+    """SQL REGEXP: case-insensitive search of pattern within text."""
+    return text is not None and _compile_regexp(pattern).search(text) is not None
+
+
+def _analyze(conn):
+    """Refresh planner statistics (sqlite_stat1) for the trace/validation joins."""
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+
 def init_database(db_path):
     """
     init_database
     Functionality: Creates the SQLite database and applies the full schema.
     Inputs: db_path (str) - Path to the database file.
     Outputs: None (creates file on disk).
-    Data/Control Flow: Ensures parent directory exists, connects, executes schema.
+    Data/Control Flow: Ensures parent directory exists, connects, executes schema
+                       in a single transaction unless user_version already
+                       matches SCHEMA_HASH; mv_hlr_llr_counts is rebuilt either way.
     Timestamp: 2025-02-10 08:30 UTC
     """
     # Decision Logic: Check if parent directory exists, create if not.
-    # Conditions: os.path.dirname(db_path) is not empty string.
-    parent_dir = os.path.dirname(db_path)
-    if parent_dir:
-        os.makedirs(parent_dir, exist_ok=True)
-
-    conn = sqlite3.connect(db_path)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    conn.executescript(SCHEMA_SQL)
-    conn.commit()
+    # Conditions: parent directory does not exist yet (a bare filename's
+    # parent is '.', which always does).
+    parent_dir = pathlib.Path(db_path).parent
+    if not parent_dir.is_dir():
+        parent_dir.mkdir(parents=True, exist_ok=True)
+
+    conn = _configure_connection(sqlite3.connect(db_path), bulk=True)
+    # Decision Logic: Apply the schema only if the stored fingerprint differs.
+    # Conditions: PRAGMA user_version != SCHEMA_HASH (0 for new/older DBs).
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_HASH:
+        # One explicit transaction for the whole schema: a single commit
+        # instead of one implicit transaction per DDL statement.
+        conn.executescript(
+            f"BEGIN;\n{SCHEMA_SQL}\n{HLR_TEXT_GUARD_SQL}\n{REFRESH_LLR_COUNTS_SQL}\n"
+            f"PRAGMA user_version = {SCHEMA_HASH};\nCOMMIT;")
+        _analyze(conn)
+    else:
+        conn.executescript(f"BEGIN;\n{REFRESH_LLR_COUNTS_SQL}\nCOMMIT;")
     conn.close()
     print(f"[DO-178C] Traceability database initialized at: {db_path}")
 
 
-def validate_database(db_path):
+def _violations(conn, query, limit=-1):
+    """
+    Count the rows of a validation query and return (count, cursor), where
+    the cursor streams at most `limit` rows (-1 = all) instead of
+    materialising the full result set.
+    """
+    count = conn.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[0]
+    rows = conn.execute(f"{query} LIMIT ?", (limit,)) if count else ()
+    return count, rows
+
+
+def validate_database(db_path, analyze=False):
     """
     validate_database
     Functionality: Runs integrity checks on an existing traceability database.
     Inputs: db_path (str) - Path to the database file.
+            analyze (bool) - Refresh planner statistics after validating.
     Outputs: Prints validation results to stdout.
     Data/Control Flow: Queries validation views and reports findings.
     Timestamp: 2025-02-10 08:30 UTC
@@ -243,124 +426,146 @@ def validate_database(db_path):
         print(f"[ERROR] Database not found: {db_path}")
         sys.exit(1)
 
-    conn = sqlite3.connect(db_path)
-    conn.execute("PRAGMA foreign_keys = ON;")
+    conn = _configure_connection(sqlite3.connect(db_path))
+    conn.row_factory = sqlite3.Row
+
+    # The report is buffered and written with a single stdout write.
+    out = []
+
+    def emit(line):
+        out.append(line + "\n")
 
-    print("\n=== DO-178C Traceability Validation ===\n")
+    emit("\n=== DO-178C Traceability Validation ===\n")
 
     # Check incomplete decomposition
-    rows = conn.execute("SELECT * FROM v_incomplete_decomposition").fetchall()
-    if rows:
-        print(f"[WARN] {len(rows)} HLR(s) have fewer than 2 LLRs:")
+    try:
+        count, rows = _violations(conn, """
+            SELECT hlr.id, hlr.text, COALESCE(mv.llr_count, 0) AS llr_count
+            FROM high_level_requirements hlr
+            LEFT JOIN mv_hlr_llr_counts mv ON mv.hlr_id = hlr.id
+            WHERE COALESCE(mv.llr_count, 0) < 2
+            ORDER BY hlr.id
+        """)
+    except sqlite3.OperationalError:
+        # Table may not exist in older schema (until init_db.py is re-run)
+        count, rows = _violations(conn, "SELECT * FROM v_incomplete_decomposition")
+    if count:
+        emit(f"[WARN] {count} HLR(s) have fewer than 2 LLRs:")
         for r in rows:
-            print(f"       {r[0]}: {r[2]} LLR(s) — \"{r[1][:60]}...\"")
+            emit(f"       {r['id']}: {r['llr_count']} LLR(s) — \"{r['text'][:60]}...\"")
     else:
-        print("[PASS] All HLRs have ≥2 LLRs (1:N decomposition satisfied)")
+        emit("[PASS] All HLRs have ≥2 LLRs (1:N decomposition satisfied)")
 
     # Check untested HLRs
-    rows = conn.execute("SELECT * FROM v_untested_hlrs").fetchall()
-    if rows:
-        print(f"[FAIL] {len(rows)} HLR(s) have NO test cases:")
+    count, rows = _violations(conn, "SELECT * FROM v_untested_hlrs")
+    if count:
+        emit(f"[FAIL] {count} HLR(s) have NO test cases:")
         for r in rows:
-            print(f"       {r[0]}: \"{r[1][:60]}...\"")
+            emit(f"       {r['id']}: \"{r['text'][:60]}...\"")
     else:
-        print("[PASS] All HLRs have at least one HLR-level test case")
+        emit("[PASS] All HLRs have at least one HLR-level test case")
 
     # Check orphaned LLRs
-    rows = conn.execute("SELECT * FROM v_orphaned_llrs").fetchall()
-    if rows:
-        print(f"[FAIL] {len(rows)} orphaned LLR(s) (no valid parent HLR):")
+    count, rows = _violations(conn, "SELECT * FROM v_orphaned_llrs")
+    if count:
+        emit(f"[FAIL] {count} orphaned LLR(s) (no valid parent HLR):")
         for r in rows:
-            print(f"       {r[0]} → parent: {r[1]}")
+            emit(f"       {r['id']} → parent: {r['parent_hlr']}")
     else:
-        print("[PASS] No orphaned LLRs")
+        emit("[PASS] No orphaned LLRs")
 
     # Check orphaned HLRs
-    rows = conn.execute("SELECT * FROM v_orphaned_hlrs").fetchall()
-    if rows:
-        print(f"[WARN] {len(rows)} HLR(s) reference non-existent system requirements:")
+    count, rows = _violations(conn, "SELECT * FROM v_orphaned_hlrs")
+    if count:
+        emit(f"[WARN] {count} HLR(s) reference non-existent system requirements:")
         for r in rows:
-            print(f"       {r[0]} → parent_sys: {r[1]}")
+            emit(f"       {r['id']} → parent_sys: {r['parent_sys']}")
     else:
-        print("[PASS] No orphaned HLRs")
+        emit("[PASS] No orphaned HLRs")
 
     # Check for untraced HLRs (NULL parent_sys — traceability break)
     try:
-        rows = conn.execute("SELECT * FROM v_untraced_hlrs").fetchall()
-        if rows:
-            print(f"[FAIL] {len(rows)} HLR(s) have no parent system requirement (traceability break):")
-            for r in rows[:5]:
-                print(f"       {r[0]}: \"{r[1][:50]}...\"")
-            if len(rows) > 5:
-                print(f"       ... and {len(rows)-5} more")
+        count, rows = _violations(conn, "SELECT * FROM v_untraced_hlrs", limit=5)
+        if count:
+            emit(f"[FAIL] {count} HLR(s) have no parent system requirement (traceability break):")
+            for r in rows:
+                emit(f"       {r['id']}: \"{r['text'][:50]}...\"")
+            if count > 5:
+                emit(f"       ... and {count-5} more")
         else:
-            print("[PASS] All HLRs trace to a system requirement")
+            emit("[PASS] All HLRs trace to a system requirement")
     except sqlite3.OperationalError:
         pass  # View may not exist in older schema
 
     # Check for test cases without generated scripts
     try:
-        rows = conn.execute("SELECT * FROM v_untested_scripts").fetchall()
-        if rows:
-            print(f"[WARN] {len(rows)} HLR test case(s) have no generated test script:")
+        count, rows = _violations(conn, "SELECT * FROM v_untested_scripts")
+        if count:
+            emit(f"[WARN] {count} HLR test case(s) have no generated test script:")
             for r in rows:
-                print(f"       {r[0]} (HLR: {r[1]})")
+                emit(f"       {r['id']} (HLR: {r['parent_hlr']})")
         else:
-            print("[PASS] All HLR test cases have generated test scripts")
+            emit("[PASS] All HLR test cases have generated test scripts")
     except sqlite3.OperationalError:
         pass  # View may not exist in older schema
 
     # --- HLR Quality Spot-Checks ---
-    print("\n--- HLR Quality Gates ---")
-    
-    # 1. File Extension Check
-    all_hlrs = conn.execute("SELECT id, text FROM high_level_requirements").fetchall()
-    file_ref_hlrs = []
-    ext_pattern = re.compile(r'\.(js|go|py|rs|ts|tsx|jsx|css|html|md|pb\.go|pb|proto)', re.I)
+    emit("\n--- HLR Quality Gates ---")
     
-    for row in all_hlrs:
-        if ext_pattern.search(row[1]):
-            file_ref_hlrs.append(row[0])
-            
-    if file_ref_hlrs:
-        print(f"[FAIL] {len(file_ref_hlrs)} HLR(s) reference file extensions (DO-178C violation):")
-        for hid in file_ref_hlrs[:5]:
-            print(f"       {hid}")
-        if len(file_ref_hlrs) > 5:
-            print(f"       ... and {len(file_ref_hlrs)-5} more")
+    # Both gates are evaluated inside SQLite in a single pass over the HLR
+    # text, so it never crosses into Python; REGEXP is case-insensitive
+    # (see _regexp).
+    conn.create_function("REGEXP", 2, _regexp, deterministic=True)
+    total_hlrs, file_ref_count, hlrs_with_quant = conn.execute("""
+        SELECT COUNT(*),
+               COALESCE(SUM(text REGEXP :ext), 0),
+               COALESCE(SUM(text REGEXP :quant), 0)
+        FROM high_level_requirements
+    """, {"ext": _EXT_PATTERN.pattern, "quant": _QUANT_RE.pattern}).fetchone()
+
+    # 1. File Extension Check (new rows are rejected by trg_hlr_no_ext_*;
+    # this still catches rows written before the guard existed)
+    if file_ref_count:
+        emit(f"[FAIL] {file_ref_count} HLR(s) reference file extensions (DO-178C violation):")
+        for r in conn.execute(
+                "SELECT id FROM high_level_requirements WHERE text REGEXP ? LIMIT 5",
+                (_EXT_PATTERN.pattern,)):
+            emit(f"       {r['id']}")
+        if file_ref_count > 5:
+            emit(f"       ... and {file_ref_count-5} more")
     else:
-        print("[PASS] No HLRs reference specific file extensions")
+        emit("[PASS] No HLRs reference specific file extensions")
 
     # 2. Quantitative Terms Check
-    quant_keywords = ['accuracy', 'tolerance', 'latency', 'within', 'less than', 'greater than', 'maximum', 'minimum', 'ms', 'seconds', 'meters', '%', 'knots', 'feet', 'km']
-    hlrs_with_quant = 0
-    for row in all_hlrs:
-        txt = row[1].lower()
-        if any(kw in txt for kw in quant_keywords):
-            hlrs_with_quant += 1
-            
-    coverage = (hlrs_with_quant / len(all_hlrs) * 100) if all_hlrs else 0
+
+    coverage = (hlrs_with_quant / total_hlrs * 100) if total_hlrs else 0
     if coverage < 50:
-        print(f"[WARN] Low quantitative coverage: {coverage:.1f}% ({hlrs_with_quant}/{len(all_hlrs)})")
-        print("       HLRs should specify tolerances, units, or performance constraints.")
+        emit(f"[WARN] Low quantitative coverage: {coverage:.1f}% ({hlrs_with_quant}/{total_hlrs})")
+        emit("       HLRs should specify tolerances, units, or performance constraints.")
     else:
-        print(f"[PASS] Good quantitative coverage: {coverage:.1f}% ({hlrs_with_quant}/{len(all_hlrs)})")
-
-    # Summary stats
-    hlrs = conn.execute("SELECT COUNT(*) FROM high_level_requirements").fetchone()[0]
-    llrs = conn.execute("SELECT COUNT(*) FROM low_level_requirements").fetchone()[0]
-    hlr_tcs = conn.execute("SELECT COUNT(*) FROM hlr_test_cases").fetchone()[0]
-    sdd_count = conn.execute("SELECT COUNT(*) FROM sdd_sections").fetchone()[0]
-    ratio = f"{llrs/hlrs:.1f}" if hlrs > 0 else "N/A"
-    print(f"\n--- Summary ---")
-    print(f"  System Reqs:     {conn.execute('SELECT COUNT(*) FROM system_requirements').fetchone()[0]}")
-    print(f"  HLRs:            {hlrs}")
-    print(f"  HLR Test Cases:  {hlr_tcs}")
-    print(f"  LLRs:            {llrs}  (avg {ratio} per HLR)")
-    print(f"  SDD Sections:    {sdd_count}")
-    print(f"  Arch Decisions:  {conn.execute('SELECT COUNT(*) FROM architecture_decisions').fetchone()[0]}")
-
+        emit(f"[PASS] Good quantitative coverage: {coverage:.1f}% ({hlrs_with_quant}/{total_hlrs})")
+
+    # Summary stats, all counted in one round-trip
+    # (the LLR/HLR ratio is NULL when there are no HLRs)
+    counts = dict(conn.execute("""
+        WITH c AS (
+            SELECT (SELECT COUNT(*) FROM system_requirements)     AS sys_cnt,
+                   (SELECT COUNT(*) FROM high_level_requirements) AS hlrs,
+                   (SELECT COUNT(*) FROM hlr_test_cases)          AS hlr_tcs,
+                   (SELECT COUNT(*) FROM low_level_requirements)  AS llrs,
+                   (SELECT COUNT(*) FROM sdd_sections)            AS sdd_count,
+                   (SELECT COUNT(*) FROM architecture_decisions)  AS arch_cnt
+        )
+        SELECT c.*, CASE WHEN hlrs > 0 THEN CAST(llrs AS REAL) / hlrs END AS ratio
+        FROM c
+    """).fetchone())
+    counts["ratio"] = "N/A" if counts["ratio"] is None else f"{counts['ratio']:.1f}"
+    emit(_SUMMARY_TMPL.format(**counts))
+
+    if analyze:
+        _analyze(conn)
     conn.close()
+    sys.stdout.write("".join(out))
 
 
 if __name__ == "__main__":
@@ -369,11 +574,13 @@ if __name__ == "__main__":
                         help="Path to the SQLite database (default: docs/artefacts/traceability.db)")
     parser.add_argument("--validate", action="store_true",
                         help="Validate an existing database instead of creating one")
+    parser.add_argument("--analyze", action="store_true",
+                        help="With --validate, refresh query-planner statistics afterwards")
     args = parser.parse_args()
 
     # Decision Logic: Route to init or validate based on --validate flag.
     # Conditions: args.validate is True or False.
     if args.validate:
-        validate_database(args.db_path)
+        validate_database(args.db_path, analyze=args.analyze)
     else:
         init_database(args.db_path)
@@ -3,8 +3,10 @@
 manage_reqs.py
 Functionality: CLI helper for inserting, querying, and exporting requirements
                in the DO-178C traceability database.
-Inputs: Subcommand (add-sys, add-hlr, add-llr, add-tc, add-arch, export, query)
-        plus required arguments per subcommand.
+Inputs: Subcommand (add-sys, add-hlr, add-llr, add-arch, add-hlr-tc,
+        add-sdd-section, add-batch, export, query) plus required arguments
+        per subcommand. The add_* helpers do not commit; main() runs each
+        subcommand in one transaction.
 Outputs: Database modifications or printed query results.
 Data/Control Flow: Parses CLI args, connects to SQLite, executes operations.
 Timestamp: 2025-02-10 08:30 UTC
@@ -13,8 +15,86 @@ Timestamp: 2025-02-10 08:30 UTC
 import sqlite3
 import argparse
 import csv
+import functools
+import io
+import itertools
+import json
 import os
+import pathlib
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Connection settings for every CLI invocation. WAL + synchronous=NORMAL
+# lets export/query read while another process writes and avoids an fsync
+# per commit.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MiB page cache
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA analysis_limit = 400",     # bounds the ANALYZE run by PRAGMA optimize
+)
+
+# Read-only subcommands (export, query) open the DB with mode=ro, so they
+# never take the write lock and cannot modify it.
+READ_ONLY_COMMANDS = frozenset({"export", "query"})
+READ_PRAGMAS = (
+    "PRAGMA query_only = 1",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",      # 64 MiB page cache
+)
+
+# Prepared statements kept per connection (the default is 128).
+STATEMENT_CACHE_SIZE = 512
+
+# Rows pulled per fetchmany() while streaming CSV exports and query output.
+EXPORT_FETCH_SIZE = 1000
+# Output buffer for CSV exports (1 MiB), to keep write syscalls few.
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Rows per executemany() call when streaming an add-batch file.
+BULK_CHUNK_ROWS = 10_000
+
+# Row kinds -> (table, insert columns), shared by the add_* helpers and
+# add-batch. Column names double as the JSONL keys / CSV headers of a
+# batch file.
+BATCH_KINDS = {
+    "sys":         ("system_requirements",
+                    ("id", "text", "source")),
+    "hlr":         ("high_level_requirements",
+                    ("id", "text", "source", "parent_sys", "allocated_to")),
+    "llr":         ("low_level_requirements",
+                    ("id", "text", "parent_hlr", "source", "logic_type", "trace_to_code")),
+    "arch":        ("architecture_decisions",
+                    ("id", "description", "rationale", "parent_hlr", "category")),
+    "hlr-tc":      ("hlr_test_cases",
+                    ("id", "parent_hlr", "test_type", "description", "procedure",
+                     "input_data", "expected_output", "pass_criteria")),
+    "sdd-section": ("sdd_sections",
+                    ("id", "section_number", "title", "content", "sort_order")),
+}
+# architecture_decisions has created_at only
+KINDS_WITHOUT_UPDATED_AT = frozenset({"arch"})
+
+
+@functools.lru_cache(maxsize=None)
+def _upsert_sql(kind):
+    """
+    INSERT ... ON CONFLICT(id) DO UPDATE for a BATCH_KINDS entry. Unlike
+    INSERT OR REPLACE, an existing row is updated in place: no delete that
+    would trip child foreign keys, and columns not written here (e.g.
+    test_script_ref, pass_fail, is_derived) keep their values.
+    """
+    table, columns = BATCH_KINDS[kind]
+    updates = [f"{col} = excluded.{col}" for col in columns if col != "id"]
+    if kind not in KINDS_WITHOUT_UPDATED_AT:
+        updates.append("updated_at = datetime('now')")
+    return (f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {', '.join(updates)}")
 
 
 def connect(db_path):
@@ -23,7 +103,8 @@ def connect(db_path):
     Functionality: Opens a connection to the traceability database with FK enforcement.
     Inputs: db_path (str) - Path to the SQLite database file.
     Outputs: sqlite3.Connection object.
-    Data/Control Flow: Checks file exists, connects with foreign keys enabled.
+    Data/Control Flow: Checks file exists, connects and applies CONNECTION_PRAGMAS
+                       (WAL, foreign keys enabled).
     Timestamp: 2025-02-10 08:30 UTC
     """
     # Decision Logic: Verify database file exists before connecting.
@@ -33,8 +114,33 @@ def connect(db_path):
         print("  Run init_db.py first to create the database.")
         sys.exit(1)
 
-    conn = sqlite3.connect(db_path)
-    conn.execute("PRAGMA foreign_keys = ON;")
+    conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def connect_ro(db_path):
+    """
+    connect_ro
+    Functionality: Opens a read-only connection to the traceability database.
+    Inputs: db_path (str) - Path to the SQLite database file.
+    Outputs: sqlite3.Connection object.
+    Data/Control Flow: Checks file exists, connects via a mode=ro URI and
+                       applies READ_PRAGMAS (query_only).
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    # Decision Logic: Verify database file exists before connecting.
+    # Conditions: os.path.exists(db_path) must be True.
+    if not os.path.exists(db_path):
+        print(f"[ERROR] Database not found: {db_path}")
+        print("  Run init_db.py first to create the database.")
+        sys.exit(1)
+
+    uri = pathlib.Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
@@ -43,15 +149,11 @@ def add_system_req(conn, req_id, text, source="User Prompt"):
     add_system_req
     Functionality: Inserts a new system-level requirement.
     Inputs: conn (Connection), req_id (str), text (str), source (str).
-    Outputs: None (commits row to database).
-    Data/Control Flow: INSERT OR REPLACE into system_requirements table.
+    Outputs: None (row is committed by the caller).
+    Data/Control Flow: UPSERT into system_requirements table (existing row updated in place).
     Timestamp: 2025-02-10 08:30 UTC
     """
-    conn.execute(
-        "INSERT OR REPLACE INTO system_requirements (id, text, source) VALUES (?, ?, ?)",
-        (req_id, text, source)
-    )
-    conn.commit()
+    conn.execute(_upsert_sql("sys"), (req_id, text, source))
     print(f"[OK] System Requirement {req_id} added.")
 
 
@@ -61,17 +163,11 @@ def add_hlr(conn, hlr_id, text, source, parent_sys=None, allocated_to=None):
     Functionality: Inserts a new High-Level Requirement linked to a system requirement.
     Inputs: conn (Connection), hlr_id (str), text (str), source (str),
             parent_sys (str, optional), allocated_to (str, optional).
-    Outputs: None (commits row to database).
-    Data/Control Flow: INSERT OR REPLACE into high_level_requirements table.
+    Outputs: None (row is committed by the caller).
+    Data/Control Flow: UPSERT into high_level_requirements table (existing row updated in place).
     Timestamp: 2025-02-10 08:30 UTC
     """
-    conn.execute(
-        """INSERT OR REPLACE INTO high_level_requirements
-           (id, text, source, parent_sys, allocated_to)
-           VALUES (?, ?, ?, ?, ?)""",
-        (hlr_id, text, source, parent_sys, allocated_to)
-    )
-    conn.commit()
+    conn.execute(_upsert_sql("hlr"), (hlr_id, text, source, parent_sys, allocated_to))
     print(f"[OK] HLR {hlr_id} added (parent: {parent_sys}).")
 
 
@@ -81,8 +177,8 @@ def add_llr(conn, llr_id, text, parent_hlr, source=None, logic_type=None, trace_
     Functionality: Inserts a new Low-Level Requirement linked to its parent HLR.
     Inputs: conn (Connection), llr_id (str), text (str), parent_hlr (str),
             source (str, optional), logic_type (str, optional), trace_to_code (str, optional).
-    Outputs: None (commits row to database).
-    Data/Control Flow: INSERT OR REPLACE into low_level_requirements table.
+    Outputs: None (row is committed by the caller).
+    Data/Control Flow: UPSERT into low_level_requirements table (existing row updated in place).
                        Defaults source to parent_hlr if not provided.
     Timestamp: 2025-02-10 08:30 UTC
     """
@@ -91,37 +187,23 @@ def add_llr(conn, llr_id, text, parent_hlr, source=None, logic_type=None, trace_
     if source is None:
         source = parent_hlr
 
-    conn.execute(
-        """INSERT OR REPLACE INTO low_level_requirements
-           (id, text, parent_hlr, source, logic_type, trace_to_code)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (llr_id, text, parent_hlr, source, logic_type, trace_to_code)
-    )
-    conn.commit()
+    conn.execute(_upsert_sql("llr"),
+                 (llr_id, text, parent_hlr, source, logic_type, trace_to_code))
     print(f"[OK] LLR {llr_id} added (parent HLR: {parent_hlr}, type: {logic_type}).")
 
 
-def add_test_case(conn, tc_id, parent_llr, test_type, input_data, expected_output):
-
-
-
 def add_arch_decision(conn, arch_id, description, rationale=None, parent_hlr=None, category=None):
     """
     add_arch_decision
     Functionality: Inserts a new architectural decision.
     Inputs: conn (Connection), arch_id (str), description (str),
             rationale (str, optional), parent_hlr (str, optional), category (str, optional).
-    Outputs: None (commits row to database).
-    Data/Control Flow: INSERT OR REPLACE into architecture_decisions table.
+    Outputs: None (row is committed by the caller).
+    Data/Control Flow: UPSERT into architecture_decisions table (existing row updated in place).
     Timestamp: 2025-02-10 08:30 UTC
     """
-    conn.execute(
-        """INSERT OR REPLACE INTO architecture_decisions
-           (id, description, rationale, parent_hlr, category)
-           VALUES (?, ?, ?, ?, ?)""",
-        (arch_id, description, rationale, parent_hlr, category)
-    )
-    conn.commit()
+    conn.execute(_upsert_sql("arch"),
+                 (arch_id, description, rationale, parent_hlr, category))
     print(f"[OK] Architecture Decision {arch_id} added (category: {category}).")
 
 
@@ -132,17 +214,12 @@ def add_hlr_test_case(conn, tc_id, parent_hlr, test_type, description, procedure
     Inputs: conn (Connection), tc_id (str), parent_hlr (str), test_type (str),
             description (str), procedure (str), input_data (str),
             expected_output (str), pass_criteria (str, optional).
-    Outputs: None (commits row to database).
-    Data/Control Flow: INSERT OR REPLACE into hlr_test_cases table.
+    Outputs: None (row is committed by the caller).
+    Data/Control Flow: UPSERT into hlr_test_cases table (existing row updated in place).
     Timestamp: 2025-02-10 20:45 UTC
     """
-    conn.execute(
-        """INSERT OR REPLACE INTO hlr_test_cases
-           (id, parent_hlr, test_type, description, procedure, input_data, expected_output, pass_criteria)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-        (tc_id, parent_hlr, test_type, description, procedure, input_data, expected_output, pass_criteria)
-    )
-    conn.commit()
+    conn.execute(_upsert_sql("hlr-tc"),
+                 (tc_id, parent_hlr, test_type, description, procedure, input_data, expected_output, pass_criteria))
     print(f"[OK] HLR Test Case {tc_id} added (parent HLR: {parent_hlr}, type: {test_type}).")
 
 
@@ -152,30 +229,134 @@ def add_sdd_section(conn, sdd_id, section_number, title, content, sort_order):
     Functionality: Inserts or updates an SDD section with full markdown content.
     Inputs: conn (Connection), sdd_id (str), section_number (str), title (str),
             content (str), sort_order (int).
-    Outputs: None (commits row to database).
-    Data/Control Flow: INSERT OR REPLACE into sdd_sections table.
+    Outputs: None (row is committed by the caller).
+    Data/Control Flow: UPSERT into sdd_sections table (existing row updated in place).
     Timestamp: 2025-02-10 21:45 UTC
     """
-    conn.execute(
-        """INSERT OR REPLACE INTO sdd_sections
-           (id, section_number, title, content, sort_order)
-           VALUES (?, ?, ?, ?, ?)""",
-        (sdd_id, section_number, title, content, sort_order)
-    )
-    conn.commit()
+    conn.execute(_upsert_sql("sdd-section"),
+                 (sdd_id, section_number, title, content, sort_order))
     print(f"[OK] SDD Section {sdd_id} ({section_number} {title}) added.")
 
 
+def read_batch_file(path):
+    """
+    read_batch_file
+    Functionality: Yields records from a batch file as dicts.
+    Inputs: path (str) - .csv file (header row = column names) or JSONL file
+            (one JSON object per line).
+    Outputs: Iterator of dicts; empty CSV cells are read as None.
+    Data/Control Flow: Picks the reader from the file extension.
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        # Decision Logic: CSV by extension, otherwise JSONL.
+        # Conditions: path ends with .csv (case-insensitive).
+        if path.lower().endswith(".csv"):
+            for rec in csv.DictReader(f):
+                yield {k: (v if v != "" else None) for k, v in rec.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def add_many(conn, kind, rows):
+    """
+    add_many
+    Functionality: Bulk counterpart of the add_* helpers for one kind of row.
+    Inputs: conn (Connection), kind (str) - key of BATCH_KINDS,
+            rows (iterable of tuples in BATCH_KINDS[kind] column order).
+    Outputs: int - number of rows written (committed by the caller).
+    Data/Control Flow: One UPSERT executemany over all rows.
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    return conn.executemany(_upsert_sql(kind), rows).rowcount
+
+
+def add_batch(conn, kind, path):
+    """
+    add_batch
+    Functionality: Inserts many rows of one kind from a JSONL/CSV file.
+    Inputs: conn (Connection), kind (str) - key of BATCH_KINDS, path (str).
+    Outputs: None (rows are committed by the caller).
+    Data/Control Flow: Streams records, applies the same source defaults as
+                       add-sys/add-llr, and hands them to add_many in
+                       BULK_CHUNK_ROWS chunks, all inside one BEGIN IMMEDIATE.
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    columns = BATCH_KINDS[kind][1]
+
+    def rows():
+        for rec in read_batch_file(path):
+            # Decision Logic: Default source like the single-row subcommands.
+            # Conditions: kind is sys/llr and source is missing.
+            if kind == "sys" and not rec.get("source"):
+                rec["source"] = "User Prompt"
+            elif kind == "llr" and not rec.get("source"):
+                rec["source"] = rec.get("parent_hlr")
+            yield tuple(rec.get(col) for col in columns)
+
+    conn.execute("BEGIN IMMEDIATE")
+    total = 0
+    pending = rows()
+    while True:
+        chunk = list(itertools.islice(pending, BULK_CHUNK_ROWS))
+        if not chunk:
+            break
+        total += add_many(conn, kind, chunk)
+    print(f"[OK] {total} {kind} row(s) added from {path}.")
+
+
+def export_query(db_path, query, filepath):
+    """
+    export_query
+    Functionality: Streams one query's result set to a CSV file.
+    Inputs: db_path (str), query (str), filepath (str).
+    Outputs: int - number of data rows written.
+    Data/Control Flow: Opens its own read-only connection (so exports can run
+                       on worker threads) and writes EXPORT_FETCH_SIZE-row chunks.
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    conn = connect_ro(db_path)
+    try:
+        cursor = conn.execute(query)
+        headers = [desc[0] for desc in cursor.description]
+        row_count = 0
+
+        # Stream the result set in chunks rather than materialising it. CSV
+        # rows are formatted into a StringIO and each chunk is UTF-8 encoded
+        # once and written to the binary file, instead of per-row codec calls.
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(headers)
+        with open(filepath, "wb", buffering=EXPORT_BUFFER_SIZE) as f:
+            while True:
+                chunk = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                writer.writerows(chunk)
+                row_count += len(chunk)
+                f.write(text.getvalue().encode("utf-8"))
+                text.seek(0)
+                text.truncate()
+                if not chunk:
+                    break
+    finally:
+        conn.close()
+    return row_count
+
+
 def export_trace_matrix(conn, output_dir):
     """
     export_trace_matrix
     Functionality: Exports the full trace matrix and individual tables to CSV.
     Inputs: conn (Connection), output_dir (str) - Directory for CSV files.
     Outputs: CSV files written to output_dir.
-    Data/Control Flow: Queries each table/view and writes to CSV.
+    Data/Control Flow: Runs one export_query per table/view in parallel, each on
+                       its own read-only connection to conn's database file
+                       (WAL allows concurrent readers); reports in a fixed order.
     Timestamp: 2025-02-10 08:30 UTC
     """
     os.makedirs(output_dir, exist_ok=True)
+    db_path = next(row[2] for row in conn.execute("PRAGMA database_list") if row[1] == "main")
 
     exports = {
         "TraceMatrix_export.csv": "SELECT * FROM trace_matrix ORDER BY sys_req_id, hlr_id, llr_id",
@@ -185,18 +366,14 @@ def export_trace_matrix(conn, output_dir):
         "SDD_Sections_export.csv": "SELECT * FROM sdd_sections ORDER BY sort_order",
     }
 
-    for filename, query in exports.items():
-        filepath = os.path.join(output_dir, filename)
-        cursor = conn.execute(query)
-        rows = cursor.fetchall()
-        headers = [desc[0] for desc in cursor.description]
-
-        with open(filepath, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            writer.writerows(rows)
-
-        print(f"[OK] Exported {len(rows)} rows to {filepath}")
+    with ThreadPoolExecutor(max_workers=len(exports)) as pool:
+        futures = {
+            os.path.join(output_dir, filename):
+                pool.submit(export_query, db_path, query, os.path.join(output_dir, filename))
+            for filename, query in exports.items()
+        }
+        for filepath, future in futures.items():
+            print(f"[OK] Exported {future.result()} rows to {filepath}")
 
 
 def query_table(conn, table_name):
@@ -205,15 +382,20 @@ def query_table(conn, table_name):
     Functionality: Prints all rows from a specified table or view.
     Inputs: conn (Connection), table_name (str).
     Outputs: Prints formatted rows to stdout.
-    Data/Control Flow: Executes SELECT * and prints results.
+    Data/Control Flow: Executes SELECT * and prints results in
+                       EXPORT_FETCH_SIZE-row batches.
     Timestamp: 2025-02-10 08:30 UTC
     """
     try:
-        cursor = conn.execute(f"SELECT * FROM {table_name}")
-        headers = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-
-        if not rows:
+        headers = [desc[0] for desc in
+                   conn.execute(f"SELECT * FROM {table_name} LIMIT 0").description]
+        # NULLs become '' in SQL, so each row formats with a plain C-level
+        # map(str, row) instead of a per-cell None check.
+        columns = ", ".join('COALESCE("{}", \'\')'.format(h.replace('"', '""')) for h in headers)
+        cursor = conn.execute(f"SELECT {columns} FROM {table_name}")
+        batch = cursor.fetchmany(EXPORT_FETCH_SIZE)
+
+        if not batch:
             print(f"[INFO] {table_name} is empty.")
             return
 
@@ -221,11 +403,14 @@ def query_table(conn, table_name):
         print(" | ".join(headers))
         print("-" * (sum(len(h) for h in headers) + 3 * (len(headers) - 1)))
 
-        # Print rows
-        for row in rows:
-            print(" | ".join(str(v) if v is not None else "" for v in row))
+        # Print rows, one stdout write per fetched batch
+        total = 0
+        while batch:
+            total += len(batch)
+            sys.stdout.write("".join(" | ".join(map(str, row)) + "\n" for row in batch))
+            batch = cursor.fetchmany(EXPORT_FETCH_SIZE)
 
-        print(f"\n({len(rows)} rows)")
+        print(f"\n({total} rows)")
     except sqlite3.OperationalError as e:
         print(f"[ERROR] {e}")
 
@@ -315,6 +500,11 @@ def main():
     p_sdd.add_argument("--content", required=True, help="Full markdown content (use {{TABLE.ID.FIELD}} for refs)")
     p_sdd.add_argument("--sort-order", required=True, type=int, help="Display ordering integer")
 
+    # --- add-batch ---
+    p_batch = subparsers.add_parser("add-batch", help="Add many rows from a JSONL or CSV file")
+    p_batch.add_argument("kind", choices=list(BATCH_KINDS), help="Kind of row in the file")
+    p_batch.add_argument("file", help="JSONL file, or .csv with a header row of column names")
+
     args = parser.parse_args()
 
     # Decision Logic: Route to appropriate function based on subcommand.
@@ -323,28 +513,40 @@ def main():
         parser.print_help()
         sys.exit(0)
 
-    conn = connect(args.db_path)
-
-    if args.command == "add-sys":
-        add_system_req(conn, args.id, args.text, args.source)
-    elif args.command == "add-hlr":
-        add_hlr(conn, args.id, args.text, args.source, args.parent_sys, args.allocated_to)
-    elif args.command == "add-llr":
-        add_llr(conn, args.id, args.text, args.parent_hlr, args.source, args.logic_type, args.trace_to_code)
-    elif args.command == "add-arch":
-        add_arch_decision(conn, args.id, args.description, args.rationale, args.parent_hlr, args.category)
-    elif args.command == "export":
-        export_trace_matrix(conn, args.output_dir)
-    elif args.command == "query":
-        query_table(conn, args.table)
-    elif args.command == "add-hlr-tc":
-        add_hlr_test_case(conn, args.id, args.parent_hlr, args.test_type,
-                          args.description, args.procedure, args.input_data,
-                          args.expected, args.pass_criteria)
-    elif args.command == "add-sdd-section":
-        add_sdd_section(conn, args.id, args.section_number, args.title,
-                        args.content, args.sort_order)
-
+    if args.command in READ_ONLY_COMMANDS:
+        conn = connect_ro(args.db_path)
+    else:
+        conn = connect(args.db_path)
+
+    # Each subcommand runs in one transaction: committed on success,
+    # rolled back if it raises.
+    with conn:
+        if args.command == "add-sys":
+            add_system_req(conn, args.id, args.text, args.source)
+        elif args.command == "add-hlr":
+            add_hlr(conn, args.id, args.text, args.source, args.parent_sys, args.allocated_to)
+        elif args.command == "add-llr":
+            add_llr(conn, args.id, args.text, args.parent_hlr, args.source, args.logic_type, args.trace_to_code)
+        elif args.command == "add-arch":
+            add_arch_decision(conn, args.id, args.description, args.rationale, args.parent_hlr, args.category)
+        elif args.command == "export":
+            export_trace_matrix(conn, args.output_dir)
+        elif args.command == "query":
+            query_table(conn, args.table)
+        elif args.command == "add-hlr-tc":
+            add_hlr_test_case(conn, args.id, args.parent_hlr, args.test_type,
+                              args.description, args.procedure, args.input_data,
+                              args.expected, args.pass_criteria)
+        elif args.command == "add-sdd-section":
+            add_sdd_section(conn, args.id, args.section_number, args.title,
+                            args.content, args.sort_order)
+        elif args.command == "add-batch":
+            add_batch(conn, args.kind, args.file)
+
+    # Decision Logic: Refresh planner statistics before closing a write connection.
+    # Conditions: command not in READ_ONLY_COMMANDS (query_only cannot ANALYZE).
+    if args.command not in READ_ONLY_COMMANDS:
+        conn.execute("PRAGMA optimize")
     conn.close()
 
 
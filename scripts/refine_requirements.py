@@ -9,16 +9,20 @@ Systematically improves the quality of HLRs and LLRs by:
 4. Improving pseudocode detail in LLRs.
 """
 
+import functools
 import sqlite3
 import re
 import os
 import argparse
+from collections import defaultdict
 
 DB_PATH = r"C:\Users\cruic\KCGCS\docs\artefacts\traceability.db"
 
 # Patterns to remove
 FILE_EXTS = re.compile(r'\.(js|go|py|rs|ts|tsx|jsx|css|html|md|pb\.go|pb|proto)', re.I)
-FILE_PATHS = re.compile(r'(\w+/)+\w+\.\w+', re.I)
+# Linear without possessive quantifiers (3.11+ only): the segment class cannot
+# match '/' or '.', so there is never more than one way to split a path.
+FILE_PATHS = re.compile(r'(?:[A-Za-z0-9_]+/)+[A-Za-z0-9_]+\.[A-Za-z0-9_]+', re.I)
 
 QUANT_KEYWORDS = ['accuracy', 'tolerance', 'latency', 'within', 'less than',
                    'greater than', 'maximum', 'minimum', 'ms', 'seconds',
@@ -37,39 +41,84 @@ DISTANCE_KEYWORDS = ['distance', 'range', 'radius', 'offset', 'buffer', 'altitud
 RATIO_KEYWORDS = ['threshold', 'limit', 'max', 'min', 'ceiling', 'floor', 'cap']
 
 
+def _keyword_re(keywords):
+    """One case-insensitive alternation matching any keyword as a substring."""
+    return re.compile('|'.join(map(re.escape, keywords)), re.I)
+
+
+QUANT_RE = _keyword_re(QUANT_KEYWORDS)
+TIMING_RE = _keyword_re(TIMING_KEYWORDS)
+DISTANCE_RE = _keyword_re(DISTANCE_KEYWORDS)
+# Joins LLR texts for a single scan; unlike '\x1e' it is not matched by \s.
+LLR_SCAN_SEP = '\0'
+
+# Large --apply passes drop indexes that cover the rewritten columns and
+# rebuild them once afterwards, instead of maintaining them per row.
+INDEX_REBUILD_MIN_ROWS = 5000
+REWRITTEN_COLUMNS = {'text', 'updated_at'}
+REWRITTEN_COLUMNS_RE = re.compile(r'\b(text|updated_at)\b', re.I)
+
+# Generic subjects rewritten to "the software shall"
+GENERIC_PREFIX_RE = re.compile(r'^(the system|it|the module|the component)\s+shall', re.I)
+
+# Refinement runs set-based inside SQLite: each statement scans its table once
+# and calls back into the registered Python functions per row, returning only
+# the rows whose text changes. Child LLR texts are concatenated per HLR in
+# rowid (child) order, separated by the ASCII record separator.
+LLR_TEXT_SEP = '\x1e'
+REFINED_HLRS_SQL = """
+    SELECT id, old_text, new_text FROM (
+        SELECT h.id, h.text AS old_text,
+               refine_hlr(h.id, h.text,
+                          (SELECT group_concat(text, char(30)) FROM (
+                               SELECT text FROM low_level_requirements
+                               WHERE parent_hlr = h.id ORDER BY rowid))) AS new_text
+        FROM high_level_requirements h
+    )
+    WHERE new_text IS NOT old_text
+"""
+REFINED_LLRS_SQL = """
+    SELECT id, new_text FROM (
+        SELECT id, text AS old_text, strip_file_exts(text) AS new_text
+        FROM low_level_requirements ORDER BY rowid
+    )
+    WHERE new_text IS NOT old_text
+"""
+
+
 def infer_quantitative_terms(hlr_id, hlr_text, llr_texts):
     """
     Analyze child LLR texts to infer quantitative qualifiers for the parent HLR.
     Returns a suffix string to append if the HLR lacks quantitative terms.
     """
+    return _infer_quantitative_terms(hlr_text, tuple(llr_texts))
+
+
+@functools.lru_cache(maxsize=4096)
+def _infer_quantitative_terms(hlr_text, llr_texts):
+    """Memoized body of infer_quantitative_terms (hlr_id does not affect it)."""
     # Already has quantitative terms?
-    if any(kw in hlr_text.lower() for kw in QUANT_KEYWORDS):
+    if QUANT_RE.search(hlr_text):
         return None
 
-    # Collect all numerical values from LLRs
-    all_nums = []
-    for ltxt in llr_texts:
-        for m in NUMERICAL_PAT.finditer(ltxt):
-            all_nums.append((float(m.group(1)), m.group(2).lower()))
+    # Scan all LLR texts at once. The separator is neither a digit, \s nor a
+    # word character, so no match can span two texts.
+    joined = LLR_SCAN_SEP.join(llr_texts)
+
+    # Collect all numerical values from LLRs, grouped by normalized unit
+    # ('seconds' -> 'second') in a single pass
+    by_unit = defaultdict(list)
+    for m in NUMERICAL_PAT.finditer(joined):
+        by_unit[m.group(2).lower().rstrip('s')].append(float(m.group(1)))
 
-    if not all_nums:
+    if not by_unit:
         # No numerical data available — check for timing/distance keywords
-        combined = ' '.join(llr_texts).lower()
-        if any(k in combined for k in TIMING_KEYWORDS):
+        if TIMING_RE.search(joined):
             return " Processing shall complete within the required time constraints."
-        elif any(k in combined for k in DISTANCE_KEYWORDS):
+        elif DISTANCE_RE.search(joined):
             return " Distance calculations shall meet accuracy requirements."
         return None
 
-    # Group by unit type
-    by_unit = {}
-    for val, unit in all_nums:
-        # Normalize units
-        norm_unit = unit.rstrip('s')  # 'seconds' -> 'second'
-        if norm_unit not in by_unit:
-            by_unit[norm_unit] = []
-        by_unit[norm_unit].append(val)
-
     # Build quantitative suffix from the most common unit class
     parts = []
     for unit, vals in sorted(by_unit.items(), key=lambda x: -len(x[1])):
@@ -88,16 +137,14 @@ def refine_hlr(hlr_id, text, functions, llr_texts=None):
     """Refine a single HLR."""
     # Remove file extensions
     refined = FILE_EXTS.sub('', text)
-    # Remove paths
-    refined = FILE_PATHS.sub('', refined)
+    # Remove paths (a path needs a '/', so most texts skip this regex pass)
+    if '/' in refined:
+        refined = FILE_PATHS.sub('', refined)
 
     # Ensure "The software shall"
     if not refined.lower().startswith("the software shall"):
         # Strip generic prefixes like "The system shall" or "It shall"
-        refined = re.sub(
-            r'^(the system|it|the module|the component)\s+shall',
-            'the software shall', refined, flags=re.I
-        )
+        refined = GENERIC_PREFIX_RE.sub('the software shall', refined)
         if not refined.lower().startswith("the software shall"):
             refined = "The software shall " + refined[0].lower() + refined[1:]
 
@@ -115,6 +162,33 @@ def refine_hlr(hlr_id, text, functions, llr_texts=None):
 
     return refined
 
+def rewritten_column_indexes(c, table):
+    """
+    Return (name, sql) for the explicit indexes on `table` that include a
+    column the refinement pass rewrites. Expression indexes are matched on
+    their DDL text.
+    """
+    found = []
+    c.execute("SELECT name, sql FROM sqlite_master "
+              "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,))
+    for row in c.fetchall():
+        cols = {r['name'] for r in c.execute(f'PRAGMA index_info("{row["name"]}")')}
+        if cols & REWRITTEN_COLUMNS or (None in cols and REWRITTEN_COLUMNS_RE.search(row['sql'])):
+            found.append((row['name'], row['sql']))
+    return found
+
+
+def _sql_refine_hlr(hlr_id, text, llr_blob):
+    """SQL adapter for refine_hlr: LLR texts arrive joined by LLR_TEXT_SEP."""
+    llr_texts = llr_blob.split(LLR_TEXT_SEP) if llr_blob is not None else []
+    return refine_hlr(hlr_id, text, [], llr_texts=llr_texts)
+
+
+def _sql_strip_file_exts(text):
+    """SQL adapter for the LLR pass: drop file extensions from the text."""
+    return FILE_EXTS.sub('', text)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Refine HLRs/LLRs in the database.')
     parser.add_argument('--db', help='Path to traceability.db')
@@ -123,52 +197,51 @@ def main():
 
     db_to_use = args.db if args.db else DB_PATH
 
-    conn = sqlite3.connect(db_to_use)
+    # Transactions are managed explicitly: with --apply the whole pass runs
+    # under one BEGIN IMMEDIATE ... COMMIT, so all updates share one flush.
+    # The refinement statements are prepared once and reused from the
+    # (enlarged) statement cache.
+    conn = sqlite3.connect(db_to_use, isolation_level=None, cached_statements=512)
+    conn.execute("PRAGMA analysis_limit = 400")
     conn.row_factory = sqlite3.Row
     c = conn.cursor()
+    if args.apply:
+        c.execute("BEGIN IMMEDIATE")
+    hlr_updates = []
+    llr_updates = []
 
     print("=== Phase 3: Requirement Refinement ===")
-    
+    conn.create_function("refine_hlr", 3, _sql_refine_hlr, deterministic=True)
+    conn.create_function("strip_file_exts", 1, _sql_strip_file_exts, deterministic=True)
+
     # 1. Refine HLRs
-    c.execute("SELECT id, text FROM high_level_requirements")
-    hlrs = c.fetchall()
-    
-    for row in hlrs:
-        hid = row['id']
-        old_text = row['text']
-        
-        # Get functions associated via source_inventory
-        c.execute("SELECT function_name FROM source_inventory WHERE parent_hlr = ?", (hid,))
-        funcs = [r[0] for r in c.fetchall()]
-        
-        # Get child LLR texts for quantitative inference
-        c.execute("SELECT text FROM low_level_requirements WHERE parent_hlr = ?", (hid,))
-        llr_texts = [r[0] for r in c.fetchall()]
-
-        new_text = refine_hlr(hid, old_text, funcs, llr_texts=llr_texts)
-        
-        if old_text != new_text:
-            print(f"\n[{hid}]")
-            print(f"  OLD: {old_text}")
-            print(f"  NEW: {new_text}")
-            
-            if args.apply:
-                c.execute("UPDATE high_level_requirements SET text = ?, updated_at = datetime('now') WHERE id = ?", (new_text, hid))
+    for row in c.execute(REFINED_HLRS_SQL):
+        print(f"\n[{row['id']}]")
+        print(f"  OLD: {row['old_text']}")
+        print(f"  NEW: {row['new_text']}")
+        hlr_updates.append((row['new_text'], row['id']))
 
     # 2. Refine LLRs (ensure they aren't just summaries)
-    c.execute("SELECT id, text, parent_hlr FROM low_level_requirements")
-    llrs = c.fetchall()
-    for row in llrs:
-        lid = row['id']
-        txt = row['text']
-        new_txt = FILE_EXTS.sub('', txt)
-        if txt != new_txt:
-            print(f"  LLR Refined: {lid}")
-            if args.apply:
-                c.execute("UPDATE low_level_requirements SET text = ?, updated_at = datetime('now') WHERE id = ?", (new_txt, lid))
+    for row in c.execute(REFINED_LLRS_SQL):
+        print(f"  LLR Refined: {row['id']}")
+        llr_updates.append((row['new_text'], row['id']))
 
     if args.apply:
-        conn.commit()
+        # Decision Logic: Defer index maintenance only for large passes.
+        # Conditions: total updated rows >= INDEX_REBUILD_MIN_ROWS.
+        deferred = []
+        if len(hlr_updates) + len(llr_updates) >= INDEX_REBUILD_MIN_ROWS:
+            for table in ('high_level_requirements', 'low_level_requirements'):
+                deferred += rewritten_column_indexes(c, table)
+            for name, _ in deferred:
+                c.execute(f'DROP INDEX "{name}"')
+        c.executemany("UPDATE high_level_requirements SET text = ?, updated_at = datetime('now') WHERE id = ?", hlr_updates)
+        c.executemany("UPDATE low_level_requirements SET text = ?, updated_at = datetime('now') WHERE id = ?", llr_updates)
+        for _, sql in deferred:
+            c.execute(sql)
+        c.execute("COMMIT")
+        # Let SQLite refresh planner statistics for the tables just rewritten.
+        c.execute("PRAGMA optimize")
         print("\nDatabase updated successfully.")
     else:
         print("\nDry run complete. Use --apply to save changes.")
@@ -11,8 +11,10 @@ Timestamp: 2025-02-10 21:45 UTC
 
 import sqlite3
 import argparse
+import functools
 import re
 import os
+import pathlib
 import sys
 
 # Mapping of placeholder table names to actual DB table names
@@ -24,6 +26,39 @@ TABLE_MAP = {
     "ARCH": "architecture_decisions",
 }
 
+# One fixed statement text per table, so each is prepared once and then
+# served from the connection's statement cache.
+FIELD_SELECT_SQL = {key: f"SELECT * FROM {table} WHERE id = ?" for key, table in TABLE_MAP.items()}
+
+# Rendering only reads, so the connection is opened mode=ro and tuned for reads.
+CONNECTION_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",    # 256 MiB memory-mapped reads
+    "PRAGMA cache_size = -131072",     # 128 MiB page cache
+)
+
+# {{TABLE.ID.FIELD}} references (scanned on their own by prefetch_field_refs)
+FIELD_RE = re.compile(r'\{\{(\w+)\.(\w+)\.(\w+)\}\}')
+
+# All placeholder kinds in one alternation: {{TABLE.ID.FIELD}}, {{LIST_LLRS:HLR_ID}},
+# {{LIST_HTCS:HLR_ID}} and {{TRACE_MATRIX}}. match.lastgroup names the kind.
+PLACEHOLDER_RE = re.compile(
+    r'\{\{(?:(?P<tbl>\w+)\.(?P<id>\w+)\.(?P<fld>\w+)'
+    r'|LIST_LLRS:(?P<llr>\w+)|LIST_HTCS:(?P<htc>\w+)|(?P<tm>TRACE_MATRIX))\}\}'
+)
+# Resolution order of the kinds (the order of the former separate passes)
+PLACEHOLDER_STAGES = {"fld": 0, "llr": 1, "htc": 2, "tm": 3}
+# A '{{' opened again before the previous one closes: a placeholder built
+# from an inner expansion, e.g. {{LIST_LLRS:{{HLR.HLR_001.id}}}}
+NESTED_PLACEHOLDER_RE = re.compile(r'\{\{[^{}]*\{\{')
+
+# Output buffer for the streamed SDD.md write (1 MiB).
+SDD_WRITE_BUFFER = 1 << 20
+
+# Record IDs bound per IN (...) query when prefetching field references.
+PREFETCH_CHUNK_SIZE = 500
+
 
 def get_db_connection(db_path):
     """
@@ -31,7 +66,8 @@ def get_db_connection(db_path):
     Functionality: Opens a read-only connection to the traceability database.
     Inputs: db_path (str) - Path to the SQLite database.
     Outputs: sqlite3.Connection with row_factory set.
-    Data/Control Flow: Checks file existence, connects, returns connection.
+    Data/Control Flow: Checks file existence, connects through a mode=ro URI, applies
+                       CONNECTION_PRAGMAS, returns connection.
     Timestamp: 2025-02-10 21:45 UTC
     """
     # Decision Logic: Check if DB file exists.
@@ -39,7 +75,10 @@ def get_db_connection(db_path):
     if not os.path.exists(db_path):
         print(f"[ERROR] Database not found: {db_path}")
         sys.exit(1)
-    conn = sqlite3.connect(db_path)
+    uri = pathlib.Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -58,15 +97,23 @@ def resolve_field_ref(conn, table_key, record_id, field_name):
     if table_key not in TABLE_MAP:
         return f"[UNRESOLVED: unknown table '{table_key}']"
 
-    real_table = TABLE_MAP[table_key]
-
     try:
-        row = conn.execute(
-            f"SELECT * FROM {real_table} WHERE id = ?", (record_id,)
-        ).fetchone()
+        row = conn.execute(FIELD_SELECT_SQL[table_key], (record_id,)).fetchone()
     except sqlite3.OperationalError as e:
         return f"[UNRESOLVED: DB error '{e}']"
 
+    return format_field_value(table_key, record_id, row, field_name)
+
+
+def format_field_value(table_key, record_id, row, field_name):
+    """
+    format_field_value
+    Functionality: Formats one field of a fetched record for a {{TABLE.ID.FIELD}} reference.
+    Inputs: table_key (str), record_id (str), row (sqlite3.Row, dict or None), field_name (str).
+    Outputs: Resolved string value, or an error marker if the record or field is missing.
+    Data/Control Flow: Shared by resolve_field_ref and the prefetched lookup path.
+    Timestamp: 2026-10-14 09:00 UTC
+    """
     # Decision Logic: Check if record was found.
     # Conditions: row is not None.
     if row is None:
@@ -86,13 +133,52 @@ def resolve_field_ref(conn, table_key, record_id, field_name):
     return str(value)
 
 
+def prefetch_field_refs(conn, content):
+    """
+    prefetch_field_refs
+    Functionality: Fetches every record referenced by {{TABLE.ID.FIELD}} placeholders up front.
+    Inputs: conn (Connection), content (str) - markdown with placeholders.
+    Outputs: dict mapping (table_key, record_id) to a row dict, or None if the record is absent.
+    Data/Control Flow: Groups referenced IDs by table and issues one IN (...) query per table
+                       (chunked by PREFETCH_CHUNK_SIZE) instead of one query per placeholder.
+                       Unknown tables and tables that fail to query are left out of the cache,
+                       so resolve_field_ref reports them as before.
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    ids_by_table = {}
+    for table_key, record_id, _ in FIELD_RE.findall(content):
+        if table_key in TABLE_MAP:
+            ids_by_table.setdefault(table_key, {})[record_id] = None
+
+    cache = {}
+    for table_key, ids in ids_by_table.items():
+        ids = list(ids)
+        found = {}
+        try:
+            for start in range(0, len(ids), PREFETCH_CHUNK_SIZE):
+                chunk = ids[start:start + PREFETCH_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT * FROM {TABLE_MAP[table_key]} WHERE id IN ({placeholders})", chunk
+                ):
+                    found[row["id"]] = dict(row)
+        except sqlite3.OperationalError:
+            continue
+        for record_id in ids:
+            cache[(table_key, record_id)] = found.get(record_id)
+
+    return cache
+
+
+@functools.lru_cache(maxsize=None)
 def resolve_list_llrs(conn, hlr_id):
     """
     resolve_list_llrs
     Functionality: Generates a bullet list of all LLRs under a given HLR.
     Inputs: conn (Connection), hlr_id (str).
     Outputs: Markdown bullet list string.
-    Data/Control Flow: Queries low_level_requirements filtered by parent_hlr.
+    Data/Control Flow: Queries low_level_requirements filtered by parent_hlr. Memoized per
+                       (conn, hlr_id); render_sdd clears the cache around each render.
     Timestamp: 2025-02-10 21:45 UTC
     """
     rows = conn.execute(
@@ -113,13 +199,15 @@ def resolve_list_llrs(conn, hlr_id):
     return "\n".join(lines)
 
 
+@functools.lru_cache(maxsize=None)
 def resolve_list_htcs(conn, hlr_id):
     """
     resolve_list_htcs
     Functionality: Generates a bullet list of all test cases under a given HLR.
     Inputs: conn (Connection), hlr_id (str).
     Outputs: Markdown bullet list string.
-    Data/Control Flow: Queries hlr_test_cases filtered by parent_hlr.
+    Data/Control Flow: Queries hlr_test_cases filtered by parent_hlr. Memoized per
+                       (conn, hlr_id); render_sdd clears the cache around each render.
     Timestamp: 2025-02-10 21:45 UTC
     """
     rows = conn.execute(
@@ -140,28 +228,37 @@ def resolve_list_htcs(conn, hlr_id):
     return "\n".join(lines)
 
 
+@functools.lru_cache(maxsize=None)
 def resolve_trace_matrix(conn):
     """
     resolve_trace_matrix
     Functionality: Generates a full trace matrix as a markdown table.
     Inputs: conn (Connection).
     Outputs: Markdown table string.
-    Data/Control Flow: Queries trace_matrix view and formats as markdown table.
+    Data/Control Flow: Queries trace_matrix view and formats as markdown table. Memoized
+                       per conn; render_sdd clears the cache around each render.
     Timestamp: 2025-02-10 21:45 UTC
     """
-    rows = conn.execute("SELECT * FROM trace_matrix ORDER BY sys_req_id, hlr_id, llr_id").fetchall()
+    # Rows are streamed from the cursor as plain tuples; headers come from
+    # the cursor description.
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute("SELECT * FROM trace_matrix ORDER BY sys_req_id, hlr_id, llr_id")
+    first = next(cur, None)
 
     # Decision Logic: Check if trace matrix has any rows.
-    # Conditions: len(rows) > 0.
-    if not rows:
+    # Conditions: the cursor yields at least one row.
+    if first is None:
         return "*(Trace matrix is empty)*"
 
-    headers = rows[0].keys()
+    def _cell(value):
+        return "" if value is None else str(value)
+
+    headers = [d[0] for d in cur.description]
     lines = ["| " + " | ".join(headers) + " |"]
     lines.append("| " + " | ".join(["---"] * len(headers)) + " |")
-
-    for r in rows:
-        lines.append("| " + " | ".join(str(r[h]) if r[h] is not None else "" for h in headers) + " |")
+    lines.append("| " + " | ".join(map(_cell, first)) + " |")
+    lines.extend("| " + " | ".join(map(_cell, r)) + " |" for r in cur)
 
     return "\n".join(lines)
 
@@ -172,57 +269,69 @@ def resolve_all_references(conn, content):
     Functionality: Scans markdown content for all {{...}} placeholders and resolves them.
     Inputs: conn (Connection), content (str) - markdown with placeholders.
     Outputs: Fully resolved markdown string.
-    Data/Control Flow: Uses regex to find placeholders, dispatches to appropriate resolver.
+    Data/Control Flow: One PLACEHOLDER_RE pass dispatches each placeholder to its resolver.
+                       Placeholder kinds keep their original pass order (field, LLR list,
+                       HTC list, trace matrix): text a resolver returns is only searched
+                       for the kinds that used to be resolved after it. Content with
+                       nested placeholders is resolved one kind per pass instead.
     Timestamp: 2025-02-10 21:45 UTC
     """
-    # Resolve {{TABLE.ID.FIELD}} references
-    # Decision Logic: Find all {{X.Y.Z}} patterns.
-    # Conditions: Pattern matches 3-part dot-separated reference.
-    def replace_field_ref(match):
-        table_key = match.group(1)
-        record_id = match.group(2)
-        field_name = match.group(3)
-        return resolve_field_ref(conn, table_key, record_id, field_name)
-
-    content = re.sub(
-        r'\{\{(\w+)\.(\w+)\.(\w+)\}\}',
-        replace_field_ref,
-        content
-    )
-
-    # Resolve {{LIST_LLRS:HLR_ID}} references
-    # Decision Logic: Find all LIST_LLRS patterns.
-    # Conditions: Pattern matches LIST_LLRS:<id> format.
-    def replace_list_llrs(match):
-        hlr_id = match.group(1)
-        return resolve_list_llrs(conn, hlr_id)
-
-    content = re.sub(
-        r'\{\{LIST_LLRS:(\w+)\}\}',
-        replace_list_llrs,
-        content
-    )
-
-    # Resolve {{LIST_HTCS:HLR_ID}} references
-    # Decision Logic: Find all LIST_HTCS patterns.
-    # Conditions: Pattern matches LIST_HTCS:<id> format.
-    def replace_list_htcs(match):
-        hlr_id = match.group(1)
-        return resolve_list_htcs(conn, hlr_id)
-
-    content = re.sub(
-        r'\{\{LIST_HTCS:(\w+)\}\}',
-        replace_list_htcs,
-        content
-    )
-
-    # Resolve {{TRACE_MATRIX}} reference
-    # Decision Logic: Find TRACE_MATRIX placeholder.
-    # Conditions: Exact match of {{TRACE_MATRIX}}.
-    if "{{TRACE_MATRIX}}" in content:
-        content = content.replace("{{TRACE_MATRIX}}", resolve_trace_matrix(conn))
-
-    return content
+    field_cache = prefetch_field_refs(conn, content)
+
+    def resolve(text, after, only=None):
+        def dispatch(match):
+            kind = match.lastgroup
+            stage = PLACEHOLDER_STAGES[kind]
+            # Decision Logic: Leave kinds resolved by an earlier pass untouched.
+            # Conditions: stage <= after (only inside resolver output), or the
+            # pass is limited to another kind.
+            if stage <= after or (only is not None and stage != only):
+                return match.group(0)
+
+            if kind == "fld":
+                # Resolve {{TABLE.ID.FIELD}} references
+                # Decision Logic: Serve prefetched records from the cache.
+                # Conditions: (table_key, record_id) was prefetched; otherwise query directly.
+                table_key, record_id, field_name = match.group("tbl", "id", "fld")
+                key = (table_key, record_id)
+                if key in field_cache:
+                    resolved = format_field_value(table_key, record_id, field_cache[key], field_name)
+                else:
+                    resolved = resolve_field_ref(conn, table_key, record_id, field_name)
+            elif kind == "llr":
+                # Resolve {{LIST_LLRS:HLR_ID}} references
+                resolved = resolve_list_llrs(conn, match.group("llr"))
+            elif kind == "htc":
+                # Resolve {{LIST_HTCS:HLR_ID}} references
+                resolved = resolve_list_htcs(conn, match.group("htc"))
+            else:
+                # Resolve {{TRACE_MATRIX}} reference
+                return resolve_trace_matrix(conn)
+
+            # Decision Logic: Later kinds inside resolved text are still expanded.
+            # Conditions: resolved text contains a '{{' (single-pass mode only;
+            # per-kind passes rescan the whole text anyway).
+            if only is None and "{{" in resolved:
+                resolved = resolve(resolved, stage)
+            return resolved
+
+        return PLACEHOLDER_RE.sub(dispatch, text)
+
+    # Decision Logic: An inner expansion can complete an outer placeholder,
+    # which only a later rescan of the whole text sees.
+    # Conditions: NESTED_PLACEHOLDER_RE matches; run one pass per kind in order.
+    if NESTED_PLACEHOLDER_RE.search(content):
+        for stage in sorted(PLACEHOLDER_STAGES.values()):
+            content = resolve(content, -1, only=stage)
+        return content
+    return resolve(content, -1)
+
+
+def clear_resolver_caches():
+    """Drop the memoized list/trace-matrix renderings (and their connection refs)."""
+    resolve_list_llrs.cache_clear()
+    resolve_list_htcs.cache_clear()
+    resolve_trace_matrix.cache_clear()
 
 
 def render_sdd(db_path, output_path):
@@ -231,10 +340,11 @@ def render_sdd(db_path, output_path):
     Functionality: Reads all SDD sections from DB, resolves references, writes SDD.md.
     Inputs: db_path (str), output_path (str).
     Outputs: Rendered SDD.md file on disk.
-    Data/Control Flow: Query → Resolve → Write.
+    Data/Control Flow: Query → Resolve and write each section in turn.
     Timestamp: 2025-02-10 21:45 UTC
     """
     conn = get_db_connection(db_path)
+    clear_resolver_caches()
 
     sections = conn.execute(
         "SELECT section_number, title, content FROM sdd_sections ORDER BY sort_order"
@@ -247,15 +357,6 @@ def render_sdd(db_path, output_path):
         conn.close()
         return
 
-    output_lines = []
-
-    for sec in sections:
-        resolved_content = resolve_all_references(conn, sec['content'])
-        output_lines.append(resolved_content)
-        output_lines.append("")  # blank line between sections
-
-    conn.close()
-
     # Write output
     # Decision Logic: Ensure output directory exists.
     # Conditions: os.path.dirname(output_path) is non-empty.
@@ -263,8 +364,30 @@ def render_sdd(db_path, output_path):
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(output_lines))
+    # Each section is written as soon as it is resolved, separated by a
+    # blank line, so only one resolved section is held in memory at a time.
+    # The sections go to a temporary file that replaces output_path only
+    # once rendering succeeds, so a failure never leaves a truncated SDD.md.
+    tmp_path = output_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=SDD_WRITE_BUFFER) as f:
+            for i, sec in enumerate(sections):
+                if i:
+                    f.write("\n")  # blank line between sections
+                f.write(resolve_all_references(conn, sec['content']))
+                f.write("\n")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        # Decision Logic: Discard the partial render; keep the previous SDD.md.
+        # Conditions: resolving or writing raised (including KeyboardInterrupt).
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn.close()
+        raise
+
+    conn.close()
+    # The memoized resolvers hold a reference to conn; release it.
+    clear_resolver_caches()
 
     print(f"[OK] SDD rendered to {output_path} ({len(sections)} sections)")
 
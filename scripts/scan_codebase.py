@@ -20,10 +20,15 @@ Timestamp: 2026-02-11 07:36 UTC
 """
 
 import argparse
+import hashlib
+import itertools
+import json
+import operator
 import os
 import re
 import sqlite3
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # ============================================================
 # Language-specific function extraction patterns
@@ -78,17 +83,84 @@ RUST_PATTERNS = [
     re.compile(r'^\s*(?:pub(?:\(crate\))?\s+)?(?:struct|enum|trait)\s+(\w+)', re.MULTILINE),
 ]
 
-# File extension to pattern mapping
+
+def _combine_patterns(lang_key, patterns):
+    """
+    Fuse one language's ^-anchored patterns into a single named alternation.
+
+    Alternation order keeps the original first-pattern-wins priority per line.
+    Whitespace and the negated classes used above are narrowed to exclude
+    '\\n', so a finditer() over the whole file hits exactly the lines on which
+    one of the patterns would match that line alone, with the same capture.
+    """
+    alternatives = []
+    for i, pattern in enumerate(patterns):
+        src = (pattern.pattern
+               .replace(r'\s', r'[^\S\n]')
+               .replace('[^)]', '[^)\\n]')
+               .replace('[^>]', '[^>\\n]'))
+        alternatives.append(f'(?P<{lang_key}_{i}>{src})')
+    return re.compile('|'.join(alternatives), re.MULTILINE)
+
+
+JS_COMBINED = _combine_patterns('js', JS_PATTERNS)
+GO_COMBINED = _combine_patterns('go', GO_PATTERNS)
+PY_COMBINED = _combine_patterns('py', PY_PATTERNS)
+RUST_COMBINED = _combine_patterns('rust', RUST_PATTERNS)
+
+# File extension to (combined pattern, filter JS keywords from names)
 LANG_MAP = {
-    '.js': JS_PATTERNS,
-    '.jsx': JS_PATTERNS,
-    '.ts': JS_PATTERNS,
-    '.tsx': JS_PATTERNS,
-    '.go': GO_PATTERNS,
-    '.py': PY_PATTERNS,
-    '.rs': RUST_PATTERNS,
+    '.js': (JS_COMBINED, True),
+    '.jsx': (JS_COMBINED, True),
+    '.ts': (JS_COMBINED, True),
+    '.tsx': (JS_COMBINED, True),
+    '.go': (GO_COMBINED, False),
+    '.py': (PY_COMBINED, False),
+    '.rs': (RUST_COMBINED, False),
 }
 
+# Literals every match of the language's patterns must contain (the JS method
+# pattern only guarantees a '{'). A file with none of them cannot define
+# anything, so its regex scan is skipped. Checked on the raw bytes: ASCII
+# survives the lenient UTF-8 decode unchanged.
+LANG_PREFILTER = {
+    '.js': (b'function', b'=>', b'{', b'class'),
+    '.go': (b'func', b'type'),
+    '.py': (b'def', b'class'),
+    '.rs': (b'fn', b'impl', b'struct', b'enum', b'trait'),
+}
+for _ext in ('.jsx', '.ts', '.tsx'):
+    LANG_PREFILTER[_ext] = LANG_PREFILTER['.js']
+
+# Write-connection tuning for populate_inventory
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+)
+
+# Per-file scan results are cached in scan_cache, keyed by a hash of the
+# extension and raw file bytes. Bump SCAN_CACHE_VERSION whenever extraction
+# output changes, so stale entries stop matching.
+SCAN_CACHE_VERSION = b'1'
+UPSERT_SCAN_CACHE_SQL = "INSERT OR REPLACE INTO scan_cache (hash, records) VALUES (?, ?)"
+# Entries whose hash no file produced in the current scan are dropped, so
+# the cache tracks the tree instead of every file version ever scanned.
+CREATE_SEEN_HASH_SQL = "CREATE TEMP TABLE seen_hash (hash TEXT PRIMARY KEY) WITHOUT ROWID"
+PRUNE_SCAN_CACHE_SQL = "DELETE FROM scan_cache WHERE hash NOT IN (SELECT hash FROM seen_hash)"
+
+# Existing rows only get fresh line info; has_llr/parent_hlr are left alone.
+# id is the table's PRIMARY KEY, so each conflict check is one index probe
+# inside the statement; existing ids need no separate SELECT or preload.
+UPSERT_INVENTORY_SQL = """
+    INSERT INTO source_inventory (id, file_path, function_name, start_line, end_line, line_count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        start_line = excluded.start_line,
+        end_line = excluded.end_line,
+        line_count = excluded.line_count,
+        scanned_at = datetime('now')
+"""
+
 # Directories to always skip
 SKIP_DIRS = {
     'node_modules', '.git', '__pycache__', 'dist', 'build',
@@ -96,43 +168,77 @@ SKIP_DIRS = {
 }
 
 
-def find_functions(content, patterns, lang_ext='.js'):
+def find_functions(content, pattern, keyword_filter=False):
     """
     Find all function/class definitions in source content.
 
-    Functionality: Scans content line-by-line for pattern matches
-    Inputs: content (str) - file content, patterns (list) - regex patterns, lang_ext (str)
+    Functionality: Scans the whole content once with a language's combined pattern
+    Inputs: content (str) - file content, pattern (re.Pattern) - from LANG_MAP,
+            keyword_filter (bool) - drop JS/TS keywords matched as names
     Outputs: list of dicts with 'name' and 'line' keys
     Timestamp: 2026-02-11 07:36 UTC
     """
     results = []
-    seen = set()
-    lines = content.split('\n')
-    is_js = lang_ext in ('.js', '.jsx', '.ts', '.tsx')
-
-    for i, line in enumerate(lines, 1):
-        for pattern in patterns:
-            match = pattern.match(line)
-            if match:
-                name = match.group(1)
-                # Filter out JS/TS keywords misidentified as method names
-                if is_js and name in JS_KEYWORDS:
-                    break
-                key = f"{name}:{i}"
-                if key not in seen:
-                    seen.add(key)
-                    results.append({'name': name, 'line': i})
-                break
+    line = 1
+    prev = 0
+    for match in pattern.finditer(content):
+        pos = match.start()
+        line += content.count('\n', prev, pos)
+        prev = pos
+        # Each alternative wraps one pattern; its name capture follows it
+        name = match.group(pattern.groupindex[match.lastgroup] + 1)
+        # Filter out JS/TS keywords misidentified as method names
+        if keyword_filter and name in JS_KEYWORDS:
+            continue
+        results.append({'name': name, 'line': line})
 
     return results
 
 
-def estimate_end_line(content_lines, start_line, lang_ext):
+def brace_index(content_lines):
+    """
+    Precompute per-file brace data so each end-line lookup skips the line rescan.
+
+    Functionality: One pass over the lines building, for line index i,
+                   depth[i] (net '{' minus '}' before line i, 0..n),
+                   next_open[i] (first line >= i containing '{', or n) and
+                   next_le[i] (first j > i with depth[j] <= depth[i], or n + 1)
+    Inputs: content_lines (list)
+    Outputs: (depth, next_open, next_le) tuple of lists
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    total = len(content_lines)
+    # Brace counts per line via map(str.count, ...) and a running sum via
+    # accumulate, so the per-line work stays in C
+    opens = list(map(str.count, content_lines, itertools.repeat('{')))
+    closes = map(str.count, content_lines, itertools.repeat('}'))
+    depth = list(itertools.accumulate(map(operator.sub, opens, closes), initial=0))
+
+    next_open = [total] * (total + 1)
+    nxt = total
+    for i in range(total - 1, -1, -1):
+        if opens[i]:
+            nxt = i
+        next_open[i] = nxt
+
+    # Next smaller-or-equal depth, via a monotonic stack
+    next_le = [total + 1] * (total + 1)
+    stack = []
+    for j, dj in enumerate(depth):
+        while stack and depth[stack[-1]] >= dj:
+            next_le[stack.pop()] = j
+        stack.append(j)
+
+    return depth, next_open, next_le
+
+
+def estimate_end_line(content_lines, start_line, lang_ext, braces=None):
     """
     Estimate the end line of a function using brace/indent matching.
 
     Functionality: Heuristic end-line detection for functions
-    Inputs: content_lines (list), start_line (int, 1-indexed), lang_ext (str)
+    Inputs: content_lines (list), start_line (int, 1-indexed), lang_ext (str),
+            braces (tuple) - brace_index(content_lines), reused across a file's functions
     Outputs: end_line (int, 1-indexed)
     Timestamp: 2026-02-11 07:36 UTC
     """
@@ -162,48 +268,83 @@ def estimate_end_line(content_lines, start_line, lang_ext):
         return end_idx  # 1-indexed (end_idx is already 0-indexed + 1 past end)
 
     else:
-        # JS/TS/Go: use brace counting
-        brace_count = 0
-        started = False
-        end_idx = start_idx
+        # JS/TS/Go: use brace counting. The block ends on the first line, from
+        # the first line with a '{' on, where the running count drops to <= 0,
+        # i.e. the first j > that line with depth[j] <= depth[start]. Jumping
+        # along next_le never skips it: depths in between are higher.
+        if braces is None:
+            braces = brace_index(content_lines)
+        depth, next_open, next_le = braces
+        if start_idx >= total or next_open[start_idx] == total:
+            return total  # If no opening brace found, assume end of file
+
+        base = depth[start_idx]
+        j = next_open[start_idx] + 1
+        while j <= total and depth[j] > base:
+            j = next_le[j]
+        if j > total:
+            return total  # If no closing brace found, assume end of file
+        return j  # 1-indexed (line j - 1 closes the block)
+
+
+def read_source(file_path, rel_path):
+    """
+    Read a source file's raw bytes.
 
-        while end_idx < total:
-            line = content_lines[end_idx]
-            brace_count += line.count('{') - line.count('}')
-            if '{' in line:
-                started = True
-            if started and brace_count <= 0:
-                return end_idx + 1  # 1-indexed
-            end_idx += 1
+    Functionality: Binary read; reports unreadable files
+    Inputs: file_path (str), rel_path (str) - used in the warning
+    Outputs: bytes, or None if the file cannot be read
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except Exception as e:
+        print(f"  WARN: Cannot read {rel_path}: {e}")
+        return None
 
-        return total  # If no closing brace found, assume end of file
 
+def inventory_record(normalized_path, name, start, end):
+    """Build one source_inventory record dict."""
+    return {
+        'id': f"{normalized_path}::{name}:L{start}",
+        'file_path': normalized_path,
+        'function_name': name,
+        'start_line': start,
+        'end_line': end,
+        'line_count': end - start + 1,
+    }
 
-def scan_file(file_path, rel_path, lang_ext):
+
+def scan_content(data, rel_path, lang_ext):
     """
-    Scan a single source file for function definitions.
+    Extract function definitions from a source file's raw bytes.
 
-    Functionality: Read file, extract functions, estimate line ranges
-    Inputs: file_path (str), rel_path (str), lang_ext (str)
+    Functionality: Decode, extract functions, estimate line ranges
+    Inputs: data (bytes), rel_path (str), lang_ext (str)
     Outputs: list of dicts with id, file_path, function_name, start/end/count
     Timestamp: 2026-02-11 07:36 UTC
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-    except Exception as e:
-        print(f"  WARN: Cannot read {rel_path}: {e}")
+    if not any(lit in data for lit in LANG_PREFILTER.get(lang_ext, ())):
         return []
 
-    patterns = LANG_MAP.get(lang_ext, [])
-    if not patterns:
+    # Decode once; then apply text-mode universal newline translation
+    content = data.decode('utf-8', errors='replace')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+    lang = LANG_MAP.get(lang_ext)
+    if lang is None:
         return []
 
-    functions = find_functions(content, patterns, lang_ext)
+    functions = find_functions(content, *lang)
     if not functions:
         return []
 
+    # The file's only line split: find_functions works on offsets, and the
+    # split is skipped entirely for files without definitions (above).
     content_lines = content.split('\n')
+    braces = brace_index(content_lines) if lang_ext != '.py' else None
     results = []
     seen_ids = set()
 
@@ -218,105 +359,230 @@ def scan_file(file_path, rel_path, lang_ext):
         if i + 1 < len(functions):
             next_start = functions[i + 1]['line']
             end = min(
-                estimate_end_line(content_lines, start, lang_ext),
+                estimate_end_line(content_lines, start, lang_ext, braces),
                 next_start - 1
             )
         else:
-            end = estimate_end_line(content_lines, start, lang_ext)
+            end = estimate_end_line(content_lines, start, lang_ext, braces)
 
         # Normalize path separators
         normalized_path = rel_path.replace('\\', '/')
 
         # Make ID unique by including line number for duplicate names
-        inv_id = f"{normalized_path}::{name}:L{start}"
-        if inv_id in seen_ids:
+        record = inventory_record(normalized_path, name, start, end)
+        if record['id'] in seen_ids:
             continue  # Skip true duplicates
-        seen_ids.add(inv_id)
-
-        results.append({
-            'id': inv_id,
-            'file_path': normalized_path,
-            'function_name': name,
-            'start_line': start,
-            'end_line': end,
-            'line_count': end - start + 1,
-        })
+        seen_ids.add(record['id'])
+        results.append(record)
 
     return results
 
 
-def scan_directory(root_dir):
+def scan_file(file_path, rel_path, lang_ext):
     """
-    Recursively scan all source files under root_dir.
+    Scan a single source file for function definitions.
 
-    Functionality: Walk directory tree, skip excluded dirs, scan each file
-    Inputs: root_dir (str) - absolute path to scan
-    Outputs: list of inventory records
+    Functionality: Read file, extract functions, estimate line ranges
+    Inputs: file_path (str), rel_path (str), lang_ext (str)
+    Outputs: list of dicts with id, file_path, function_name, start/end/count
     Timestamp: 2026-02-11 07:36 UTC
     """
-    all_records = []
-    file_count = 0
+    data = read_source(file_path, rel_path)
+    if data is None:
+        return []
+    return scan_content(data, rel_path, lang_ext)
 
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        # Skip excluded directories
-        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
 
-        for filename in sorted(filenames):
-            ext = os.path.splitext(filename)[1].lower()
-            if ext not in LANG_MAP:
-                continue
+# Worker-side copy of the scan cache ({hash: records JSON}), installed once
+# per process by _init_scan_cache.
+_scan_cache = {}
+
+
+def _init_scan_cache(cache):
+    """ProcessPoolExecutor initializer: install the scan cache in this process."""
+    global _scan_cache
+    _scan_cache = cache
+
+
+def scan_file_cached(file_path, rel_path, lang_ext):
+    """
+    Scan a single source file, reusing cached results for unchanged content.
+
+    Functionality: Hash the raw bytes (blake2b over SCAN_CACHE_VERSION, extension
+                   and content); on a cache hit rebuild records from the cached
+                   (name, start, end) triples, otherwise scan and emit a new entry
+    Inputs: file_path (str), rel_path (str), lang_ext (str)
+    Outputs: (records, hash, records JSON) - hash is None for unread or prefiltered
+             files, records JSON is None on a cache hit (nothing new to store)
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    data = read_source(file_path, rel_path)
+    if data is None:
+        return [], None, None
+    if not any(lit in data for lit in LANG_PREFILTER.get(lang_ext, ())):
+        return [], None, None  # Cheaper than hashing; nothing worth caching
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(SCAN_CACHE_VERSION + b'\0' + lang_ext.encode() + b'\0')
+    h.update(data)
+    key = h.hexdigest()
+
+    cached = _scan_cache.get(key)
+    if cached is not None:
+        normalized_path = rel_path.replace('\\', '/')
+        return [inventory_record(normalized_path, name, start, end)
+                for name, start, end in json.loads(cached)], key, None
+
+    records = scan_content(data, rel_path, lang_ext)
+    entries = [[r['function_name'], r['start_line'], r['end_line']] for r in records]
+    return records, key, json.dumps(entries)
+
+
+def iter_source_files(dir_path, rel_dir=''):
+    """
+    Yield (file_path, rel_path, ext) for scannable files under dir_path.
+
+    Functionality: os.scandir-based equivalent of the os.walk loop: files in
+                   sorted order before subdirectories, SKIP_DIRS pruned, and
+                   directory symlinks not followed. DirEntry type info avoids
+                   extra stat calls and rel_path is built incrementally
+                   instead of via os.path.relpath.
+    Inputs: dir_path (str), rel_dir (str) - dir_path relative to the scan root
+    Outputs: generator of (file_path, rel_path, ext) tuples
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    try:
+        with os.scandir(dir_path) as it:
+            entries = list(it)
+    except OSError:
+        return  # Unreadable directory; os.walk skips these silently too
+
+    files = []
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            files.append(entry)
+        elif entry.name not in SKIP_DIRS and not entry.is_symlink():
+            subdirs.append(entry)
+
+    prefix = rel_dir + os.sep if rel_dir else ''
+    for entry in sorted(files, key=lambda e: e.name):
+        ext = os.path.splitext(entry.name)[1].lower()
+        if ext in LANG_MAP:
+            yield entry.path, prefix + entry.name, ext
+
+    for entry in subdirs:
+        yield from iter_source_files(entry.path, prefix + entry.name)
+
+
+def _scan_file_spec(spec):
+    """ProcessPoolExecutor entry point: scan_file_cached over a (file_path, rel_path, ext) tuple."""
+    return scan_file_cached(*spec)
+
+
+def scan_directory(root_dir, jobs=None, cache=None):
+    """
+    Recursively scan all source files under root_dir.
 
-            file_path = os.path.join(dirpath, filename)
-            rel_path = os.path.relpath(file_path, root_dir)
-            file_count += 1
+    Functionality: Walk directory tree (iter_source_files), skip excluded dirs, scan each file
+    Inputs: root_dir (str) - absolute path to scan,
+            jobs (int) - worker processes (default: CPU count; 1 scans in-process),
+            cache (dict) - scan cache {hash: records JSON} from load_scan_cache
+    Outputs: (list of inventory records, list of new (hash, records JSON) cache entries,
+              set of every cache hash seen in this scan)
+    Timestamp: 2026-02-11 07:36 UTC
+    """
+    file_specs = list(iter_source_files(root_dir))
 
-            records = scan_file(file_path, rel_path, ext)
-            if records:
-                print(f"  {rel_path}: {len(records)} functions")
-                all_records.extend(records)
+    # Files are independent, so scanning is sharded across processes. map()
+    # yields results in walk order, so the listing and records are unchanged.
+    file_count = len(file_specs)
+    jobs = jobs or os.cpu_count() or 1
+    all_records = []
+    if jobs > 1 and file_count > 1:
+        chunksize = max(1, file_count // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_scan_cache,
+                                 initargs=(cache or {},)) as pool:
+            results = list(pool.map(_scan_file_spec, file_specs, chunksize=chunksize))
+    else:
+        _init_scan_cache(cache or {})
+        results = map(_scan_file_spec, file_specs)
+
+    cache_updates = []
+    seen_hashes = set()
+    for (_, rel_path, _), (records, key, entry) in zip(file_specs, results):
+        if key is not None:
+            seen_hashes.add(key)
+        if entry is not None:
+            cache_updates.append((key, entry))
+        if records:
+            print(f"  {rel_path}: {len(records)} functions")
+            all_records.extend(records)
 
     print(f"\nScanned {file_count} files, found {len(all_records)} functions")
-    return all_records
+    return all_records, cache_updates, seen_hashes
 
 
-def populate_inventory(db_path, records):
+def load_scan_cache(db_path):
+    """
+    Load the per-file scan cache.
+
+    Functionality: Read scan_cache into a dict
+    Inputs: db_path (str)
+    Outputs: {hash: records JSON}, or None if the database predates scan_cache
+    Timestamp: 2026-10-14 09:00 UTC
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute("SELECT hash, records FROM scan_cache"))
+    except sqlite3.OperationalError:
+        return None  # Re-run init_db.py to add the table
+    finally:
+        conn.close()
+
+
+def populate_inventory(db_path, records, cache_updates=(), seen_hashes=None):
     """
     Insert/update source inventory records in the database.
 
-    Functionality: UPSERT records into source_inventory (idempotent)
-    Inputs: db_path (str), records (list of dicts)
+    Functionality: UPSERT records into source_inventory (idempotent) with one
+                   executemany in a single transaction; has_llr/parent_hlr are preserved.
+                   New scan cache entries are stored and entries not in seen_hashes
+                   are pruned in the same transaction.
+    Inputs: db_path (str), records (list of dicts),
+            cache_updates (list) - (hash, records JSON) pairs for scan_cache,
+            seen_hashes (set) - hashes to keep in scan_cache (None: no pruning)
     Outputs: count of inserted/updated records
     Timestamp: 2026-02-11 07:36 UTC
     """
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    inserted = 0
-    updated = 0
-
-    for rec in records:
-        # Check if exists
-        cursor.execute("SELECT has_llr FROM source_inventory WHERE id = ?", (rec['id'],))
-        existing = cursor.fetchone()
-
-        if existing:
-            # Update line info but preserve has_llr status
-            cursor.execute("""
-                UPDATE source_inventory
-                SET start_line = ?, end_line = ?, line_count = ?, scanned_at = datetime('now')
-                WHERE id = ?
-            """, (rec['start_line'], rec['end_line'], rec['line_count'], rec['id']))
-            updated += 1
-        else:
-            cursor.execute("""
-                INSERT INTO source_inventory (id, file_path, function_name, start_line, end_line, line_count)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (rec['id'], rec['file_path'], rec['function_name'],
-                  rec['start_line'], rec['end_line'], rec['line_count']))
-            inserted += 1
-
-    conn.commit()
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+    with conn:
+        before = conn.execute("SELECT COUNT(*) FROM source_inventory").fetchone()[0]
+        conn.executemany(UPSERT_INVENTORY_SQL, (
+            (rec['id'], rec['file_path'], rec['function_name'],
+             rec['start_line'], rec['end_line'], rec['line_count'])
+            for rec in records
+        ))
+        after = conn.execute("SELECT COUNT(*) FROM source_inventory").fetchone()[0]
+        conn.executemany(UPSERT_SCAN_CACHE_SQL, cache_updates)
+        # Decision Logic: Prune cache entries no scanned file produced.
+        # Conditions: seen_hashes given (the database has scan_cache).
+        if seen_hashes is not None:
+            conn.execute(CREATE_SEEN_HASH_SQL)
+            conn.executemany("INSERT INTO seen_hash (hash) VALUES (?)",
+                             ((h,) for h in seen_hashes))
+            conn.execute(PRUNE_SCAN_CACHE_SQL)
     conn.close()
+
+    inserted = after - before
+    updated = len(records) - inserted
     print(f"\nDatabase updated: {inserted} inserted, {updated} updated")
     return inserted + updated
 
@@ -331,6 +597,11 @@ def main():
                         help='Path to traceability.db')
     parser.add_argument('--dry-run', action='store_true',
                         help='Print what would be inserted without writing to DB')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for file scanning '
+                             '(default: CPU count; 1 disables multiprocessing)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Rescan every file, ignoring cached results (the cache is still refreshed)')
 
     args = parser.parse_args()
 
@@ -351,14 +622,21 @@ def main():
     print(f"DB:   {db}")
     print()
 
-    records = scan_directory(root)
+    # Decision Logic: Use the scan cache only if the schema has it.
+    # Conditions: load_scan_cache returns None for databases without scan_cache.
+    cache = load_scan_cache(db)
+    records, cache_updates, seen_hashes = scan_directory(root, args.jobs,
+                                                         None if args.no_cache else cache)
 
     if args.dry_run:
         print("\n--- DRY RUN (no DB writes) ---")
         for rec in records:
             print(f"  {rec['id']}  L{rec['start_line']}-{rec['end_line']} ({rec['line_count']} lines)")
     else:
-        populate_inventory(db, records)
+        if cache is None:
+            populate_inventory(db, records)
+        else:
+            populate_inventory(db, records, cache_updates, seen_hashes)
 
     print("\nPhase 1 complete.")
 
@@ -3,6 +3,10 @@ sample_module.py — Test fixture for DO-178C pipeline verification.
 A simple calculator module with branches, loops, and error handling.
 """
 
+import array
+import math
+import statistics
+
 
 def calculate_average(values):
     """Calculate the arithmetic mean of a list of numbers."""
@@ -11,13 +15,16 @@ def calculate_average(values):
     if not isinstance(values, (list, tuple)):
         raise TypeError("Expected list or tuple")
 
-    total = 0.0
-    for val in values:
-        if not isinstance(val, (int, float)):
-            raise ValueError(f"Non-numeric value: {val}")
-        total += val
+    # Exact int/float types take the fast path; anything else (bool, other
+    # subclasses, Decimal, ...) gets the per-element isinstance check, since
+    # math.fsum would silently accept any value with __float__.
+    if not all(type(val) in (int, float) for val in values):
+        for val in values:
+            if not isinstance(val, (int, float)):
+                raise ValueError(f"Non-numeric value: {val}")
 
-    return total / len(values)
+    # math.fsum sums in C (with compensated rounding).
+    return math.fsum(values) / len(values)
 
 
 def classify_temperature(temp_celsius):
@@ -41,7 +48,7 @@ class SensorProcessor:
 
     def __init__(self, threshold=100.0):
         self.threshold = threshold
-        self.readings = []
+        self.readings = array.array('d')  # packed C doubles
 
     def add_reading(self, value):
         """Add a sensor reading, filtering outliers."""
@@ -60,4 +67,4 @@ class SensorProcessor:
         """Return average of valid readings."""
         if not self.readings:
             return None
-        return sum(self.readings) / len(self.readings)
+        return statistics.fmean(self.readings)